@@ -70,6 +70,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -125,6 +126,49 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
+
+# Seconds a worker process reuses a user's Profile/Family lookup (0 disables).
+PROFILE_CACHE_TTL = int(os.getenv('PROFILE_CACHE_TTL', '30'))
+
+# Cache backend: locmem by default (tests, single worker); point it at a file
+# or database cache for single-node deployments, e.g.
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# CACHE_LOCATION=/var/tmp/controlants-cache
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Cache alias and seconds a built month budget is kept (0 disables).
+BUDGET_CACHE_ALIAS = os.getenv('BUDGET_CACHE_ALIAS', 'default')
+BUDGET_CACHE_TIMEOUT = int(os.getenv('BUDGET_CACHE_TIMEOUT', '3600'))
+
+# Months pre-created either side of the current one for every family
+# (`manage.py provision_months`, and on registration).
+MONTH_CALENDAR_WINDOW = int(os.getenv('MONTH_CALENDAR_WINDOW', '24'))
+
+# Per-request query/timing instrumentation: Server-Timing headers, one
+# `core.request_metrics` log line per request or command, and per-route
+# histograms at /api/_metrics/ (admin only).
+REQUEST_METRICS_ENABLED = env_bool('REQUEST_METRICS_ENABLED', False)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.request_metrics': {
+            'handlers': ['console'],
+            'level': os.getenv('REQUEST_METRICS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
@@ -5,4 +5,5 @@ class CoreConfig(AppConfig):
     name = 'core'
 
     def ready(self):
-        import core.models
\ No newline at end of file
+        import core.models
+        import core.signals
\ No newline at end of file
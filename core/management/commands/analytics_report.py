@@ -0,0 +1,122 @@
+import json
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.management.commands.generate_recurring import _parse_month
+from core.models import Family
+from core.services.analytics_service import (
+    DEFAULT_WINDOW,
+    AnalyticsService,
+    trailing_span,
+)
+from core.services.money import to_cents
+from core.services.request_metrics_service import command_metrics
+
+
+STREAM_CHUNK_SIZE = 5000
+
+
+def python_totals(service):
+    """The report's group-bys done in Python over every row, for comparison.
+
+    This is the approach the database group-bys replaced: each expense and
+    income is streamed out and summed into dictionaries.
+    """
+    category_month = defaultdict(int)
+    payer = defaultdict(int)
+    for category_id, ordinal, payer_id, amount in service.expenses().values_list(
+        "category_id", "month__ordinal", "payer_or_user", "amount"
+    ).iterator(chunk_size=STREAM_CHUNK_SIZE):
+        cents = to_cents(amount)
+        category_month[category_id, ordinal] += cents
+        payer[payer_id] += cents
+    income_month = defaultdict(int)
+    for ordinal, amount in service.incomes().values_list("month__ordinal", "amount").iterator(
+        chunk_size=STREAM_CHUNK_SIZE
+    ):
+        income_month[ordinal] += to_cents(amount)
+    return {
+        "category_month": dict(category_month),
+        "payer": dict(payer),
+        "income_month": dict(income_month),
+    }
+
+
+def service_totals(service):
+    totals = service.load_totals()
+    return {key: totals[key] for key in ("category_month", "payer", "income_month")}
+
+
+def best_of(function, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, round(min(timings), 3)
+
+
+class Command(BaseCommand):
+    help = "Print a family's analytics report as JSON, optionally timed against Python grouping."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--family", type=int, required=True, dest="family_id")
+        parser.add_argument("--from", dest="start", help="First month as YYYY-MM.")
+        parser.add_argument("--to", dest="end", help="Last month as YYYY-MM.")
+        parser.add_argument("--window", type=int, default=DEFAULT_WINDOW)
+        parser.add_argument(
+            "--compare-python",
+            action="store_true",
+            help="Time the report's database group-bys against grouping every row in Python "
+            "and check they agree.",
+        )
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        with command_metrics("analytics_report"):
+            self._report(options)
+
+    def _report(self, options):
+        family = Family.objects.filter(id=options["family_id"]).first()
+        if family is None:
+            raise CommandError(f"Family {options['family_id']} does not exist")
+        start, end = trailing_span()
+        if options.get("start"):
+            start = _parse_month(options["start"])
+        if options.get("end"):
+            end = _parse_month(options["end"])
+        try:
+            service = AnalyticsService(
+                family=family,
+                start=start,
+                end=end,
+                window=options["window"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        iterations = max(options["iterations"], 1)
+        report, report_ms = best_of(service.build_report, iterations)
+        document = {"report": report, "report_ms": report_ms}
+
+        if options["compare_python"]:
+            totals, totals_ms = best_of(lambda: service_totals(service), iterations)
+            python, python_ms = best_of(lambda: python_totals(service), iterations)
+            if totals != python:
+                raise CommandError("Database and Python totals differ")
+            document["comparison"] = {"report_totals_ms": totals_ms, "python_ms": python_ms}
+            self.stderr.write(
+                f"report totals {totals_ms:.2f} ms  python {python_ms:.2f} ms  "
+                f"({report['counts']['expenses']} expenses)"
+            )
+
+        rendered = json.dumps(document, cls=DjangoJSONEncoder, indent=2, sort_keys=True)
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(rendered + "\n")
+        else:
+            self.stdout.write(rendered)
@@ -0,0 +1,197 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, fields
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.management.commands.generate_recurring import _parse_month
+from core.services.synthetic_family_service import SyntheticFamilySpec, build_synthetic_family
+
+
+# (name, path); formatted with the latest and earliest generated months.
+ENDPOINTS = (
+    ("budget", "/api/budget/?year={year}&month={month}"),
+    ("budget_range", "/api/budget/range/?from={first_year}-{first_month}&to={year}-{month}"),
+    ("income_plan_month", "/api/income-plans/month/?year={year}&month={month}"),
+    ("expense_list", "/api/expenses/?year={year}&month={month}"),
+    ("income_list", "/api/incomes/?year={year}&month={month}"),
+    ("analytics", "/api/analytics/summary/?from={first_year}-{first_month}&to={year}-{month}"),
+)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def measure(client, path, *, iterations, warmup):
+    """Time ``iterations`` GETs of ``path`` after ``warmup`` discarded ones.
+
+    Peak memory comes from one extra request under ``tracemalloc`` so its
+    overhead does not skew the timings.
+    """
+    for _ in range(warmup):
+        client.get(path, secure=True)
+
+    timings = []
+    queries = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(path, secure=True)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        if response.status_code != 200:
+            raise CommandError(f"GET {path} returned {response.status_code}")
+
+    tracemalloc.start()
+    try:
+        client.get(path, secure=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    body = response.getvalue() if response.streaming else response.content
+    return {
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "queries": max(queries),
+        "peak_memory_kib": round(peak / 1024, 1),
+        "response_bytes": len(body),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot read endpoints against a generated family. "
+        "The generated data is rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        defaults = SyntheticFamilySpec()
+        for spec_field in fields(SyntheticFamilySpec):
+            if spec_field.name == "end":
+                continue
+            parser.add_argument(
+                f"--{spec_field.name.replace('_', '-')}",
+                type=int,
+                default=getattr(defaults, spec_field.name),
+                help=f"Synthetic family size: {spec_field.name.replace('_', ' ')}.",
+            )
+        parser.add_argument(
+            "--month",
+            help="Latest generated month as YYYY-MM. Defaults to the current month.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            choices=[name for name, _ in ENDPOINTS],
+            help="Only benchmark this endpoint (repeatable).",
+        )
+        parser.add_argument(
+            "--budget-cache",
+            action="store_true",
+            help="Keep the budget cache enabled (measures cache hits instead of builds).",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Commit the generated family instead of rolling it back.",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1 or options["warmup"] < 0:
+            raise CommandError("--iterations must be positive and --warmup not negative")
+        spec = SyntheticFamilySpec(
+            end=_parse_month(options["month"]) if options.get("month") else None,
+            **{
+                spec_field.name: options[spec_field.name]
+                for spec_field in fields(SyntheticFamilySpec)
+                if spec_field.name != "end"
+            },
+        )
+        selected = options.get("endpoints") or [name for name, _ in ENDPOINTS]
+
+        overrides = {
+            "ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"],
+            "SECURE_SSL_REDIRECT": False,
+        }
+        if not options["budget_cache"]:
+            overrides["BUDGET_CACHE_TIMEOUT"] = 0
+
+        with override_settings(**overrides), transaction.atomic():
+            started = time.perf_counter()
+            synthetic = build_synthetic_family(spec, seed=options["seed"], label="benchmark")
+            generation_s = time.perf_counter() - started
+
+            client = Client()
+            client.force_login(synthetic.users[0])
+            (first_year, first_month), (year, month) = synthetic.earliest, synthetic.latest
+            results = {}
+            for name, template in ENDPOINTS:
+                if name not in selected:
+                    continue
+                path = template.format(
+                    year=year,
+                    month=month,
+                    first_year=first_year,
+                    first_month=first_month,
+                )
+                results[name] = {
+                    "path": path,
+                    **measure(
+                        client,
+                        path,
+                        iterations=options["iterations"],
+                        warmup=options["warmup"],
+                    ),
+                }
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        report = {
+            "spec": asdict(spec),
+            "seed": options["seed"],
+            "iterations": options["iterations"],
+            "warmup": options["warmup"],
+            "budget_cache": options["budget_cache"],
+            "dataset": synthetic.counts,
+            "generation_s": round(generation_s, 3),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "endpoints": results,
+        }
+        document = json.dumps(report, indent=2, sort_keys=True)
+        if options.get("output"):
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(document + "\n")
+        else:
+            self.stdout.write(document)
+
+        for name, result in results.items():
+            self.stderr.write(
+                f"{name:<18} p50 {result['p50_ms']:>9.2f} ms  p95 {result['p95_ms']:>9.2f} ms  "
+                f"{result['queries']:>3} queries  {result['peak_memory_kib']:>9.1f} KiB"
+            )
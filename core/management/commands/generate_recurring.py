@@ -0,0 +1,170 @@
+import logging
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models.functions import Mod
+from django.utils import timezone
+
+from core.models import Family, Profile
+from core.services.month_calendar_service import parse_year_month
+from core.services.recurring_generation_service import generate_recurring_expenses
+from core.services.request_metrics_service import command_metrics
+
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("families", "created", "skipped", "completed_skipped", "closed", "failed")
+
+
+def _parse_month(value):
+    try:
+        return parse_year_month(value)
+    except ValueError as exc:
+        raise CommandError(str(exc))
+
+
+def _parse_shard(value):
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise CommandError(f"Invalid shard {value!r}, expected INDEX/TOTAL")
+    if total < 1 or not 0 <= index < total:
+        raise CommandError(f"Invalid shard {value!r}, expected 0 <= INDEX < TOTAL")
+    return index, total
+
+
+def _family_users(family_ids):
+    """Admin of each family (falling back to its oldest member), in one query."""
+    users = {}
+    profiles = (
+        Profile.objects.filter(family_id__in=family_ids)
+        .select_related("user")
+        .order_by("family_id", "id")
+    )
+    for profile in profiles:
+        current = users.get(profile.family_id)
+        if current is None or (profile.role == "admin" and current[0] != "admin"):
+            users[profile.family_id] = (profile.role, profile.user)
+    return {family_id: user for family_id, (_, user) in users.items()}
+
+
+def generate_batch(family_ids, year, month):
+    """Generate one batch of families inside a single transaction.
+
+    Each family runs in its own savepoint, so a failing family is counted
+    and rolled back without losing the rest of the batch.
+    """
+    totals = dict.fromkeys(COUNTERS, 0)
+    with transaction.atomic():
+        users = _family_users(family_ids)
+        for family in Family.objects.filter(id__in=family_ids).order_by("id"):
+            user = users.get(family.id)
+            if user is None:
+                continue
+            try:
+                [result] = generate_recurring_expenses(
+                    family=family,
+                    user=user,
+                    start=(year, month),
+                )
+            except Exception:
+                logger.exception("Recurring generation failed for family %s", family.id)
+                totals["failed"] += 1
+                continue
+            totals["families"] += 1
+            totals["created"] += result.created
+            totals["skipped"] += result.skipped
+            totals["completed_skipped"] += result.completed_skipped
+            totals["closed"] += int(result.closed)
+    return totals
+
+
+def _generate_batch_args(args):
+    return generate_batch(*args)
+
+
+class Command(BaseCommand):
+    help = "Generate the recurring expenses of every family for a month."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--month",
+            help="Target month as YYYY-MM. Defaults to the current month.",
+        )
+        parser.add_argument(
+            "--shard",
+            default="0/1",
+            help="Only process families whose id %% TOTAL == INDEX, as INDEX/TOTAL.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Families committed per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Parallel worker processes.",
+        )
+
+    def handle(self, *args, **options):
+        # With --workers > 1 only the parent's queries are counted.
+        with command_metrics("generate_recurring"):
+            self._generate(options)
+
+    def _generate(self, options):
+        if options.get("month"):
+            year, month = _parse_month(options["month"])
+        else:
+            today = timezone.now().date()
+            year, month = today.year, today.month
+        shard_index, shard_total = _parse_shard(options["shard"])
+        batch_size = options["batch_size"]
+        workers = options["workers"]
+        if batch_size < 1 or workers < 1:
+            raise CommandError("--batch-size and --workers must be positive")
+
+        family_ids = list(
+            Family.objects.annotate(shard=Mod("id", shard_total))
+            .filter(shard=shard_index)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        batches = [
+            (family_ids[start:start + batch_size], year, month)
+            for start in range(0, len(family_ids), batch_size)
+        ]
+
+        started = time.perf_counter()
+        totals = dict.fromkeys(COUNTERS, 0)
+        if workers == 1 or len(batches) <= 1:
+            results = map(_generate_batch_args, batches)
+            self._collect(results, totals)
+        else:
+            # Forked workers must not share the parent's database socket.
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                self._collect(pool.imap_unordered(_generate_batch_args, batches), totals)
+        elapsed = time.perf_counter() - started
+
+        rate = elapsed or 1e-9
+        self.stdout.write(
+            f"{year}-{month:02d} shard {shard_index}/{shard_total}: "
+            f"{totals['families']} families, {totals['created']} created, "
+            f"{totals['skipped']} skipped, {totals['completed_skipped']} completed, "
+            f"{totals['closed']} closed months, {totals['failed']} failed "
+            f"in {elapsed:.2f}s "
+            f"({totals['families'] / rate:.1f} families/s, {totals['created'] / rate:.1f} rows/s)"
+        )
+        if totals["failed"]:
+            raise CommandError(f"{totals['failed']} families failed")
+        self.stdout.write(self.style.SUCCESS("Recurring generation completed"))
+
+    def _collect(self, results, totals):
+        for batch_totals in results:
+            for key in COUNTERS:
+                totals[key] += batch_totals[key]
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Family
+from core.management.commands.generate_recurring import _parse_month
+from core.services.month_calendar_service import provision_months
+from core.services.request_metrics_service import command_metrics
+
+
+class Command(BaseCommand):
+    help = "Pre-create the Month rows of every family around a month."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--month",
+            help="Center month as YYYY-MM. Defaults to the current month.",
+        )
+        parser.add_argument(
+            "--window",
+            type=int,
+            default=settings.MONTH_CALENDAR_WINDOW,
+            help="Months created before and after the center month.",
+        )
+        parser.add_argument(
+            "--family",
+            type=int,
+            action="append",
+            dest="family_ids",
+            help="Only provision this family id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        with command_metrics("provision_months"):
+            self._provision(options)
+
+    def _provision(self, options):
+        if options.get("month"):
+            around = _parse_month(options["month"])
+        else:
+            today = timezone.localdate()
+            around = (today.year, today.month)
+        window = options["window"]
+        if window < 0:
+            raise CommandError("--window must not be negative")
+
+        families = Family.objects.order_by("id")
+        if options.get("family_ids"):
+            families = families.filter(id__in=options["family_ids"])
+
+        provisioned = created = 0
+        for family in families.iterator():
+            with transaction.atomic():
+                created += provision_months(family, around=around, window=window)
+            provisioned += 1
+
+        self.stdout.write(
+            f"{around[0]}-{around[1]:02d} ±{window}: "
+            f"{provisioned} families, {created} months created"
+        )
+        self.stdout.write(self.style.SUCCESS("Month calendar provisioned"))
@@ -0,0 +1,68 @@
+import time
+
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.services.request_metrics_service import (
+    add_section,
+    collect_metrics,
+    current_metrics,
+    log_metrics,
+    metrics_enabled,
+    record_route,
+    server_timing,
+)
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return f"{request.method} {match.view_name or match.route}"
+
+
+class RequestMetricsMiddleware:
+    """Per-request query count, DB/view/serializer time and route histograms.
+
+    Enabled with ``REQUEST_METRICS_ENABLED``; otherwise Django drops it from
+    the chain at startup. Timings are sent as a ``Server-Timing`` header,
+    logged on ``core.request_metrics`` and aggregated for ``/api/_metrics/``.
+    """
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with collect_metrics() as metrics:
+            response = self.get_response(request)
+            self._end_view(request, metrics)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        route = _route(request)
+        response["Server-Timing"] = server_timing(metrics, total_ms)
+        record_route(route, metrics, total_ms, response.status_code)
+        log_metrics(
+            "request",
+            route,
+            metrics,
+            status=response.status_code,
+            total_ms=round(total_ms, 3),
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Runs as soon as a DRF view returns, before the response is rendered.
+        self._end_view(request, current_metrics())
+        return response
+
+    def _end_view(self, request, metrics):
+        started = getattr(request, "_metrics_view_started", None)
+        if started is None or metrics is None:
+            return
+        request._metrics_view_started = None
+        add_section(metrics, "view", (time.perf_counter() - started) * 1000)
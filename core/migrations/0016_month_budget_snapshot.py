@@ -0,0 +1,50 @@
+# Generated by Django 4.2.27 on 2026-10-16 20:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_recurringpaymentoccurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthBudgetSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('unplanned_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='budget_snapshot', to='core.month')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MonthBudgetRecurringRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('recurring_payment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budget_rollups', to='core.recurringpayment')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_rollups', to='core.monthbudgetsnapshot')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MonthBudgetCategoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='budget_rollups', to='core.category')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_rollups', to='core.monthbudgetsnapshot')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='monthbudgetrecurringrollup',
+            constraint=models.UniqueConstraint(fields=('snapshot', 'recurring_payment'), name='uniq_budget_rollup_recurring'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthbudgetcategoryrollup',
+            constraint=models.UniqueConstraint(fields=('snapshot', 'category'), name='uniq_budget_rollup_category'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_month_ordinals(apps, schema_editor):
+    Month = apps.get_model("core", "Month")
+    Month.objects.update(ordinal=F("year") * 12 + F("month"))
+
+    for model_name in ("IncomePlanVersion", "PlannedExpenseVersion"):
+        Version = apps.get_model("core", model_name)
+        Version.objects.update(
+            valid_from_ordinal=Subquery(
+                Month.objects.filter(id=OuterRef("valid_from_id")).values("ordinal")[:1]
+            ),
+            valid_to_ordinal=Subquery(
+                Month.objects.filter(id=OuterRef("valid_to_id")).values("ordinal")[:1]
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_month_budget_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="month",
+            name="ordinal",
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="incomeplanversion",
+            name="valid_from_ordinal",
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="incomeplanversion",
+            name="valid_to_ordinal",
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="plannedexpenseversion",
+            name="valid_from_ordinal",
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="plannedexpenseversion",
+            name="valid_to_ordinal",
+            field=models.IntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_month_ordinals, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="month",
+            name="ordinal",
+            field=models.IntegerField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name="incomeplanversion",
+            name="valid_from_ordinal",
+            field=models.IntegerField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name="plannedexpenseversion",
+            name="valid_from_ordinal",
+            field=models.IntegerField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="month",
+            index=models.Index(fields=["family", "ordinal"], name="month_family_ordinal_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="incomeplanversion",
+            index=models.Index(
+                fields=["plan", "valid_from_ordinal", "valid_to_ordinal"],
+                name="income_version_interval_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="plannedexpenseversion",
+            index=models.Index(
+                fields=["plan", "valid_from_ordinal", "valid_to_ordinal"],
+                name="planned_version_interval_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-16 20:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_month_ordinals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['month', '-date', '-created_at', '-id'], name='idx_expense_month_cursor'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['month', '-date', '-created_at', '-id'], name='idx_income_month_cursor'),
+        ),
+    ]
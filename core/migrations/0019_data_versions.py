@@ -0,0 +1,23 @@
+# Generated by Django 4.2.27 on 2026-10-16 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_expense_income_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='family',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='month',
+            name='data_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
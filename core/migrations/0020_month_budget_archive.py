@@ -0,0 +1,39 @@
+# Generated by Django 4.2.27 on 2026-10-16 22:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_data_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthBudgetArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document', models.JSONField()),
+                ('summary', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('month', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='budget_archive', to='core.month')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MonthBudgetArchiveCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_name', models.CharField(max_length=100)),
+                ('planned_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('spent_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('archive', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_rollups', to='core.monthbudgetarchive')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_rollups', to='core.category')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='monthbudgetarchivecategory',
+            constraint=models.UniqueConstraint(fields=('archive', 'category'), name='uniq_budget_archive_category'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-16 22:33
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_month_budget_archive'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='incomeplanversion',
+            options={'ordering': ['valid_from_ordinal']},
+        ),
+        migrations.AlterModelOptions(
+            name='plannedexpenseversion',
+            options={'ordering': ['valid_from_ordinal']},
+        ),
+    ]
@@ -9,6 +9,13 @@ from django.dispatch import receiver
 class Family(models.Model):
     name = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Write counter of family-wide data (categories, plans, recurring
+    # payments); see core.services.data_version_service.
+    data_version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    def save(self, *args, **kwargs):
+        _without_data_version(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -28,14 +35,71 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.user.username} ({self.family.name})"
     
+def month_ordinal(year, month):
+    """Calendar position of a month (``year * 12 + month``), comparable as an int.
+
+    Raises ``ValueError`` for a month outside 1..12, whose ordinal would
+    alias a month of the previous or next year.
+    """
+    if not 1 <= month <= 12:
+        raise ValueError(f"month must be between 1 and 12, got {month!r}")
+    return year * 12 + month
+
+
+def _with_update_fields(kwargs, changed, extra):
+    """Append ``extra`` to ``update_fields`` when any of ``changed`` is saved."""
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and set(update_fields) & set(changed):
+        kwargs["update_fields"] = set(update_fields) | set(extra)
+    return kwargs
+
+
+def _without_data_version(instance, kwargs):
+    """Keep a full ``save()`` from writing back a stale ``data_version``.
+
+    The counter is only ever moved with ``F()`` updates, so saves of an
+    existing row leave it out of ``update_fields``.
+    """
+    if instance._state.adding or kwargs.get("update_fields") is not None:
+        return kwargs
+    kwargs["update_fields"] = [
+        field.name
+        for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name != "data_version"
+    ]
+    return kwargs
+
+
+def sync_version_ordinals(version):
+    """Copy the ordinals of a plan version's valid_from/valid_to months."""
+    version.valid_from_ordinal = version.valid_from.ordinal
+    version.valid_to_ordinal = (
+        version.valid_to.ordinal if version.valid_to_id is not None else None
+    )
+
+
 class Month(models.Model):
     family = models.ForeignKey(Family, on_delete=models.CASCADE)
     year = models.IntegerField()
     month = models.IntegerField()  # 1 - 12
+    # Denormalized year * 12 + month so ranges are a single indexed comparison.
+    ordinal = models.IntegerField(editable=False)
     is_closed = models.BooleanField(default=False)
+    # Write counter of the month's movements; see
+    # core.services.data_version_service.
+    data_version = models.PositiveBigIntegerField(default=0, editable=False)
 
     class Meta:
         unique_together = ('family', 'year', 'month')
+        indexes = [
+            models.Index(fields=["family", "ordinal"], name="month_family_ordinal_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.ordinal = month_ordinal(self.year, self.month)
+        _with_update_fields(kwargs, ("year", "month"), ("ordinal",))
+        _without_data_version(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.family.name} - {self.month}/{self.year}"
@@ -70,6 +134,11 @@ class Income(models.Model):
         ]
         indexes = [
             models.Index(fields=['month', 'income_plan'], name='idx_income_month_plan'),
+            # Matches DateCursorPagination ordering within a month.
+            models.Index(
+                fields=['month', '-date', '-created_at', '-id'],
+                name='idx_income_month_cursor',
+            ),
         ]
 
     def __str__(self):
@@ -138,11 +207,29 @@ class IncomePlanVersion(models.Model):
         on_delete=models.PROTECT,
         related_name="income_versions_to"
     )
+    # Copies of valid_from/valid_to ``Month.ordinal``, kept in sync on save.
+    valid_from_ordinal = models.IntegerField(editable=False)
+    valid_to_ordinal = models.IntegerField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["valid_from"]
+        ordering = ["valid_from_ordinal"]
+        indexes = [
+            models.Index(
+                fields=["plan", "valid_from_ordinal", "valid_to_ordinal"],
+                name="income_version_interval_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        sync_version_ordinals(self)
+        _with_update_fields(
+            kwargs,
+            ("valid_from", "valid_to"),
+            ("valid_from_ordinal", "valid_to_ordinal"),
+        )
+        super().save(*args, **kwargs)
 
     def __str__(self):
         label = self.plan.name or self.plan.category.name
@@ -208,6 +295,15 @@ class Expense(models.Model):
     is_recurring = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Matches DateCursorPagination ordering within a month.
+            models.Index(
+                fields=['month', '-date', '-created_at', '-id'],
+                name='idx_expense_month_cursor',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.amount} - {self.category}"
     
@@ -272,6 +368,130 @@ class RecurringPaymentOccurrence(models.Model):
 
     def __str__(self):
         return f"{self.recurring_payment.name} - {self.month}"
+
+
+class MonthBudgetSnapshot(models.Model):
+    """Persisted expense rollup of a month.
+
+    Built lazily from ``Expense`` the first time a budget is read and then
+    kept up to date incrementally on every expense write (see
+    ``core.services.budget_snapshot_service``).
+    """
+
+    month = models.OneToOneField(
+        Month,
+        on_delete=models.CASCADE,
+        related_name="budget_snapshot",
+    )
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unplanned_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Snapshot {self.month}"
+
+
+class MonthBudgetCategoryRollup(models.Model):
+    snapshot = models.ForeignKey(
+        MonthBudgetSnapshot,
+        on_delete=models.CASCADE,
+        related_name="category_rollups",
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="budget_rollups",
+    )
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "category"],
+                name="uniq_budget_rollup_category",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.snapshot} - {self.category_id}: {self.total}"
+
+
+class MonthBudgetRecurringRollup(models.Model):
+    snapshot = models.ForeignKey(
+        MonthBudgetSnapshot,
+        on_delete=models.CASCADE,
+        related_name="recurring_rollups",
+    )
+    recurring_payment = models.ForeignKey(
+        RecurringPayment,
+        on_delete=models.CASCADE,
+        related_name="budget_rollups",
+    )
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "recurring_payment"],
+                name="uniq_budget_rollup_recurring",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.snapshot} - {self.recurring_payment_id}: {self.total}"
+
+
+
+class MonthBudgetArchive(models.Model):
+    """Frozen budget of a closed month.
+
+    Written when the month is closed and deleted when it is reopened (see
+    ``core.services.budget_archive_service``); while it exists, budget reads
+    of the month are served from it instead of being recomputed.
+    """
+
+    month = models.OneToOneField(
+        Month,
+        on_delete=models.CASCADE,
+        related_name="budget_archive",
+    )
+    # ``GET /api/budget/`` payload, already in its JSON representation.
+    document = models.JSONField()
+    # The month's entry of ``GET /api/budget/range/``.
+    summary = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archive {self.month}"
+
+
+class MonthBudgetArchiveCategory(models.Model):
+    archive = models.ForeignKey(
+        MonthBudgetArchive,
+        on_delete=models.CASCADE,
+        related_name="category_rollups",
+    )
+    # Kept (with its name) when the category is later deleted.
+    category = models.ForeignKey(
+        Category,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="archived_rollups",
+    )
+    category_name = models.CharField(max_length=100)
+    planned_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    spent_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["archive", "category"],
+                name="uniq_budget_archive_category",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.archive} - {self.category_name}"
     
 @receiver(post_save, sender=User)
 def create_profile_for_user(sender, instance, created, **kwargs):
@@ -343,11 +563,29 @@ class PlannedExpenseVersion(models.Model):
         on_delete=models.PROTECT,
         related_name="planned_versions_to"
     )
+    # Copies of valid_from/valid_to ``Month.ordinal``, kept in sync on save.
+    valid_from_ordinal = models.IntegerField(editable=False)
+    valid_to_ordinal = models.IntegerField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["valid_from"]
+        ordering = ["valid_from_ordinal"]
+        indexes = [
+            models.Index(
+                fields=["plan", "valid_from_ordinal", "valid_to_ordinal"],
+                name="planned_version_interval_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        sync_version_ordinals(self)
+        _with_update_fields(
+            kwargs,
+            ("valid_from", "valid_to"),
+            ("valid_from_ordinal", "valid_to_ordinal"),
+        )
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.plan} - {self.planned_amount}"
@@ -0,0 +1,20 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DateCursorPagination(CursorPagination):
+    """Keyset pagination over ``(-date, -created_at, -id)``.
+
+    Pages stay stable while rows are inserted and cost the same at any depth.
+    ``?paginate=false`` returns the historic unpaginated list for old clients.
+    """
+
+    ordering = ("-date", "-created_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    opt_out_query_param = "paginate"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.opt_out_query_param, "").lower() in ("false", "0"):
+            return None
+        return super().paginate_queryset(queryset, request, view)
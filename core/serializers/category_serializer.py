@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from core.models import Category
+from core.serializers.timed import TimedRepresentationMixin
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = [
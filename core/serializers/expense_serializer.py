@@ -1,44 +1,63 @@
 from rest_framework import serializers
-from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
 
-from core.models import Expense, Category, PlannedExpense, Profile, RecurringPayment
+from core.models import Expense, Category, PlannedExpense, RecurringPayment
 from core.serializers.family_member_serializer import FamilyMemberSerializer
-from core.services.recurring_payment_service import get_recurring_payment_month_state
+from core.serializers.family_scoped import (
+    FamilyScopedPrimaryKeyRelatedField,
+    FamilyScopedSerializerMixin,
+)
+from core.serializers.timed import TimedRepresentationMixin
+from core.services.recurring_payment_service import (
+    calculate_recurring_payment_amounts,
+    load_recurring_payment_month_states,
+)
 
 
-class ExpenseSerializer(serializers.ModelSerializer):
+def _recurring_key(expense):
+    return (expense.recurring_payment_id, expense.month_id)
+
+
+class ExpenseListSerializer(TimedRepresentationMixin, serializers.ListSerializer):
+    """Loads the recurring-payment month state of the whole page up front."""
+
+    def to_representation(self, data):
+        expenses = list(data.all() if hasattr(data, "all") else data)
+        self.child.preload_recurring_payment_months(expenses)
+        return super().to_representation(expenses)
+
+
+class ExpenseSerializer(TimedRepresentationMixin, FamilyScopedSerializerMixin, serializers.ModelSerializer):
     recurring_payment_month = serializers.SerializerMethodField()
-    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.none())
-    payer = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.none(),
+    category = FamilyScopedPrimaryKeyRelatedField(model=Category)
+    payer = FamilyScopedPrimaryKeyRelatedField(
+        model=User,
+        family_lookup="profile__family",
+        filters={"is_active": True},
         required=False,
         allow_null=True,
     )
     payer_detail = FamilyMemberSerializer(source="payer", read_only=True)
-    planned_expense = serializers.PrimaryKeyRelatedField(
-        queryset=PlannedExpense.objects.none(),
+    planned_expense = FamilyScopedPrimaryKeyRelatedField(
+        model=PlannedExpense,
+        load_fields=("category_id",),
         required=False,
         allow_null=True,
     )
-    recurring_payment = serializers.PrimaryKeyRelatedField(
-        queryset=RecurringPayment.objects.none(),
+    recurring_payment = FamilyScopedPrimaryKeyRelatedField(
+        model=RecurringPayment,
+        load_fields=("category_id",),
         required=False,
         allow_null=True,
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        request = self.context.get("request")
-        if request and request.user and request.user.is_authenticated:
-            profile = get_object_or_404(Profile, user=request.user)
-            self.fields["category"].queryset = Category.objects.filter(family=profile.family)
-            self.fields["payer"].queryset = User.objects.filter(
-                profile__family=profile.family,
-                is_active=True,
-            )
-            self.fields["planned_expense"].queryset = PlannedExpense.objects.filter(family=profile.family)
-            self.fields["recurring_payment"].queryset = RecurringPayment.objects.filter(family=profile.family)
+    refetch_select_related = (
+        "category",
+        "month",
+        "payer",
+        "payer__profile",
+        "recurring_payment",
+    )
 
     class Meta:
         model = Expense
@@ -57,6 +76,7 @@ class ExpenseSerializer(serializers.ModelSerializer):
             "is_recurring",
         ]
         read_only_fields = ("month",)
+        list_serializer_class = ExpenseListSerializer
 
     def validate(self, attrs):
         category = attrs.get("category") or getattr(self.instance, "category", None)
@@ -78,34 +98,46 @@ class ExpenseSerializer(serializers.ModelSerializer):
 
         return attrs
 
-    def get_recurring_payment_month(self, obj):
-        if obj.recurring_payment_id is None:
-            return None
-
+    def _recurring_payment_month_states(self):
         cache = getattr(self, "_recurring_payment_month_cache", None)
         if cache is None:
             cache = {}
             self._recurring_payment_month_cache = cache
+        return cache
+
+    def preload_recurring_payment_months(self, expenses):
+        """Read the occurrence and paid total of every key in two queries."""
+        cache = self._recurring_payment_month_states()
+        keys = {_recurring_key(expense) for expense in expenses if expense.recurring_payment_id}
+        cache.update(load_recurring_payment_month_states(keys - cache.keys()))
 
-        key = (obj.recurring_payment_id, obj.month_id)
+    def get_recurring_payment_month(self, obj):
+        if obj.recurring_payment_id is None:
+            return None
+
+        key = _recurring_key(obj)
+        cache = self._recurring_payment_month_states()
         if key not in cache:
-            occurrence, amounts = get_recurring_payment_month_state(
-                recurring_payment=obj.recurring_payment,
-                month=obj.month,
-            )
-            cache[key] = {
-                "id": occurrence.id,
-                "recurring_payment": obj.recurring_payment_id,
-                "month": obj.month_id,
-                "year": obj.month.year,
-                "month_number": obj.month.month,
-                "planned_amount": amounts.planned_amount,
-                "paid_amount": amounts.paid_amount,
-                "pending_amount": amounts.pending_amount,
-                "difference_amount": amounts.difference_amount,
-                "is_completed": amounts.is_completed,
-                "status": amounts.payment_status,
-                "payment_status": amounts.payment_status,
-            }
-
-        return cache[key]
+            self.preload_recurring_payment_months([obj])
+        occurrence, paid_amount = cache[key]
+
+        amounts = calculate_recurring_payment_amounts(
+            planned_amount=obj.recurring_payment.amount,
+            paid_amount=paid_amount,
+            is_completed=occurrence is not None and occurrence.is_completed,
+        )
+        return {
+            # Null until the month's occurrence exists; reads never create it.
+            "id": occurrence.id if occurrence is not None else None,
+            "recurring_payment": obj.recurring_payment_id,
+            "month": obj.month_id,
+            "year": obj.month.year,
+            "month_number": obj.month.month,
+            "planned_amount": amounts.planned_amount,
+            "paid_amount": amounts.paid_amount,
+            "pending_amount": amounts.pending_amount,
+            "difference_amount": amounts.difference_amount,
+            "is_completed": amounts.is_completed,
+            "status": amounts.payment_status,
+            "payment_status": amounts.payment_status,
+        }
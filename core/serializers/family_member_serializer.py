@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
 from django.contrib.auth.models import User
+from core.serializers.timed import TimedRepresentationMixin
 
 
-class FamilyMemberSerializer(serializers.ModelSerializer):
+class FamilyMemberSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     display_name = serializers.SerializerMethodField()
     role = serializers.CharField(source="profile.role", read_only=True)
 
@@ -0,0 +1,160 @@
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import BigIntegerField, CharField, F, Value
+from django.db.models.functions import Cast
+from rest_framework import serializers
+
+from core.services.request_profile import get_request_family
+
+
+def _owned_rows_cache(request):
+    """Per-request ``{scope: {pk: extra values or None}}`` of checked ids."""
+    http_request = getattr(request, "_request", request)
+    cache = getattr(http_request, "_family_owned_rows", None)
+    if cache is None:
+        cache = {}
+        http_request._family_owned_rows = cache
+    return cache
+
+
+class FamilyScopedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field restricted to rows of the requesting user's family.
+
+    Ownership is not checked one field at a time: the parent
+    ``FamilyScopedSerializerMixin`` validates every scoped field of the
+    payload in a single UNION query. The field then returns a lightweight
+    instance carrying only ``id`` and ``load_fields``; serializers using it
+    re-read the saved object with ``select_related`` before rendering.
+    """
+
+    def __init__(self, *, model, family_lookup="family", filters=None, load_fields=(), **kwargs):
+        self.model = model
+        self.family_lookup = family_lookup
+        self.filters = filters or {}
+        self.load_fields = tuple(load_fields)
+        kwargs.setdefault("queryset", model.objects.none())
+        super().__init__(**kwargs)
+
+    @property
+    def scope(self):
+        filters = ",".join(f"{key}={value}" for key, value in sorted(self.filters.items()))
+        return f"{self.model._meta.label_lower}:{self.family_lookup}:{filters}"
+
+    def get_queryset(self):
+        request = self.context.get("request")
+        if request is None or not request.user.is_authenticated:
+            return self.model.objects.none()
+        return self.model.objects.filter(
+            **{self.family_lookup: get_request_family(request)},
+            **self.filters,
+        )
+
+    def owned_rows_query(self, pks, width):
+        columns = {
+            "_scope": Value(self.scope, output_field=CharField()),
+            "_pk": F("pk"),
+        }
+        for index in range(width):
+            columns[f"_extra{index}"] = (
+                F(self.load_fields[index])
+                if index < len(self.load_fields)
+                else Cast(Value(None), BigIntegerField())
+            )
+        return (
+            self.get_queryset()
+            .filter(pk__in=pks)
+            .order_by()
+            .annotate(**columns)
+            .values_list(*columns)
+        )
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        request = self.context.get("request")
+        if request is None:
+            self.fail("does_not_exist", pk_value=data)
+        known = _owned_rows_cache(request).get(self.scope, {})
+        if pk not in known:
+            # Not preloaded (e.g. used outside the mixin): check it alone.
+            load_family_owned_rows(request, {self: {pk}})
+            known = _owned_rows_cache(request).get(self.scope, {})
+
+        extra = known.get(pk)
+        if extra is None:
+            self.fail("does_not_exist", pk_value=data)
+        return self.model.from_db(
+            DEFAULT_DB_ALIAS,
+            [self.model._meta.pk.attname, *self.load_fields],
+            (pk, *extra),
+        )
+
+
+def load_family_owned_rows(request, wanted):
+    """Check ``{field: pks}`` against the family with one UNION query.
+
+    Results, including misses, are remembered on the request so a pk is
+    never checked twice.
+    """
+    cache = _owned_rows_cache(request)
+    pending = {}
+    for field, pks in wanted.items():
+        missing = {pk for pk in pks if pk not in cache.get(field.scope, {})}
+        if missing:
+            pending[field] = missing
+    if not pending:
+        return
+
+    width = max(len(field.load_fields) for field in pending)
+    queries = [field.owned_rows_query(pks, width) for field, pks in pending.items()]
+    query = queries[0].union(*queries[1:], all=True) if len(queries) > 1 else queries[0]
+
+    for field, pks in pending.items():
+        scope_rows = cache.setdefault(field.scope, {})
+        for pk in pks:
+            scope_rows[pk] = None
+    fields_by_scope = {field.scope: field for field in pending}
+    for scope, pk, *extra in query:
+        field = fields_by_scope[scope]
+        cache[scope][pk] = tuple(extra[: len(field.load_fields)])
+
+
+class FamilyScopedSerializerMixin:
+    """Batch the ownership checks of all ``FamilyScopedPrimaryKeyRelatedField``s.
+
+    ``refetch_select_related`` lists the relations re-read with the saved
+    instance, so rendering never touches the partial related instances.
+    """
+
+    refetch_select_related = ()
+
+    def to_internal_value(self, data):
+        request = self.context.get("request")
+        if request is not None and hasattr(data, "get"):
+            wanted = {}
+            for field in self.fields.values():
+                if not isinstance(field, FamilyScopedPrimaryKeyRelatedField) or field.read_only:
+                    continue
+                value = data.get(field.field_name)
+                try:
+                    pk = int(value)
+                except (TypeError, ValueError):
+                    continue
+                if not isinstance(value, bool):
+                    wanted[field] = {pk}
+            if wanted:
+                load_family_owned_rows(request, wanted)
+        return super().to_internal_value(data)
+
+    def save(self, **kwargs):
+        instance = super().save(**kwargs)
+        self.instance = (
+            type(instance)
+            .objects.select_related(*self.refetch_select_related)
+            .get(pk=instance.pk)
+        )
+        return self.instance
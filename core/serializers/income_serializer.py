@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from core.models import Income
 from core.serializers.category_serializer import CategorySerializer
+from core.serializers.timed import TimedRepresentationMixin
 
 
-class IncomeSerializer(serializers.ModelSerializer):
+class IncomeSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     # Read-only nested category info to avoid extra calls on the frontend
     category_detail = CategorySerializer(source='category', read_only=True)
 
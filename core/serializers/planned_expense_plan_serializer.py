@@ -1,16 +1,17 @@
 from rest_framework import serializers
-from django.shortcuts import get_object_or_404
 from core.models import (
     Category,
     PlannedExpensePlan,
     PlannedExpenseVersion,
     Month,
-    Profile,
+    month_ordinal,
 )
+from core.serializers.timed import TimedRepresentationMixin
+from core.services.request_profile import get_request_profile
 from django.utils import timezone
 
 
-class PlannedExpenseVersionSerializer(serializers.ModelSerializer):
+class PlannedExpenseVersionSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = PlannedExpenseVersion
         fields = [
@@ -23,7 +24,7 @@ class PlannedExpenseVersionSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at"]
 
 
-class PlannedExpensePlanSerializer(serializers.ModelSerializer):
+class PlannedExpensePlanSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     versions = PlannedExpenseVersionSerializer(many=True, read_only=True)
     category_name = serializers.CharField(source="category.name", read_only=True)
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.none())
@@ -45,7 +46,7 @@ class PlannedExpensePlanSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
         request = self.context.get("request")
         if request and request.user and request.user.is_authenticated:
-            profile = get_object_or_404(Profile, user=request.user)
+            profile = get_request_profile(request)
             self.fields["category"].queryset = profile.family.category_set.all()
             self.fields["start_month"].queryset = Month.objects.filter(
                 family=profile.family
@@ -91,7 +92,7 @@ class PlannedExpensePlanSerializer(serializers.ModelSerializer):
 
         request = self.context.get("request")
         user = request.user if request else None
-        profile = get_object_or_404(Profile, user=user) if user and user.is_authenticated else None
+        profile = get_request_profile(request) if user and user.is_authenticated else None
 
         # Security / multi-tenant: months must belong to the user's family
         if profile is not None:
@@ -110,13 +111,13 @@ class PlannedExpensePlanSerializer(serializers.ModelSerializer):
         # Business rule: cannot plan for past months (only current or future)
         now = timezone.now()
         if start_month:
-            if (start_month.year, start_month.month) < (now.year, now.month):
+            if start_month.ordinal < month_ordinal(now.year, now.month):
                 raise serializers.ValidationError("start_month cannot be in the past")
 
         if plan_type == "ONE_MONTH":
             attrs["end_month"] = start_month
 
-        if plan_type == "ONGOING" and end_month and end_month < start_month:
+        if plan_type == "ONGOING" and end_month and end_month.ordinal < start_month.ordinal:
             raise serializers.ValidationError(
                 "end_month must be greater than or equal to start_month"
             )
@@ -132,7 +133,7 @@ class PlannedExpensePlanSerializer(serializers.ModelSerializer):
 
         request = self.context.get("request")
         user = request.user if request else None
-        profile = get_object_or_404(Profile, user=user) if user and user.is_authenticated else None
+        profile = get_request_profile(request) if user and user.is_authenticated else None
 
         plan = PlannedExpensePlan.objects.create(
             **validated_data,
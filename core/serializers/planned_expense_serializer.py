@@ -1,10 +1,11 @@
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
-from core.models import PlannedExpense, Category, Month, Profile
+from core.models import PlannedExpense, Category, Month
+from core.serializers.timed import TimedRepresentationMixin
+from core.services.request_profile import get_request_profile
 
 
-class PlannedExpenseSerializer(serializers.ModelSerializer):
+class PlannedExpenseSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     spent_amount = serializers.SerializerMethodField()
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.none())
@@ -14,7 +15,7 @@ class PlannedExpenseSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
         request = self.context.get("request")
         if request and request.user and request.user.is_authenticated:
-            profile = get_object_or_404(Profile, user=request.user)
+            profile = get_request_profile(request)
             self.fields["category"].queryset = Category.objects.filter(family=profile.family)
             self.fields["month"].queryset = Month.objects.filter(family=profile.family)
 
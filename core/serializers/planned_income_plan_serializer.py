@@ -1,11 +1,12 @@
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
-from core.models import Category, IncomePlan, Month, Profile
+from core.models import Category, IncomePlan, Month
 from core.serializers.category_serializer import CategorySerializer
+from core.serializers.timed import TimedRepresentationMixin
+from core.services.request_profile import get_request_profile
 
 
-class IncomePlanSerializer(serializers.ModelSerializer):
+class IncomePlanSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     # Read-only category detail for frontend convenience
     category_detail = CategorySerializer(source="category", read_only=True)
     family = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -27,7 +28,7 @@ class IncomePlanSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
         request = self.context.get("request")
         if request and request.user and request.user.is_authenticated:
-            profile = get_object_or_404(Profile, user=request.user)
+            profile = get_request_profile(request)
             self.fields["category"].queryset = Category.objects.filter(family=profile.family)
             month_qs = Month.objects.filter(family=profile.family)
             self.fields["start_month"].queryset = month_qs
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from core.models import IncomePlanVersion
+from core.serializers.timed import TimedRepresentationMixin
 
 
-class IncomePlanVersionSerializer(serializers.ModelSerializer):
+class IncomePlanVersionSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = IncomePlanVersion
         fields = "__all__"
@@ -1,13 +1,14 @@
-from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
 from rest_framework import serializers
 
-from core.models import RecurringPayment, Category, Profile
+from core.models import RecurringPayment, Category
 from core.serializers.expense_serializer import ExpenseSerializer
 from core.serializers.family_member_serializer import FamilyMemberSerializer
+from core.serializers.timed import TimedRepresentationMixin
+from core.services.request_profile import get_request_profile
 
 
-class RecurringPaymentSerializer(serializers.ModelSerializer):
+class RecurringPaymentSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     category = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.none()
     )
@@ -24,7 +25,7 @@ class RecurringPaymentSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
         request = self.context.get("request")
         if request and request.user and request.user.is_authenticated:
-            profile = get_object_or_404(Profile, user=request.user)
+            profile = get_request_profile(request)
             self.fields["category"].queryset = Category.objects.filter(family=profile.family)
             self.fields["payer"].queryset = User.objects.filter(
                 profile__family=profile.family,
@@ -0,0 +1,12 @@
+from core.services.request_metrics_service import timed_section
+
+
+class TimedRepresentationMixin:
+    """Counts ``to_representation`` as the ``serializer`` section of request metrics.
+
+    Nested serializers are only counted once, by the outermost one.
+    """
+
+    def to_representation(self, instance):
+        with timed_section("serializer"):
+            return super().to_representation(instance)
@@ -0,0 +1,208 @@
+import math
+from collections import defaultdict
+
+from django.db.models import BigIntegerField, Count, F, Sum, Window
+from django.db.models.functions import Cast, Coalesce, Round, RowNumber
+from django.utils import timezone
+
+from core.models import Expense, Income, month_ordinal
+from core.services.money import from_cents
+from core.services.month_calendar_service import month_from_ordinal
+
+
+DEFAULT_ANALYTICS_MONTHS = 12
+MAX_ANALYTICS_MONTHS = 120
+DEFAULT_WINDOW = 3
+PERCENTILES = (50, 90, 99)
+
+
+def trailing_span(months=DEFAULT_ANALYTICS_MONTHS):
+    """``(start, end)`` of the ``months`` months ending with the current one."""
+    today = timezone.localdate()
+    last = month_ordinal(today.year, today.month)
+    return month_from_ordinal(last - months + 1), month_from_ordinal(last)
+
+
+# Summing integer cents keeps the database's float arithmetic (SQLite)
+# away from the totals.
+_CENTS = Cast(Round(F("amount") * 100), BigIntegerField())
+
+
+def _span(queryset, first_ordinal, last_ordinal):
+    return queryset.filter(
+        month__ordinal__gte=first_ordinal,
+        month__ordinal__lte=last_ordinal,
+    ).order_by()
+
+
+def expense_queryset(family, first_ordinal, last_ordinal):
+    """Expenses of the span; ``payer_or_user`` falls back to the user who logged them."""
+    queryset = Expense.objects.filter(month__family=family).annotate(
+        payer_or_user=Coalesce("payer", "user")
+    )
+    return _span(queryset, first_ordinal, last_ordinal)
+
+
+def income_queryset(family, first_ordinal, last_ordinal):
+    return _span(Income.objects.filter(month__family=family), first_ordinal, last_ordinal)
+
+
+def group_cents(queryset, *fields):
+    """``({key: total cents}, row count)`` grouped by ``fields`` in the database.
+
+    Keys are tuples when more than one field is given.
+    """
+    totals = {}
+    rows = 0
+    grouped = queryset.values_list(*fields).annotate(cents=Sum(_CENTS), rows=Count("id"))
+    for *key, cents, count in grouped:
+        totals[tuple(key) if len(fields) > 1 else key[0]] = cents
+        rows += count
+    return totals, rows
+
+
+def rollup(totals, position):
+    """``{(a, b): cents}`` totals re-keyed by the key part at ``position``."""
+    rolled = defaultdict(int)
+    for key, cents in totals.items():
+        rolled[key[position]] += cents
+    return dict(rolled)
+
+
+def dense_series(totals, first_ordinal, last_ordinal):
+    """Month totals ``{ordinal: cents}`` as a list covering the span, zero-filled."""
+    return [totals.get(ordinal, 0) for ordinal in range(first_ordinal, last_ordinal + 1)]
+
+
+def rolling_mean(series, window):
+    """Trailing mean of ``window`` points, over fewer points at the start."""
+    means = []
+    running = 0
+    for index, value in enumerate(series):
+        running += value
+        if index >= window:
+            running -= series[index - window]
+        means.append(running / min(index + 1, window))
+    return means
+
+
+def nearest_rank(count, rank):
+    """Zero-based index of the ``rank`` percentile among ``count`` sorted values."""
+    return max(0, math.ceil(rank / 100 * count) - 1)
+
+
+def cents_percentiles(queryset, count, ranks=PERCENTILES):
+    """Nearest-rank percentiles of the rows' amounts in cents; ``None`` when empty.
+
+    The database numbers the rows in amount order and returns only the ranked
+    ones, so one sort serves every percentile.
+    """
+    if not count:
+        return {rank: None for rank in ranks}
+    positions = {rank: nearest_rank(count, rank) + 1 for rank in ranks}
+    ranked = dict(
+        queryset.annotate(
+            position=Window(RowNumber(), order_by=[F("amount").asc(), F("id").asc()]),
+            cents=_CENTS,
+        )
+        .filter(position__in=set(positions.values()))
+        .values_list("position", "cents")
+    )
+    return {rank: ranked[position] for rank, position in positions.items()}
+
+
+def _shares(totals, label):
+    grand_total = sum(totals.values())
+    return [
+        {
+            label: key,
+            "total": from_cents(value),
+            "share": round(value / grand_total * 100, 2) if grand_total else 0.0,
+        }
+        for key, value in sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+class AnalyticsService:
+    """Category trends, payer splits, moving averages and percentiles.
+
+    The group-bys run in the database over integer cents (category by month,
+    payer, income by month), one query each, plus one windowed query for the
+    percentiles; only the rolling window, the shares and the roll-ups of those
+    small aggregates are computed in Python. The query count does not depend
+    on the span.
+    """
+
+    def __init__(self, *, family, start, end, window=DEFAULT_WINDOW):
+        self.family = family
+        self.first_ordinal = month_ordinal(*start)
+        self.last_ordinal = month_ordinal(*end)
+        if self.first_ordinal > self.last_ordinal:
+            raise ValueError("start must not be after end")
+        if self.last_ordinal - self.first_ordinal >= MAX_ANALYTICS_MONTHS:
+            raise ValueError(f"range cannot exceed {MAX_ANALYTICS_MONTHS} months")
+        if window < 1:
+            raise ValueError("window must be positive")
+        self.window = window
+
+    def expenses(self):
+        return expense_queryset(self.family, self.first_ordinal, self.last_ordinal)
+
+    def incomes(self):
+        return income_queryset(self.family, self.first_ordinal, self.last_ordinal)
+
+    def load_totals(self):
+        """The span's grouped totals in cents, and the row counts."""
+        category_month, expense_count = group_cents(
+            self.expenses(), "category_id", "month__ordinal"
+        )
+        income_month, income_count = group_cents(self.incomes(), "month__ordinal")
+        payer, _ = group_cents(self.expenses(), "payer_or_user")
+        return {
+            "category_month": category_month,
+            "payer": payer,
+            "income_month": income_month,
+            "counts": {"expenses": expense_count, "incomes": income_count},
+        }
+
+    def build_report(self):
+        totals = self.load_totals()
+        by_category_month = totals["category_month"]
+
+        span = (self.first_ordinal, self.last_ordinal)
+        expense_series = dense_series(rollup(by_category_month, 1), *span)
+        income_series = dense_series(totals["income_month"], *span)
+        expense_average = rolling_mean(expense_series, self.window)
+
+        categories = _shares(rollup(by_category_month, 0), "category")
+        for entry in categories:
+            entry["monthly"] = [
+                from_cents(by_category_month.get((entry["category"], ordinal), 0))
+                for ordinal in range(self.first_ordinal, self.last_ordinal + 1)
+            ]
+
+        months = []
+        for offset, ordinal in enumerate(range(self.first_ordinal, self.last_ordinal + 1)):
+            year, month = month_from_ordinal(ordinal)
+            months.append({
+                "year": year,
+                "month": month,
+                "expenses": from_cents(expense_series[offset]),
+                "incomes": from_cents(income_series[offset]),
+                "expenses_moving_average": from_cents(round(expense_average[offset])),
+            })
+
+        counts = totals["counts"]
+        return {
+            "from": "%04d-%02d" % month_from_ordinal(self.first_ordinal),
+            "to": "%04d-%02d" % month_from_ordinal(self.last_ordinal),
+            "window": self.window,
+            "months": months,
+            "categories": categories,
+            "payers": _shares(totals["payer"], "payer"),
+            "expense_percentiles": {
+                f"p{rank}": from_cents(value) if value is not None else None
+                for rank, value in cents_percentiles(self.expenses(), counts["expenses"]).items()
+            },
+            "counts": counts,
+        }
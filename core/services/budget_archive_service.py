@@ -0,0 +1,98 @@
+import json
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.models import (
+    Category,
+    MonthBudgetArchive,
+    MonthBudgetArchiveCategory,
+    month_ordinal,
+)
+from core.services.budget_service import BudgetRangeService, BudgetService
+from core.services.income_plan_month_service import build_income_plan_month_status
+
+
+def _as_json(data):
+    """``data`` exactly as the API renders it (decimals become numbers)."""
+    return json.loads(json.dumps(data, cls=JSONEncoder))
+
+
+def _category_rollups(service, budget):
+    planned = defaultdict(Decimal)
+    names = {}
+    for item in budget["recurring"] + budget["planned"]:
+        planned[item["category"]] += Decimal(item["planned_amount"])
+        names[item["category"]] = item["category_name"]
+
+    spent = service.get_expense_totals().by_category
+    missing = set(spent) - set(names)
+    if missing:
+        names.update(Category.objects.filter(id__in=missing).values_list("id", "name"))
+
+    return [
+        MonthBudgetArchiveCategory(
+            category_id=category_id,
+            category_name=names.get(category_id, ""),
+            planned_amount=planned.get(category_id, 0),
+            spent_amount=spent.get(category_id, 0),
+        )
+        for category_id in sorted(set(planned) | set(spent))
+    ]
+
+
+@transaction.atomic
+def archive_month(month_obj):
+    """Compute and store the frozen budget of a closed month.
+
+    Replaces any previous archive of the month.
+    """
+    family = month_obj.family
+    key = (month_obj.year, month_obj.month)
+    # A stale archive would otherwise be read back by the range service.
+    MonthBudgetArchive.objects.filter(month=month_obj).delete()
+
+    service = BudgetService(
+        family=family,
+        year=month_obj.year,
+        month=month_obj.month,
+        month_obj=month_obj,
+    )
+    budget = service.build_budget()
+    rollups = _category_rollups(service, budget)
+    budget["income_plan_month"] = build_income_plan_month_status(
+        family=family,
+        year=month_obj.year,
+        month=month_obj.month,
+        month_obj=month_obj,
+    )
+    summary = BudgetRangeService(family=family, start=key, end=key).build_range()["months"][0]
+
+    archive = MonthBudgetArchive.objects.create(
+        month=month_obj,
+        document=_as_json(budget),
+        summary=_as_json(summary),
+    )
+    for rollup in rollups:
+        rollup.archive = archive
+    MonthBudgetArchiveCategory.objects.bulk_create(rollups)
+    return archive
+
+
+def discard_month_archive(month_obj):
+    MonthBudgetArchive.objects.filter(month=month_obj).delete()
+
+
+def load_archived_budget(family, year, month):
+    """Archived ``GET /api/budget/`` payload of a closed month, or ``None``."""
+    return (
+        MonthBudgetArchive.objects.filter(
+            month__family=family,
+            month__ordinal=month_ordinal(year, month),
+            month__is_closed=True,
+        )
+        .values_list("document", flat=True)
+        .first()
+    )
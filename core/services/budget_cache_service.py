@@ -0,0 +1,71 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core.services.data_version_service import month_data_versions
+
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def budget_cache_stats():
+    """Hit/miss counters of this worker process since start (or last reset)."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+    return stats
+
+
+def reset_budget_cache_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def _cache_timeout():
+    return getattr(settings, "BUDGET_CACHE_TIMEOUT", 3600)
+
+
+def budget_cache_key(family, year, month, versions):
+    family_version, month_id, month_version = versions
+    # The creation stamp keeps a restored database (or rolled back test) that
+    # reuses ids from reading entries cached for another family.
+    stamp = int(family.created_at.timestamp() * 1_000_000)
+    return (
+        f"budget:{family.id}.{stamp}:{year}-{month}:"
+        f"{family_version}:{month_id or 0}.{month_version or 0}"
+    )
+
+
+def get_cached_budget(service, versions=None):
+    """``service.build_budget()`` through the configured Django cache.
+
+    Keys carry the family and month data versions, which the model signals
+    bump on every write that changes the budget; stale entries are simply
+    never read again and expire. Returns ``(data, hit)``.
+    """
+    timeout = _cache_timeout()
+    if timeout <= 0:
+        return service.build_budget(), False
+
+    cache = caches[getattr(settings, "BUDGET_CACHE_ALIAS", "default")]
+    if versions is None:
+        versions = month_data_versions(service.family, service.year, service.month)
+    key = budget_cache_key(service.family, service.year, service.month, versions)
+
+    data = cache.get(key)
+    if data is not None:
+        _count("hits")
+        return data, True
+
+    _count("misses")
+    data = service.build_budget()
+    cache.set(key, data, timeout)
+    return data, False
@@ -1,3 +1,5 @@
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import date
 from calendar import monthrange
 from decimal import Decimal
@@ -5,50 +7,86 @@ from django.db.models import Sum, Q
 
 
 from core.models import (
-    Month,
     Expense,
+    Income,
+    Month,
+    MonthBudgetArchive,
     PlannedExpense,
-    PlannedExpensePlan,
-    PlannedExpenseVersion,
     RecurringPayment,
     RecurringPaymentOccurrence,
+    month_ordinal,
 )
 from core.serializers.category_serializer import CategorySerializer
 from core.services.budget_rules import WARNING_THRESHOLD, OVER_THRESHOLD
-from core.services.recurring_payment_service import (
-    calculate_recurring_payment_amounts,
+from core.services.budget_snapshot_service import (
+    MonthExpenseTotals,
+    add_expense_row,
+    load_month_expense_totals,
+)
+from core.services.data_version_service import bump_month_versions
+from core.services.month_calendar_service import resolve_month
+from core.services.plan_projection_service import (
+    EXPENSE_PLANS,
+    INCOME_PLANS,
+    project_plans,
 )
+from core.services.money import from_cents, to_cents
+from core.services.recurring_payment_service import recurring_payment_status
+
+
+def calculate_budget_status(planned, spent):
+    """Return ``(status, ratio, remaining)`` for a planned/spent pair of cents.
+
+    ``ratio`` is a ``Decimal`` so ``percentage_used`` keeps its two places.
+    """
+    if planned == 0:
+        return "ok", 0, planned
+
+    ratio = Decimal(spent) / Decimal(planned)
+
+    if ratio >= OVER_THRESHOLD:
+        return "over", ratio, planned - spent
+    if ratio >= WARNING_THRESHOLD:
+        return "warning", ratio, planned - spent
+
+    return "ok", ratio, planned - spent
+
+
+@dataclass(frozen=True)
+class BudgetLine:
+    """One budget row and its amounts in cents, for the month totals."""
+
+    row: dict
+    planned: int
+    spent: int
+    pending: int
 
 
 class BudgetService:
-    def __init__(self, *, family, year, month):
+    def __init__(self, *, family, year, month, month_obj=None):
         self.family = family
         self.year = year
         self.month = month
+        self._month_obj = month_obj
+        self._expense_totals = None
 
     def get_month(self):
-        month, _ = Month.objects.get_or_create(
-            family=self.family,
-            year=self.year,
-            month=self.month,
-            defaults={
-                "is_closed": False,
-            }
-        )
-        return month
+        if self._month_obj is None:
+            self._month_obj = resolve_month(self.family, self.year, self.month)
+        return self._month_obj
 
-    def _calculate_status(self, planned, spent):
-        if planned == 0:
-            return "ok", 0, planned
-
-        ratio = spent / planned
+    def get_expense_totals(self):
+        """Spent totals of the month, read from its persisted snapshot.
 
-        if ratio >= OVER_THRESHOLD:
-            return "over", ratio, planned - spent
-        if ratio >= WARNING_THRESHOLD:
-            return "warning", ratio, planned - spent
+        Recurring, plan and unplanned sections all derive from the same
+        rollups instead of aggregating raw expenses once per section.
+        """
+        if self._expense_totals is None:
+            self._expense_totals = load_month_expense_totals(self.get_month())
+        return self._expense_totals
 
-        return "ok", ratio, planned - spent
+    def _calculate_status(self, planned, spent):
+        return calculate_budget_status(planned, spent)
 
     def _serialize_category(self, category):
         return {
@@ -74,6 +112,9 @@ class BudgetService:
         ).select_related("category", "payer", "payer__profile")
 
     def get_recurring_summary(self):
+        return [line.row for line in self._recurring_lines()]
+
+    def _recurring_lines(self):
         recurrences = list(self.get_active_recurring_payments())
         month_obj = self.get_month()
         existing_occurrences = {
@@ -96,6 +137,8 @@ class BudgetService:
                 missing_occurrences,
                 ignore_conflicts=True,
             )
+            # The new occurrence ids also appear in the month's expense list.
+            bump_month_versions([month_obj.id])
             existing_occurrences = {
                 occurrence.recurring_payment_id: occurrence
                 for occurrence in RecurringPaymentOccurrence.objects.filter(
@@ -103,57 +146,46 @@ class BudgetService:
                     month=month_obj,
                 )
             }
-        recurring_totals = {
-            row["recurring_payment"]: row["total"] or 0
-            for row in (
-                Expense.objects.filter(
-                    recurring_payment__in=recurrences,
-                    month__family=self.family,
-                    month__year=self.year,
-                    month__month=self.month,
-                )
-                .values("recurring_payment")
-                .annotate(total=Sum("amount"))
-            )
-        }
-        result = []
+        recurring_totals = self.get_expense_totals().by_recurring_payment
+        lines = []
 
         for rec in recurrences:
-            spent = recurring_totals.get(rec.id, 0)
             occurrence = existing_occurrences[rec.id]
-            amounts = calculate_recurring_payment_amounts(
-                planned_amount=rec.amount,
-                paid_amount=spent,
-                is_completed=occurrence.is_completed,
+            planned = to_cents(rec.amount)
+            paid = to_cents(recurring_totals.get(rec.id))
+            pending, payment_status = recurring_payment_status(
+                planned,
+                paid,
+                occurrence.is_completed,
             )
 
-            status, ratio, _ = self._calculate_status(
-                amounts.planned_amount,
-                amounts.paid_amount,
-            )
+            status, ratio, _ = self._calculate_status(planned, paid)
+            paid_amount = from_cents(paid)
+            pending_amount = from_cents(pending)
 
-            result.append({
+            row = {
                 "id": rec.id,
                 "occurrence_id": occurrence.id,
                 "name": rec.name,
                 **self._serialize_category(rec.category),
                 "payer": rec.payer_id,
                 "payer_detail": self._serialize_payer(rec.payer),
-                "planned_amount": amounts.planned_amount,
-                "paid_amount": amounts.paid_amount,
-                "pending_amount": amounts.pending_amount,
-                "difference_amount": amounts.difference_amount,
-                "is_completed": amounts.is_completed,
-                "payment_status": amounts.payment_status,
+                "planned_amount": from_cents(planned),
+                "paid_amount": paid_amount,
+                "pending_amount": pending_amount,
+                "difference_amount": from_cents(planned - paid),
+                "is_completed": bool(occurrence.is_completed),
+                "payment_status": payment_status,
                 # Backwards-compatible aliases. ``remaining_amount`` now has
                 # the unambiguous obligation semantics requested by the API.
-                "spent_amount": amounts.paid_amount,
-                "remaining_amount": amounts.pending_amount,
+                "spent_amount": paid_amount,
+                "remaining_amount": pending_amount,
                 "percentage_used": round(ratio * 100, 2),
                 "status": status,
-            })
+            }
+            lines.append(BudgetLine(row, planned, paid, pending))
 
-        return result
+        return lines
 
     def _serialize_payer(self, payer):
         if payer is None:
@@ -172,134 +204,93 @@ class BudgetService:
         }
 
     def get_planned_plans_summary(self):
+        return [line.row for line in self._planned_plan_lines()]
+
+    def _planned_plan_lines(self):
         """
         Returns planned expenses coming from PlannedExpensePlan (new system)
         for the given month, excluding ONE_MONTH plans to avoid duplication
         with legacy PlannedExpense.
         """
-        month_obj = self.get_month()
-
-        plans = PlannedExpensePlan.objects.filter(
-            family=self.family,
-            active=True,
-            plan_type="ONGOING",
-            start_month__lte=month_obj,
-        ).filter(
-            Q(end_month__isnull=True) | Q(end_month__gte=month_obj)
-        ).select_related("category")
-
-        category_ids = [plan.category_id for plan in plans]
-        category_totals = {
-            row["category"]: row["total"] or 0
-            for row in (
-                Expense.objects.filter(
-                    month__family=self.family,
-                    month__year=self.year,
-                    month__month=self.month,
-                    category_id__in=category_ids,
-                )
-                .values("category")
-                .annotate(total=Sum("amount"))
-            )
-        }
+        ordinal = self.get_month().ordinal
+        projections = project_plans(
+            EXPENSE_PLANS,
+            self.family,
+            [ordinal],
+            spent_by_category={ordinal: self.get_expense_totals().by_category},
+        )[ordinal]
 
-        result = []
+        lines = []
 
-        for plan in plans:
-            version = (
-                PlannedExpenseVersion.objects.filter(
-                    plan=plan,
-                    valid_from__lte=month_obj,
-                )
-                .filter(
-                    Q(valid_to__isnull=True) | Q(valid_to__gte=month_obj)
-                )
-                .order_by("-valid_from")
-                .first()
-            )
+        for item in projections:
+            plan, version = item.plan, item.version
 
             if not version:
                 continue
 
-            spent = category_totals.get(plan.category_id, 0)
-
-            status, ratio, remaining = self._calculate_status(
-                version.planned_amount,
-                spent,
-            )
+            planned = to_cents(version.planned_amount)
+            spent = to_cents(item.actual)
+            status, ratio, remaining = self._calculate_status(planned, spent)
 
-            result.append({
+            row = {
                 "id": f"plan-{plan.id}",
                 **self._serialize_category(plan.category),
-                "planned_amount": version.planned_amount,
-                "spent_amount": spent,
-                "remaining_amount": remaining,
+                "planned_amount": from_cents(planned),
+                "spent_amount": from_cents(spent),
+                "remaining_amount": from_cents(remaining),
                 "percentage_used": round(ratio * 100, 2),
                 "status": status,
                 "source": "plan",
-            })
+            }
+            lines.append(BudgetLine(row, planned, spent, max(remaining, 0)))
 
-        return result
+        return lines
 
     def get_planned_expenses_summary(self):
-        planned = PlannedExpense.objects.filter(
+        return [line.row for line in self._planned_expense_lines()]
+
+    def _planned_expense_lines(self):
+        planned_expenses = PlannedExpense.objects.filter(
             family=self.family,
-            month__year=self.year,
-            month__month=self.month,
+            month=self.get_month(),
         ).select_related("category").annotate(spent_total=Sum("expenses__amount"))
 
-        result = []
-        for p in planned:
-            spent = p.spent_total or 0
+        lines = []
+        for p in planned_expenses:
+            planned = to_cents(p.planned_amount)
+            spent = to_cents(p.spent_total)
 
-            status, ratio, remaining = self._calculate_status(p.planned_amount, spent)
+            status, ratio, remaining = self._calculate_status(planned, spent)
 
-            result.append({
+            row = {
                 "id": p.id,
                 **self._serialize_category(p.category),
-                "planned_amount": p.planned_amount,
-                "spent_amount": spent,
-                "remaining_amount": remaining,
+                "planned_amount": from_cents(planned),
+                "spent_amount": from_cents(spent),
+                "remaining_amount": from_cents(remaining),
                 "percentage_used": round(ratio * 100, 2),
                 "status": status,
-            })
+            }
+            lines.append(BudgetLine(row, planned, spent, max(remaining, 0)))
 
-        return result
+        return lines
 
     def get_unplanned_expenses_total(self):
-        total = (
-            Expense.objects.filter(
-                month__family=self.family,
-                month__year=self.year,
-                month__month=self.month,
-                planned_expense__isnull=True,
-                recurring_payment__isnull=True,
-            ).aggregate(total=Sum("amount"))["total"]
-            or 0
-        )
-        return Decimal(total).quantize(Decimal("0.01"))
+        return from_cents(to_cents(self.get_expense_totals().unplanned))
 
     def build_budget(self):
         month = self.get_month()
-        recurring = self.get_recurring_summary()
-        planned_legacy = self.get_planned_expenses_summary()
-        planned_plans = self.get_planned_plans_summary()
-        planned = planned_legacy + planned_plans
-
-        unplanned_total = self.get_unplanned_expenses_total()
+        recurring = self._recurring_lines()
+        planned = self._planned_expense_lines() + self._planned_plan_lines()
+        lines = recurring + planned
 
-        total_planned = sum(r["planned_amount"] for r in recurring) + sum(
-            p["planned_amount"] for p in planned
-        )
-        total_spent = sum(r["spent_amount"] for r in recurring) + sum(
-            p["spent_amount"] for p in planned
-        ) + unplanned_total
+        unplanned = to_cents(self.get_expense_totals().unplanned)
+        total_planned = sum(line.planned for line in lines)
+        total_spent = sum(line.spent for line in lines) + unplanned
 
         status, ratio, remaining = self._calculate_status(total_planned, total_spent)
-        recurring_pending_amount = sum(r["pending_amount"] for r in recurring)
-        planned_pending_amount = sum(
-            max(p["remaining_amount"], 0) for p in planned
-        )
+        recurring_pending = sum(line.pending for line in recurring)
+        planned_pending = sum(line.pending for line in planned)
 
         return {
             "month_id": month.id,
@@ -307,13 +298,258 @@ class BudgetService:
             "month": self.month,
             "status": status,
             "percentage_used": round(ratio * 100, 2),
-            "remaining_amount": remaining,
-            "difference_amount": remaining,
-            "recurring_pending_amount": recurring_pending_amount,
-            "total_pending_amount": recurring_pending_amount + planned_pending_amount,
-            "recurring": recurring,
-            "planned": planned,
-            "unplanned_total": unplanned_total,
-            "total_planned": total_planned,
-            "total_spent": total_spent,
+            "remaining_amount": from_cents(remaining),
+            "difference_amount": from_cents(remaining),
+            "recurring_pending_amount": from_cents(recurring_pending),
+            "total_pending_amount": from_cents(recurring_pending + planned_pending),
+            "recurring": [line.row for line in recurring],
+            "planned": [line.row for line in planned],
+            "unplanned_total": from_cents(unplanned),
+            "total_planned": from_cents(total_planned),
+            "total_spent": from_cents(total_spent),
+        }
+
+
+MAX_RANGE_MONTHS = 60
+
+
+def _month_key(value):
+    return (value.year, value.month)
+
+
+class BudgetRangeService:
+    """Compact budget series for a span of months.
+
+    Same totals as ``BudgetService.build_budget`` for every month, but every
+    input table is read once for the whole range: expenses are grouped by
+    (month, category, recurring_payment, planned_expense) in a single query
+    and plan versions are resolved in memory for all months at once. Reads
+    never create ``Month`` or occurrence rows. Closed months with a budget
+    archive are returned as archived and skip every other query.
+    """
+
+    def __init__(self, *, family, start, end):
+        self.family = family
+        self.start = start
+        self.end = end
+        self.months = self._month_keys(start, end)
+
+    @staticmethod
+    def _month_keys(start, end):
+        if start > end:
+            raise ValueError("start must not be after end")
+
+        keys = []
+        year, month = start
+        while (year, month) <= end:
+            keys.append((year, month))
+            if len(keys) > MAX_RANGE_MONTHS:
+                raise ValueError(f"range cannot exceed {MAX_RANGE_MONTHS} months")
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return keys
+
+    @property
+    def start_ordinal(self):
+        return month_ordinal(*self.start)
+
+    @property
+    def end_ordinal(self):
+        return month_ordinal(*self.end)
+
+    def _load_months(self):
+        return {
+            _month_key(month): month
+            for month in Month.objects.filter(
+                family=self.family,
+                ordinal__gte=self.start_ordinal,
+                ordinal__lte=self.end_ordinal,
+            )
+        }
+
+    def _load_archived_summaries(self, month_ids):
+        """Stored range entries of the closed, archived months."""
+        return dict(
+            MonthBudgetArchive.objects.filter(
+                month_id__in=month_ids,
+                month__is_closed=True,
+            ).values_list("month_id", "summary")
+        )
+
+    def _load_expense_totals(self, month_ids):
+        totals = defaultdict(MonthExpenseTotals)
+        rows = (
+            Expense.objects.filter(month_id__in=month_ids)
+            .values("month", "category", "recurring_payment", "planned_expense")
+            .annotate(total=Sum("amount"))
+            .order_by()
+        )
+        for row in rows:
+            add_expense_row(totals[row["month"]], row)
+        return totals
+
+    def _load_recurring_payments(self):
+        range_start = date(self.start[0], self.start[1], 1)
+        range_end = date(self.end[0], self.end[1], monthrange(*self.end)[1])
+        return list(
+            RecurringPayment.objects.filter(
+                family=self.family,
+                active=True,
+                start_date__lte=range_end,
+            ).filter(
+                Q(end_date__isnull=True) | Q(end_date__gte=range_start)
+            )
+        )
+
+    def _load_completed_occurrences(self, month_ids, recurrences):
+        return set(
+            RecurringPaymentOccurrence.objects.filter(
+                month_id__in=month_ids,
+                recurring_payment__in=recurrences,
+                is_completed=True,
+            ).values_list("recurring_payment_id", "month_id")
+        )
+
+    def _load_legacy_planned(self, month_ids):
+        planned = defaultdict(list)
+        rows = (
+            PlannedExpense.objects.filter(family=self.family, month_id__in=month_ids)
+            .annotate(spent_total=Sum("expenses__amount"))
+            .values_list("month_id", "planned_amount", "spent_total")
+        )
+        for month_id, planned_amount, spent_total in rows:
+            planned[month_id].append((to_cents(planned_amount), to_cents(spent_total)))
+        return planned
+
+    def _load_income_actuals(self, month_ids):
+        """``{month_id: cents}`` of the incomes received."""
+        return {
+            month_id: to_cents(total)
+            for month_id, total in Income.objects.filter(month_id__in=month_ids)
+            .values("month")
+            .annotate(total=Sum("amount"))
+            .order_by()
+            .values_list("month", "total")
+        }
+
+    def build_range(self):
+        months = self._load_months()
+        archived = self._load_archived_summaries([month.id for month in months.values()])
+        month_ids = [month.id for month in months.values() if month.id not in archived]
+
+        expense_totals = self._load_expense_totals(month_ids)
+        recurrences = self._load_recurring_payments()
+        completed = self._load_completed_occurrences(month_ids, recurrences)
+        recurring_cents = [(rec, to_cents(rec.amount)) for rec in recurrences]
+        legacy_planned = self._load_legacy_planned(month_ids)
+        live = {
+            month_ordinal(*key): expense_totals.get(months[key].id if key in months else None)
+            for key in self.months
+            if key not in months or months[key].id not in archived
+        }
+        expense_projection = project_plans(
+            EXPENSE_PLANS,
+            self.family,
+            list(live),
+            spent_by_category={
+                ordinal: totals.by_category for ordinal, totals in live.items() if totals
+            },
+        )
+        income_projection = project_plans(INCOME_PLANS, self.family, list(live), actuals=False)
+        income_actuals = self._load_income_actuals(month_ids)
+
+        series = [
+            archived[months[key].id]
+            if key in months and months[key].id in archived
+            else self._build_month(
+                key,
+                months.get(key),
+                expense_totals=expense_totals,
+                recurrences=recurring_cents,
+                completed=completed,
+                legacy_planned=legacy_planned,
+                expense_projection=expense_projection,
+                income_projection=income_projection,
+                income_actuals=income_actuals,
+            )
+            for key in self.months
+        ]
+
+        return {
+            "from": "%04d-%02d" % self.start,
+            "to": "%04d-%02d" % self.end,
+            "months": series,
+        }
+
+    def _build_month(
+        self,
+        key,
+        month_obj,
+        *,
+        expense_totals,
+        recurrences,
+        completed,
+        legacy_planned,
+        expense_projection,
+        income_projection,
+        income_actuals,
+    ):
+        year, month = key
+        ordinal = month_ordinal(year, month)
+        month_id = month_obj.id if month_obj is not None else None
+        totals = expense_totals.get(month_id) or MonthExpenseTotals()
+        month_start = date(year, month, 1)
+        month_end = date(year, month, monthrange(year, month)[1])
+
+        recurring_planned = recurring_spent = recurring_pending = 0
+        for rec, planned in recurrences:
+            if rec.start_date > month_end or (
+                rec.end_date is not None and rec.end_date < month_start
+            ):
+                continue
+            paid = to_cents(totals.by_recurring_payment.get(rec.id))
+            pending, _ = recurring_payment_status(planned, paid, (rec.id, month_id) in completed)
+            recurring_planned += planned
+            recurring_spent += paid
+            recurring_pending += pending
+
+        planned_planned = planned_spent = planned_pending = 0
+        planned_items = list(legacy_planned.get(month_id, []))
+        for item in expense_projection[ordinal]:
+            if item.version is not None:
+                planned_items.append((to_cents(item.version.planned_amount), to_cents(item.actual)))
+        for planned, spent in planned_items:
+            planned_planned += planned
+            planned_spent += spent
+            planned_pending += max(planned - spent, 0)
+
+        income_planned = sum(
+            to_cents(item.version.planned_amount)
+            for item in income_projection[ordinal]
+            if item.version is not None
+        )
+
+        unplanned = to_cents(totals.unplanned)
+        total_planned = recurring_planned + planned_planned
+        total_spent = recurring_spent + planned_spent + unplanned
+        status, ratio, remaining = calculate_budget_status(total_planned, total_spent)
+
+        return {
+            "year": year,
+            "month": month,
+            "month_id": month_id,
+            "is_closed": bool(month_obj and month_obj.is_closed),
+            "status": status,
+            "percentage_used": round(ratio * 100, 2),
+            "total_planned": from_cents(total_planned),
+            "total_spent": from_cents(total_spent),
+            "remaining_amount": from_cents(remaining),
+            "unplanned_total": from_cents(unplanned),
+            "recurring_planned": from_cents(recurring_planned),
+            "recurring_spent": from_cents(recurring_spent),
+            "recurring_pending_amount": from_cents(recurring_pending),
+            "planned_planned": from_cents(planned_planned),
+            "planned_spent": from_cents(planned_spent),
+            "total_pending_amount": from_cents(recurring_pending + planned_pending),
+            "income_planned": from_cents(income_planned),
+            "income_actual": from_cents(income_actuals.get(month_id, 0)),
         }
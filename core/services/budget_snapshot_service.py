@@ -0,0 +1,241 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from core.models import (
+    Expense,
+    Month,
+    MonthBudgetCategoryRollup,
+    MonthBudgetRecurringRollup,
+    MonthBudgetSnapshot,
+)
+
+
+@dataclass
+class MonthExpenseTotals:
+    """Spent amounts of a month, grouped the ways the budget needs them."""
+
+    by_category: dict = field(default_factory=dict)
+    by_recurring_payment: dict = field(default_factory=dict)
+    unplanned: Decimal = Decimal("0")
+    total: Decimal = Decimal("0")
+
+
+@dataclass(frozen=True)
+class ExpenseBudgetEntry:
+    """The fields of an ``Expense`` that feed the month snapshot."""
+
+    month_id: int
+    category_id: int
+    recurring_payment_id: int
+    planned_expense_id: int
+    amount: Decimal
+
+    @property
+    def is_unplanned(self):
+        return self.recurring_payment_id is None and self.planned_expense_id is None
+
+
+def expense_budget_entry(expense):
+    return ExpenseBudgetEntry(
+        month_id=expense.month_id,
+        category_id=expense.category_id,
+        recurring_payment_id=expense.recurring_payment_id,
+        planned_expense_id=expense.planned_expense_id,
+        amount=Decimal(expense.amount),
+    )
+
+
+def _lock_months(month_ids):
+    """Serialize snapshot builders and writers of the given months.
+
+    ``FOR NO KEY UPDATE`` does not conflict with the key-share lock taken by
+    inserting an ``Expense`` that references the month, so concurrent writers
+    never deadlock on each other's inserts.
+    """
+    list(
+        Month.objects.select_for_update(no_key=True)
+        .filter(id__in=month_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def _totals_from_snapshot(snapshot):
+    return MonthExpenseTotals(
+        by_category={
+            rollup.category_id: rollup.total
+            for rollup in snapshot.category_rollups.all()
+        },
+        by_recurring_payment={
+            rollup.recurring_payment_id: rollup.total
+            for rollup in snapshot.recurring_rollups.all()
+        },
+        unplanned=snapshot.unplanned_total,
+        total=snapshot.total_spent,
+    )
+
+
+def add_expense_row(totals, row):
+    """Fold one grouped (category, recurring_payment, planned_expense) row in."""
+    amount = row["total"] or 0
+    category_id = row["category"]
+    recurring_id = row["recurring_payment"]
+
+    totals.total += amount
+    totals.by_category[category_id] = totals.by_category.get(category_id, 0) + amount
+    if recurring_id is not None:
+        totals.by_recurring_payment[recurring_id] = (
+            totals.by_recurring_payment.get(recurring_id, 0) + amount
+        )
+    elif row["planned_expense"] is None:
+        totals.unplanned += amount
+
+
+def aggregate_month_expenses(month):
+    """Compute the month totals straight from ``Expense`` in one grouped query."""
+    totals = MonthExpenseTotals()
+    rows = (
+        Expense.objects.filter(month=month)
+        .values("category", "recurring_payment", "planned_expense")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    for row in rows:
+        add_expense_row(totals, row)
+    return totals
+
+
+def rebuild_month_snapshot(month):
+    """(Re)create the snapshot of ``month`` from its raw expenses."""
+    with transaction.atomic():
+        _lock_months([month.id])
+        MonthBudgetSnapshot.objects.filter(month=month).delete()
+
+        totals = aggregate_month_expenses(month)
+        snapshot = MonthBudgetSnapshot.objects.create(
+            month=month,
+            total_spent=totals.total,
+            unplanned_total=totals.unplanned,
+        )
+        MonthBudgetCategoryRollup.objects.bulk_create(
+            MonthBudgetCategoryRollup(snapshot=snapshot, category_id=category_id, total=total)
+            for category_id, total in totals.by_category.items()
+        )
+        MonthBudgetRecurringRollup.objects.bulk_create(
+            MonthBudgetRecurringRollup(
+                snapshot=snapshot,
+                recurring_payment_id=recurring_id,
+                total=total,
+            )
+            for recurring_id, total in totals.by_recurring_payment.items()
+        )
+    return totals
+
+
+def load_month_expense_totals(month):
+    """Return the month totals, building the snapshot on first access."""
+    snapshot = (
+        MonthBudgetSnapshot.objects.filter(month=month)
+        .prefetch_related("category_rollups", "recurring_rollups")
+        .first()
+    )
+    if snapshot is not None:
+        return _totals_from_snapshot(snapshot)
+    return rebuild_month_snapshot(month)
+
+
+def _add_to_rollup(model, snapshot_id, key_field, key, amount):
+    updated = model.objects.filter(
+        snapshot_id=snapshot_id,
+        **{key_field: key},
+    ).update(total=F("total") + amount)
+    if not updated:
+        model.objects.create(snapshot_id=snapshot_id, total=amount, **{key_field: key})
+
+
+def apply_expense_changes(changes):
+    """Apply ``(ExpenseBudgetEntry, sign)`` deltas to the affected snapshots.
+
+    Must run in the same transaction as the expense writes it describes so a
+    concurrent snapshot rebuild either sees both or neither. Months without a
+    snapshot are skipped; they are built from scratch on the next read.
+    """
+    changes = [(entry, sign) for entry, sign in changes if entry is not None]
+    if not changes:
+        return
+
+    month_ids = {entry.month_id for entry, _ in changes}
+    with transaction.atomic():
+        _lock_months(month_ids)
+        snapshot_ids = dict(
+            MonthBudgetSnapshot.objects.filter(month_id__in=month_ids).values_list(
+                "month_id", "id"
+            )
+        )
+        if not snapshot_ids:
+            return
+
+        totals = defaultdict(Decimal)
+        unplanned = defaultdict(Decimal)
+        by_category = defaultdict(Decimal)
+        by_recurring = defaultdict(Decimal)
+        for entry, sign in changes:
+            snapshot_id = snapshot_ids.get(entry.month_id)
+            if snapshot_id is None:
+                continue
+            amount = entry.amount * sign
+            totals[snapshot_id] += amount
+            by_category[(snapshot_id, entry.category_id)] += amount
+            if entry.recurring_payment_id is not None:
+                by_recurring[(snapshot_id, entry.recurring_payment_id)] += amount
+            elif entry.is_unplanned:
+                unplanned[snapshot_id] += amount
+
+        for snapshot_id, amount in totals.items():
+            MonthBudgetSnapshot.objects.filter(id=snapshot_id).update(
+                total_spent=F("total_spent") + amount,
+                unplanned_total=F("unplanned_total") + unplanned[snapshot_id],
+            )
+        for (snapshot_id, category_id), amount in by_category.items():
+            if amount:
+                _add_to_rollup(
+                    MonthBudgetCategoryRollup, snapshot_id, "category_id", category_id, amount
+                )
+        for (snapshot_id, recurring_id), amount in by_recurring.items():
+            if amount:
+                _add_to_rollup(
+                    MonthBudgetRecurringRollup,
+                    snapshot_id,
+                    "recurring_payment_id",
+                    recurring_id,
+                    amount,
+                )
+
+
+def record_expense_change(*, before=None, after=None):
+    """Move an expense's contribution from ``before`` to ``after``."""
+    if before == after:
+        return
+    apply_expense_changes([(before, -1), (after, 1)])
+
+
+def record_expenses_created(expenses):
+    apply_expense_changes((expense_budget_entry(expense), 1) for expense in expenses)
+
+
+def invalidate_month_snapshots(month_ids):
+    """Drop snapshots that can no longer be patched incrementally.
+
+    Used when expenses are rewritten in bulk behind the ORM's back (e.g. a
+    ``SET_NULL`` cascade); the next read rebuilds them.
+    """
+    month_ids = set(month_ids)
+    if not month_ids:
+        return
+    with transaction.atomic():
+        _lock_months(month_ids)
+        MonthBudgetSnapshot.objects.filter(month_id__in=month_ids).delete()
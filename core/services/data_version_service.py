@@ -0,0 +1,77 @@
+from django.db.models import F, OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+
+from core.models import Family, Month, month_ordinal
+
+
+def bump_month_versions(month_ids):
+    month_ids = {month_id for month_id in month_ids if month_id is not None}
+    if month_ids:
+        Month.objects.filter(id__in=month_ids).update(data_version=F("data_version") + 1)
+
+
+def bump_month_range(family_id, start_ordinal, end_ordinal=None):
+    """Bump every existing month of a family in ``start..end`` (open when ``None``)."""
+    if family_id is None or start_ordinal is None:
+        return
+    months = Month.objects.filter(family_id=family_id, ordinal__gte=start_ordinal)
+    if end_ordinal is not None:
+        months = months.filter(ordinal__lte=end_ordinal)
+    months.update(data_version=F("data_version") + 1)
+
+
+def bump_family_version(family_id):
+    if family_id is not None:
+        Family.objects.filter(id=family_id).update(data_version=F("data_version") + 1)
+
+
+def month_data_versions(family, year, month):
+    """``(family version, month id, month version)`` in one query.
+
+    ``month id`` and ``month version`` are ``None`` while the month does not
+    exist yet.
+    """
+    months = Month.objects.filter(family_id=OuterRef("pk"), ordinal=month_ordinal(year, month))
+    return (
+        Family.objects.filter(id=family.id)
+        .annotate(
+            month_id=Subquery(months.values("id")[:1]),
+            month_version=Subquery(months.values("data_version")[:1]),
+        )
+        .values_list("data_version", "month_id", "month_version")
+        .first()
+    ) or (0, None, None)
+
+
+def month_etag(family, year, month, versions=None):
+    """Strong ETag of everything a month-scoped read of ``family`` returns.
+
+    A month that does not exist yet is tagged as such, so creating it
+    changes the tag.
+    """
+    family_version, month_id, month_version = versions or month_data_versions(
+        family, year, month
+    )
+    return quote_etag(
+        f"{family.id}.{family_version}-{month_id or 0}.{month_version or 0}"
+    )
+
+
+def check_month_etag(request, family, year, month, versions=None):
+    """Return ``(etag, not_modified)`` for a month-scoped GET.
+
+    ``not_modified`` is a ready ``304`` when the client's copy is current,
+    otherwise ``None`` and the view builds its response as usual.
+    """
+    etag = month_etag(family, year, month, versions)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        set_etag(not_modified, etag)
+    return etag, not_modified
+
+
+def set_etag(response, etag):
+    response["ETag"] = etag
+    # Session-authenticated data: browsers may keep it but must revalidate.
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
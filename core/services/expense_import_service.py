@@ -0,0 +1,303 @@
+import csv
+import io
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from core.models import Category, Expense, Month
+from core.services.budget_snapshot_service import record_expenses_created
+from core.services.data_version_service import bump_month_versions
+from core.services.month_calendar_service import ensure_months
+
+
+IMPORT_CHUNK_SIZE = 1000
+_AMOUNT_FIELD = Expense._meta.get_field("amount")
+# Smallest amount that no longer fits the ``amount`` column.
+AMOUNT_LIMIT = Decimal(10) ** (_AMOUNT_FIELD.max_digits - _AMOUNT_FIELD.decimal_places)
+MAX_REPORTED_ERRORS = 500
+FILE_TYPES = ("csv", "jsonl", "ofx")
+
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".ofx": "ofx",
+    ".qfx": "ofx",
+}
+_OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<\r\n]*)", re.IGNORECASE)
+
+
+class ImportFormatError(ValueError):
+    """The uploaded file cannot be parsed as the requested format."""
+
+
+@dataclass
+class ExpenseImportReport:
+    created: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+
+def detect_file_type(filename, requested=None):
+    if requested:
+        requested = requested.lower()
+        if requested not in FILE_TYPES:
+            raise ImportFormatError(f"file_type must be one of {', '.join(FILE_TYPES)}")
+        return requested
+    for extension, file_type in _EXTENSIONS.items():
+        if (filename or "").lower().endswith(extension):
+            return file_type
+    raise ImportFormatError("Cannot detect the file type, pass file_type")
+
+
+def _text_stream(binary):
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def iter_csv_rows(binary):
+    reader = csv.DictReader(_text_stream(binary))
+    if not reader.fieldnames:
+        return
+    for line, row in enumerate(reader, start=2):
+        yield line, {
+            (key or "").strip().lower(): (value or "").strip()
+            for key, value in row.items()
+        }
+
+
+def iter_json_lines(binary):
+    for line, raw in enumerate(_text_stream(binary), start=1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            row = json.loads(raw)
+        except json.JSONDecodeError:
+            yield line, None
+            continue
+        yield line, row if isinstance(row, dict) else None
+
+
+def iter_ofx_rows(binary):
+    """Yield the ``STMTTRN`` blocks of an OFX (SGML or XML) statement.
+
+    Debits become positive expense amounts; credits are yielded with a
+    non-positive amount so they are reported instead of imported.
+    """
+    transaction_row = None
+    start_line = 0
+    for line, raw in enumerate(_text_stream(binary), start=1):
+        for closing, tag, value in _OFX_TAG.findall(raw):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and transaction_row is not None:
+                    yield start_line, _ofx_to_row(transaction_row)
+                    transaction_row = None
+                elif not closing:
+                    transaction_row, start_line = {}, line
+            elif transaction_row is not None and not closing:
+                transaction_row[tag] = value.strip()
+
+
+def _ofx_to_row(values):
+    amount = values.get("TRNAMT", "")
+    if amount.startswith("-"):
+        amount = amount[1:]
+    elif amount:
+        amount = f"-{amount}"
+    return {
+        "date": values.get("DTPOSTED", "")[:8],
+        "amount": amount,
+        "description": values.get("NAME") or values.get("MEMO") or "",
+    }
+
+
+_PARSERS = {"csv": iter_csv_rows, "jsonl": iter_json_lines, "ofx": iter_ofx_rows}
+
+
+def _parse_date(value):
+    value = str(value or "").strip()
+    for pattern in ("%Y-%m-%d", "%d/%m/%Y", "%Y%m%d"):
+        try:
+            return datetime.strptime(value, pattern).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_amount(value):
+    value = str(value or "").strip()
+    if "," in value and "." not in value:
+        value = value.replace(",", ".")
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    if abs(amount) >= AMOUNT_LIMIT:
+        # Left unrounded: quantizing it could overflow. ``_validate`` rejects it.
+        return amount
+    try:
+        return amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        return None
+
+
+class FamilyLookups:
+    """Family categories and payers, loaded once per import."""
+
+    def __init__(self, family):
+        self.categories = {}
+        for category_id, name in Category.objects.filter(family=family).values_list("id", "name"):
+            self.categories[str(category_id)] = category_id
+            self.categories.setdefault(name.strip().lower(), category_id)
+
+        self.payers = {}
+        for user_id, username in User.objects.filter(
+            profile__family=family,
+            is_active=True,
+        ).values_list("id", "username"):
+            self.payers[str(user_id)] = user_id
+            self.payers[username.lower()] = user_id
+
+    def category(self, value):
+        return self.categories.get(str(value or "").strip().lower())
+
+    def payer(self, value):
+        return self.payers.get(str(value or "").strip().lower())
+
+
+class ExpenseImporter:
+    """Validate and insert expense rows for one family in chunks.
+
+    Rows are consumed from a generator, so memory is bounded by the chunk
+    size. Each chunk resolves its months in one pass and is inserted with
+    ``bulk_create`` in its own transaction; invalid rows are skipped and
+    reported with their line number.
+    """
+
+    def __init__(self, *, family, user, default_category=None, chunk_size=IMPORT_CHUNK_SIZE):
+        self.family = family
+        self.user = user
+        self.chunk_size = chunk_size
+        self.lookups = FamilyLookups(family)
+        self.default_category_id = None
+        if default_category not in (None, ""):
+            self.default_category_id = self.lookups.category(default_category)
+            if self.default_category_id is None:
+                raise ImportFormatError("default_category does not belong to your family")
+        self.report = ExpenseImportReport()
+
+    def run(self, binary, file_type):
+        chunk = []
+        for line, row in _PARSERS[file_type](binary):
+            chunk.append((line, row))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+        return self.report
+
+    def _validate(self, row):
+        if row is None:
+            return None, {"detail": "Row is not a valid JSON object"}
+
+        errors = {}
+        expense_date = _parse_date(row.get("date"))
+        if expense_date is None:
+            errors["date"] = "Expected YYYY-MM-DD or DD/MM/YYYY"
+
+        amount = _parse_amount(row.get("amount"))
+        if amount is None:
+            errors["amount"] = "amount must be a number"
+        elif amount <= 0:
+            errors["amount"] = "Amount must be greater than 0"
+        elif amount >= AMOUNT_LIMIT:
+            errors["amount"] = f"Amount must be less than {AMOUNT_LIMIT}"
+
+        category_value = row.get("category")
+        if category_value in (None, ""):
+            category_id = self.default_category_id
+        else:
+            category_id = self.lookups.category(category_value)
+        if category_id is None:
+            errors["category"] = "Category does not belong to your family"
+
+        payer_value = row.get("payer")
+        payer_id = self.user.id
+        if payer_value not in (None, ""):
+            payer_id = self.lookups.payer(payer_value)
+            if payer_id is None:
+                errors["payer"] = "Payer does not belong to your family"
+
+        description = str(row.get("description") or "")[:255]
+        if errors:
+            return None, errors
+        return (expense_date, amount, category_id, payer_id, description), None
+
+    def _import_chunk(self, chunk):
+        valid = []
+        for line, row in chunk:
+            values, errors = self._validate(row)
+            if errors:
+                self.report.add_error(line, errors)
+            else:
+                valid.append((line, values))
+        if not valid:
+            return
+
+        with transaction.atomic():
+            created = ensure_months(
+                self.family,
+                sorted({(values[0].year, values[0].month) for _, values in valid}),
+            )
+            # Same lock as generation and snapshots: a month cannot be closed
+            # halfway through the chunk.
+            months = {
+                (month.year, month.month): month
+                for month in Month.objects.select_for_update(no_key=True)
+                .filter(id__in=[month.id for month in created.values()])
+                .order_by("id")
+            }
+            expenses = []
+            for line, (expense_date, amount, category_id, payer_id, description) in valid:
+                month_obj = months[(expense_date.year, expense_date.month)]
+                if month_obj.is_closed:
+                    self.report.add_error(
+                        line,
+                        {"date": "This month is closed and cannot be modified"},
+                    )
+                    continue
+                expenses.append(
+                    Expense(
+                        month=month_obj,
+                        user=self.user,
+                        payer_id=payer_id,
+                        amount=amount,
+                        category_id=category_id,
+                        date=expense_date,
+                        description=description,
+                    )
+                )
+            # ``bulk_create`` bypasses the Expense signals.
+            Expense.objects.bulk_create(expenses)
+            record_expenses_created(expenses)
+            bump_month_versions({expense.month_id for expense in expenses})
+        self.report.created += len(expenses)
+
+
+def import_expenses(*, family, user, binary, file_type, default_category=None):
+    importer = ExpenseImporter(family=family, user=user, default_category=default_category)
+    return importer.run(binary, file_type)
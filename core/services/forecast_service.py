@@ -0,0 +1,136 @@
+from calendar import monthrange
+from datetime import date
+
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from core.models import PlannedExpense, RecurringPayment, month_ordinal
+from core.services.money import from_cents, to_cents
+from core.services.month_calendar_service import month_from_ordinal
+from core.services.plan_projection_service import (
+    EXPENSE_PLANS,
+    INCOME_PLANS,
+    project_plans,
+)
+
+
+DEFAULT_FORECAST_MONTHS = 12
+MAX_FORECAST_MONTHS = 60
+
+
+def _month_label(ordinal):
+    return "%04d-%02d" % month_from_ordinal(ordinal)
+
+
+def recurring_due_date(payment, year, month):
+    """Day ``payment`` falls due in the month, clamped to short months."""
+    return date(year, month, min(payment.due_day, monthrange(year, month)[1]))
+
+
+def recurring_is_due(payment, year, month):
+    """Whether the payment's due date in the month is within its start/end dates."""
+    due = recurring_due_date(payment, year, month)
+    return payment.start_date <= due and (payment.end_date is None or payment.end_date >= due)
+
+
+class ForecastService:
+    """Planned cash flow of ``months`` months starting at ``start``.
+
+    Income comes from income plan versions, fixed payments from active
+    recurring payments due in each month and planned expenses from ONGOING
+    expense plan versions plus legacy ``PlannedExpense`` rows. Every table is
+    read once for the whole span and the months are projected in memory, so
+    the query count does not depend on ``months``. Reads never create
+    ``Month`` rows.
+    """
+
+    def __init__(self, *, family, months=DEFAULT_FORECAST_MONTHS, start=None):
+        if not 1 <= months <= MAX_FORECAST_MONTHS:
+            raise ValueError(f"months must be between 1 and {MAX_FORECAST_MONTHS}")
+        if start is None:
+            today = timezone.localdate()
+            start = (today.year, today.month)
+        self.family = family
+        first = month_ordinal(*start)
+        self.ordinals = list(range(first, first + months))
+
+    def _load_recurring_payments(self):
+        first_year, first_month = month_from_ordinal(self.ordinals[0])
+        last_year, last_month = month_from_ordinal(self.ordinals[-1])
+        return list(
+            RecurringPayment.objects.filter(
+                family=self.family,
+                active=True,
+                start_date__lte=date(last_year, last_month, monthrange(last_year, last_month)[1]),
+            ).filter(
+                Q(end_date__isnull=True) | Q(end_date__gte=date(first_year, first_month, 1))
+            )
+        )
+
+    def _load_legacy_planned(self):
+        """``{ordinal: cents}`` of the legacy planned expenses."""
+        rows = (
+            PlannedExpense.objects.filter(
+                family=self.family,
+                month__ordinal__gte=self.ordinals[0],
+                month__ordinal__lte=self.ordinals[-1],
+            )
+            .values("month__ordinal")
+            .annotate(total=Sum("planned_amount"))
+            .order_by()
+            .values_list("month__ordinal", "total")
+        )
+        return {ordinal: to_cents(total) for ordinal, total in rows}
+
+    @staticmethod
+    def _planned_total(projection):
+        return sum(
+            to_cents(item.version.planned_amount)
+            for item in projection
+            if item.version is not None
+        )
+
+    def build_forecast(self):
+        incomes = project_plans(INCOME_PLANS, self.family, self.ordinals, actuals=False)
+        expenses = project_plans(EXPENSE_PLANS, self.family, self.ordinals, actuals=False)
+        recurrences = [(rec, to_cents(rec.amount)) for rec in self._load_recurring_payments()]
+        legacy_planned = self._load_legacy_planned()
+
+        series = []
+        totals = {"income_planned": 0, "recurring_planned": 0, "planned_planned": 0}
+        balance = 0
+        for ordinal in self.ordinals:
+            year, month = month_from_ordinal(ordinal)
+            income_planned = self._planned_total(incomes[ordinal])
+            recurring_planned = sum(
+                cents for rec, cents in recurrences if recurring_is_due(rec, year, month)
+            )
+            planned_planned = (
+                self._planned_total(expenses[ordinal]) + legacy_planned.get(ordinal, 0)
+            )
+            net = income_planned - recurring_planned - planned_planned
+            balance += net
+
+            totals["income_planned"] += income_planned
+            totals["recurring_planned"] += recurring_planned
+            totals["planned_planned"] += planned_planned
+            series.append({
+                "year": year,
+                "month": month,
+                "income_planned": from_cents(income_planned),
+                "recurring_planned": from_cents(recurring_planned),
+                "planned_planned": from_cents(planned_planned),
+                "total_planned": from_cents(recurring_planned + planned_planned),
+                "net": from_cents(net),
+                "cumulative_net": from_cents(balance),
+            })
+
+        return {
+            "from": _month_label(self.ordinals[0]),
+            "to": _month_label(self.ordinals[-1]),
+            "months": series,
+            "totals": {
+                **{key: from_cents(value) for key, value in totals.items()},
+                "net": from_cents(balance),
+            },
+        }
@@ -0,0 +1,127 @@
+import calendar
+import datetime
+
+from django.db.models import Q
+
+from core.models import Income, month_ordinal
+from core.serializers.category_serializer import CategorySerializer
+from core.services.data_version_service import bump_month_versions
+from core.services.month_calendar_service import resolve_month
+from core.services.plan_projection_service import INCOME_PLANS, project_plans
+
+
+# Helper functions for month comparisons and income plan month status
+def lte_month_q(prefix: str, year: int, month: int) -> Q:
+    """prefix.ordinal <= (year, month): a single indexed comparison."""
+    return Q(**{f"{prefix}__ordinal__lte": month_ordinal(year, month)})
+
+
+def gte_month_q(prefix: str, year: int, month: int) -> Q:
+    """prefix.ordinal >= (year, month): a single indexed comparison."""
+    return Q(**{f"{prefix}__ordinal__gte": month_ordinal(year, month)})
+
+
+def default_income_date(year: int, month: int, due_day: int = None) -> datetime.date:
+    last_day = calendar.monthrange(year, month)[1]
+    if due_day is None:
+        day = last_day
+    else:
+        day = max(1, min(int(due_day), last_day))
+    return datetime.date(year, month, day)
+
+
+def load_income_plan_month(family, month_obj):
+    """``PlanMonth`` projections of the income plans applicable to ``month_obj``.
+
+    Each carries the live version and the resolved ``Income`` (if any), read
+    in three queries whatever the number of plans.
+    """
+    return project_plans(INCOME_PLANS, family, [month_obj.ordinal])[month_obj.ordinal]
+
+
+def build_income_plan_month_status(family, year: int, month: int, month_obj=None):
+    """Return income plans applicable to (year, month) with PENDING/RESOLVED status.
+
+    This is used by the BudgetView so the frontend can show 'planificados pendientes' and
+    resolve them (confirm/adjust) later. Callers that already resolved the
+    ``Month`` row can pass it as ``month_obj`` to skip the lookup.
+    """
+    if month_obj is None:
+        month_obj = resolve_month(family, year, month)
+
+    results = []
+    for item in load_income_plan_month(family, month_obj):
+        plan, version, existing_income = item.plan, item.version, item.actual
+
+        if existing_income:
+            status = 'RESOLVED'
+        else:
+            status = 'PENDING' if version is not None else 'MISSING_VERSION'
+
+        results.append({
+            'plan_id': plan.id,
+            'name': plan.name,
+            'plan_type': plan.plan_type,
+            'due_day': plan.due_day,
+            'start_month': plan.start_month_id,
+            'end_month': plan.end_month_id,
+            'category': plan.category_id,
+            'category_detail': CategorySerializer(plan.category).data,
+            'version_id': version.id if version else None,
+            'planned_amount': str(version.planned_amount) if version else None,
+            'status': status,
+            'can_resolve': (not month_obj.is_closed) and (version is not None) and (existing_income is None),
+            'resolved_income': {
+                'id': existing_income.id,
+                'amount': str(existing_income.amount),
+                'date': existing_income.date,
+                'description': existing_income.description,
+            } if existing_income else None,
+        })
+
+    return {
+        'month': {
+            'id': month_obj.id,
+            'year': year,
+            'month': month,
+            'is_closed': month_obj.is_closed,
+        },
+        'results': results,
+    }
+
+
+def confirm_pending_income_plans(*, family, user, month_obj):
+    """Confirm every PENDING plan of ``month_obj`` at its planned amount.
+
+    One insert for all plans; the unique ``(month, income_plan)`` constraint
+    skips plans confirmed concurrently. The caller checks and locks the
+    month. Returns the incomes actually inserted, re-read so they carry ids.
+    """
+    incomes = [
+        Income(
+            month=month_obj,
+            user=user,
+            amount=item.version.planned_amount,
+            category_id=item.plan.category_id,
+            income_plan=item.plan,
+            date=default_income_date(month_obj.year, month_obj.month, item.plan.due_day),
+        )
+        for item in load_income_plan_month(family, month_obj)
+        if item.version is not None and item.actual is None
+    ]
+    if not incomes:
+        return []
+
+    # ``ignore_conflicts`` inserts do not report which rows were skipped, so
+    # the plans' rows are compared before and after the insert.
+    confirmed = Income.objects.filter(
+        month=month_obj,
+        income_plan_id__in=[income.income_plan_id for income in incomes],
+    )
+    existing = list(confirmed.values_list("id", flat=True))
+    Income.objects.bulk_create(incomes, ignore_conflicts=True)
+    inserted = list(confirmed.exclude(id__in=existing).order_by("id"))
+    if inserted:
+        # ``bulk_create`` bypasses the Income signals.
+        bump_month_versions([month_obj.id])
+    return inserted
@@ -0,0 +1,19 @@
+from decimal import Decimal
+
+
+def to_cents(amount):
+    """Integer cents of ``amount`` (``None`` is zero).
+
+    Services add and compare money as ``int`` cents and only turn results
+    back into ``Decimal`` with :func:`from_cents` where they leave the
+    service. Rounds half to even like ``Decimal.quantize``, which also
+    absorbs the float drift of ``Sum`` on some databases.
+    """
+    if amount is None:
+        return 0
+    return round(amount * 100)
+
+
+def from_cents(cents):
+    """Two-decimal ``Decimal`` of ``cents``."""
+    return Decimal(cents).scaleb(-2)
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import Month, month_ordinal
+
+
+def month_from_ordinal(ordinal):
+    """``(year, month)`` of a :func:`core.models.month_ordinal`."""
+    year, index = divmod(ordinal - 1, 12)
+    return year, index + 1
+
+
+def parse_year_month(value):
+    """``(year, month)`` of a ``YYYY-MM`` string; raises ``ValueError`` otherwise."""
+    try:
+        year, month = (int(part) for part in str(value).split("-"))
+    except ValueError:
+        raise ValueError(f"Invalid month {value!r}, expected YYYY-MM") from None
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month {value!r}, expected YYYY-MM")
+    return year, month
+
+
+def month_keys_around(year, month, window):
+    """``(year, month)`` pairs from ``window`` months before to ``window`` after."""
+    center = month_ordinal(year, month)
+    return [month_from_ordinal(ordinal) for ordinal in range(center - window, center + window + 1)]
+
+
+def ensure_months(family, keys):
+    """Return ``{(year, month): Month}`` for ``keys``, creating missing rows in bulk.
+
+    Missing rows are inserted with one conflict-ignoring statement, so
+    concurrent callers never race on the ``(family, year, month)`` constraint.
+    Raises ``ValueError`` before writing anything when a month is outside 1..12.
+    """
+    keys = list(keys)
+    ordinals = [month_ordinal(year, month) for year, month in keys]
+    months = Month.objects.filter(family=family, ordinal__in=ordinals)
+    found = {(month.year, month.month): month for month in months}
+
+    missing = [key for key in keys if key not in found]
+    if missing:
+        # ``bulk_create`` skips ``Month.save()``, so the ordinal is set here.
+        Month.objects.bulk_create(
+            [
+                Month(
+                    family=family,
+                    year=year,
+                    month=month,
+                    ordinal=month_ordinal(year, month),
+                    is_closed=False,
+                )
+                for year, month in missing
+            ],
+            ignore_conflicts=True,
+        )
+        found.update(
+            ((month.year, month.month), month)
+            for month in Month.objects.filter(
+                family=family,
+                ordinal__in=[month_ordinal(year, month) for year, month in missing],
+            )
+        )
+    return found
+
+
+def provision_months(family, *, around=None, window=None):
+    """Pre-create the family's months ``window`` months either side of ``around``.
+
+    ``around`` defaults to the current month and ``window`` to
+    ``settings.MONTH_CALENDAR_WINDOW``. Returns how many rows were missing.
+    """
+    if around is None:
+        today = timezone.localdate()
+        around = (today.year, today.month)
+    if window is None:
+        window = settings.MONTH_CALENDAR_WINDOW
+    keys = month_keys_around(*around, window)
+    existing = Month.objects.filter(
+        family=family,
+        ordinal__in=[month_ordinal(year, month) for year, month in keys],
+    ).count()
+    ensure_months(family, keys)
+    return len(keys) - existing
+
+
+def get_month_id(family, year, month):
+    """Id of the family's month, or ``None`` when it does not exist. Never writes."""
+    return (
+        Month.objects.filter(family=family, ordinal=month_ordinal(year, month))
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def resolve_month(family, year, month):
+    """The family's ``Month`` row for ``(year, month)``.
+
+    Months inside the provisioned calendar are only read, with one query on
+    the ``(family, ordinal)`` index; a month outside it is created through
+    :func:`ensure_months` the first time it is needed.
+    """
+    month_obj = Month.objects.filter(family=family, ordinal=month_ordinal(year, month)).first()
+    if month_obj is None:
+        return ensure_months(family, [(year, month)])[(year, month)]
+    return month_obj
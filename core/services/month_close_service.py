@@ -0,0 +1,108 @@
+import calendar
+from dataclasses import dataclass
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import Month, RecurringPayment, RecurringPaymentOccurrence
+from core.services.income_plan_month_service import confirm_pending_income_plans
+from core.services.month_calendar_service import ensure_months
+
+
+class MonthStateError(ValueError):
+    """The month is not in the state the requested transition starts from."""
+
+
+@dataclass(frozen=True)
+class MonthCloseResult:
+    year: int
+    month: int
+    month_id: int
+    is_closed: bool
+    completed_occurrences: int = 0
+    resolved_incomes: int = 0
+
+
+def _lock_month(family, year, month):
+    month_obj = ensure_months(family, [(year, month)])[(year, month)]
+    return Month.objects.select_for_update(no_key=True).get(pk=month_obj.pk)
+
+
+def _finalize_occurrences(family, month_obj):
+    """Create the month's missing occurrences and mark them all completed."""
+    month_start = date(month_obj.year, month_obj.month, 1)
+    month_end = date(
+        month_obj.year,
+        month_obj.month,
+        calendar.monthrange(month_obj.year, month_obj.month)[1],
+    )
+    recurring_ids = RecurringPayment.objects.filter(
+        family=family,
+        active=True,
+        start_date__lte=month_end,
+    ).filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=month_start)
+    ).values_list("id", flat=True)
+
+    RecurringPaymentOccurrence.objects.bulk_create(
+        [
+            RecurringPaymentOccurrence(recurring_payment_id=recurring_id, month=month_obj)
+            for recurring_id in recurring_ids
+        ],
+        ignore_conflicts=True,
+    )
+    return RecurringPaymentOccurrence.objects.filter(
+        month=month_obj,
+        is_completed=False,
+    ).update(is_completed=True)
+
+
+@transaction.atomic
+def close_month(*, family, user, year, month, resolve_incomes=True):
+    """Finalize and close a month in one transaction.
+
+    Every step is a set-based statement: occurrences are created and
+    completed in bulk, pending income plans are confirmed with one insert,
+    and flipping ``is_closed`` archives the budget (see
+    ``core.services.budget_archive_service``).
+    """
+    month_obj = _lock_month(family, year, month)
+    if month_obj.is_closed:
+        raise MonthStateError("This month is already closed")
+
+    completed = _finalize_occurrences(family, month_obj)
+    resolved = (
+        len(confirm_pending_income_plans(family=family, user=user, month_obj=month_obj))
+        if resolve_incomes
+        else 0
+    )
+
+    # The bulk writes above bypass the model signals; this save bumps the
+    # month data version and builds the archive from the finalized rows.
+    month_obj.is_closed = True
+    month_obj.save(update_fields=["is_closed"])
+
+    return MonthCloseResult(
+        year=year,
+        month=month,
+        month_id=month_obj.id,
+        is_closed=True,
+        completed_occurrences=completed,
+        resolved_incomes=resolved,
+    )
+
+
+@transaction.atomic
+def reopen_month(*, family, year, month):
+    """Reopen a closed month and discard its budget archive.
+
+    Occurrences completed and incomes resolved at close time are kept.
+    """
+    month_obj = _lock_month(family, year, month)
+    if not month_obj.is_closed:
+        raise MonthStateError("This month is not closed")
+
+    month_obj.is_closed = False
+    month_obj.save(update_fields=["is_closed"])
+    return MonthCloseResult(year=year, month=month, month_id=month_obj.id, is_closed=False)
@@ -0,0 +1,145 @@
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.db.models import F, Q, Sum
+
+from core.models import (
+    Expense,
+    Income,
+    IncomePlan,
+    IncomePlanVersion,
+    PlannedExpensePlan,
+    PlannedExpenseVersion,
+)
+from core.services.plan_version_resolver import resolve_plan_versions
+
+
+@dataclass(frozen=True)
+class PlanKind:
+    plan_model: type
+    version_model: type
+    # ``None`` projects every plan type.
+    plan_types: tuple = None
+    ordering: tuple = ("id",)
+
+
+INCOME_PLANS = PlanKind(IncomePlan, IncomePlanVersion, ordering=("-created_at",))
+# ONE_MONTH expense plans are left out of budgets: they duplicate the
+# legacy ``PlannedExpense`` rows of their month.
+EXPENSE_PLANS = PlanKind(PlannedExpensePlan, PlannedExpenseVersion, plan_types=("ONGOING",))
+
+
+@dataclass(frozen=True)
+class PlanMonth:
+    """One plan in one month: the live version (if any) and what actually happened.
+
+    ``actual`` is the resolved ``Income`` of an income plan (``None`` while
+    pending) or the amount spent in an expense plan's category.
+    """
+
+    plan: object
+    ordinal: int
+    version: object = None
+    actual: object = None
+
+
+def load_plans(kind, family, first_ordinal, last_ordinal):
+    """Active plans of ``kind`` overlapping ``first..last``, in one query."""
+    plans = kind.plan_model.objects.filter(
+        family=family,
+        active=True,
+        start_month__ordinal__lte=last_ordinal,
+    ).filter(
+        Q(end_month__isnull=True) | Q(end_month__ordinal__gte=first_ordinal)
+    )
+    if kind.plan_types is not None:
+        plans = plans.filter(plan_type__in=kind.plan_types)
+    return list(
+        plans.select_related("category", "start_month", "end_month").order_by(*kind.ordering)
+    )
+
+
+def plan_applies(plan, ordinal):
+    return plan.start_month.ordinal <= ordinal and (
+        plan.end_month is None or plan.end_month.ordinal >= ordinal
+    )
+
+
+def _resolved_incomes(family, plans, ordinals):
+    """``{(plan_id, ordinal): Income}``, the newest income of each plan and month."""
+    incomes = (
+        Income.objects.filter(
+            month__family=family,
+            month__ordinal__in=ordinals,
+            income_plan__in=plans,
+        )
+        .annotate(month_ordinal=F("month__ordinal"))
+        .select_related("category")
+        .order_by("income_plan_id", "month_ordinal", "-created_at")
+    )
+    resolved = {}
+    for income in incomes:
+        resolved.setdefault((income.income_plan_id, income.month_ordinal), income)
+    return resolved
+
+
+def _spent_by_category(family, ordinals):
+    spent = defaultdict(dict)
+    rows = (
+        Expense.objects.filter(month__family=family, month__ordinal__in=ordinals)
+        .values_list("month__ordinal", "category")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    for ordinal, category_id, total in rows:
+        spent[ordinal][category_id] = total
+    return spent
+
+
+def _actual(plan, ordinal, incomes, spent):
+    if incomes is not None:
+        return incomes.get((plan.id, ordinal))
+    if spent is not None:
+        return spent.get(ordinal, {}).get(plan.category_id, 0)
+    return None
+
+
+def project_plans(kind, family, ordinals, *, actuals=True, spent_by_category=None):
+    """Project the plans of ``kind`` onto the months ``ordinals``.
+
+    Returns ``{ordinal: [PlanMonth, ...]}`` with every plan that applies to
+    each month, in ``kind.ordering`` and including plans without a version.
+    The query count does not depend on the number of months: one for the
+    plans, one for their versions and, when ``actuals`` is set, one for the
+    actuals. Expense callers that already hold the month totals pass them
+    as ``spent_by_category`` (``{ordinal: {category_id: amount}}``).
+    """
+    ordinals = sorted(set(ordinals))
+    if not ordinals:
+        return {}
+
+    plans = load_plans(kind, family, ordinals[0], ordinals[-1])
+    versions = resolve_plan_versions(kind.version_model, plans, ordinals) if plans else {}
+
+    incomes = spent = None
+    if actuals and plans:
+        if kind.plan_model is IncomePlan:
+            incomes = _resolved_incomes(family, plans, ordinals)
+        elif spent_by_category is not None:
+            spent = spent_by_category
+        else:
+            spent = _spent_by_category(family, ordinals)
+
+    return {
+        ordinal: [
+            PlanMonth(
+                plan=plan,
+                ordinal=ordinal,
+                version=versions.get((plan.id, ordinal)),
+                actual=_actual(plan, ordinal, incomes, spent),
+            )
+            for plan in plans
+            if plan_applies(plan, ordinal)
+        ]
+        for ordinal in ordinals
+    }
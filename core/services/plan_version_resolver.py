@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+from django.db.models import Q
+
+from core.models import month_ordinal
+
+
+def resolve_plan_versions(version_model, plans, ordinals, select_related=()):
+    """Return ``{(plan_id, ordinal): version}`` for every plan active at a month.
+
+    ``version_model`` is ``PlannedExpenseVersion`` or ``IncomePlanVersion``;
+    ``plans`` may be instances or ids and ``ordinals`` are ``Month.ordinal``
+    values. All candidate versions are read in one query on the
+    ``(plan, valid_from_ordinal, valid_to_ordinal)`` index. When several
+    versions cover a month, the one starting latest (then created latest) wins.
+    """
+    plan_ids = [getattr(plan, "pk", plan) for plan in plans]
+    ordinals = sorted(set(ordinals))
+    if not plan_ids or not ordinals:
+        return {}
+
+    versions_by_plan = defaultdict(list)
+    for version in (
+        version_model.objects.filter(
+            plan_id__in=plan_ids,
+            valid_from_ordinal__lte=ordinals[-1],
+        )
+        .filter(Q(valid_to_ordinal__isnull=True) | Q(valid_to_ordinal__gte=ordinals[0]))
+        .select_related(*select_related)
+        .order_by("plan_id", "-valid_from_ordinal", "-created_at", "-id")
+    ):
+        versions_by_plan[version.plan_id].append(version)
+
+    resolved = {}
+    for plan_id, versions in versions_by_plan.items():
+        for ordinal in ordinals:
+            for version in versions:
+                if version.valid_from_ordinal <= ordinal and (
+                    version.valid_to_ordinal is None or version.valid_to_ordinal >= ordinal
+                ):
+                    resolved[(plan_id, ordinal)] = version
+                    break
+    return resolved
+
+
+def resolve_plan_version(version_model, plan, year, month, select_related=()):
+    """Version of a single plan in effect at ``year``/``month``, or ``None``."""
+    ordinal = month_ordinal(year, month)
+    resolved = resolve_plan_versions(version_model, [plan], [ordinal], select_related)
+    return resolved.get((getattr(plan, "pk", plan), ordinal))
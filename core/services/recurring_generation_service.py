@@ -0,0 +1,175 @@
+import calendar
+from dataclasses import dataclass
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import (
+    Expense,
+    Month,
+    RecurringPayment,
+    RecurringPaymentOccurrence,
+    month_ordinal,
+)
+from core.services.budget_snapshot_service import record_expenses_created
+from core.services.data_version_service import bump_month_versions
+from core.services.month_calendar_service import ensure_months
+
+
+MAX_GENERATION_MONTHS = 60
+
+
+@dataclass(frozen=True)
+class RecurringGenerationResult:
+    year: int
+    month: int
+    created: int = 0
+    skipped: int = 0
+    completed_skipped: int = 0
+    closed: bool = False
+
+    @property
+    def label(self):
+        return f"{self.year}-{self.month}"
+
+
+def iter_month_keys(start, end):
+    """``(year, month)`` pairs from ``start`` to ``end``, both inclusive."""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _activity_window(year, month, today):
+    """Dates a recurring payment must cover to be generated for the month.
+
+    The current month keeps the historic "active today" rule; any other
+    month generates every payment active at some point during it.
+    """
+    month_start = date(year, month, 1)
+    month_end = date(year, month, calendar.monthrange(year, month)[1])
+    if month_start <= today <= month_end:
+        return today, today
+    return month_end, month_start
+
+
+def _generate_for_month(*, user, month_obj, recurring_payments, today):
+    if month_obj.is_closed:
+        return RecurringGenerationResult(month_obj.year, month_obj.month, closed=True)
+
+    starts_by, ends_after = _activity_window(month_obj.year, month_obj.month, today)
+    due = [
+        rp
+        for rp in recurring_payments
+        if rp.start_date <= starts_by and (rp.end_date is None or rp.end_date >= ends_after)
+    ]
+    if not due:
+        return RecurringGenerationResult(month_obj.year, month_obj.month)
+
+    RecurringPaymentOccurrence.objects.bulk_create(
+        [RecurringPaymentOccurrence(recurring_payment=rp, month=month_obj) for rp in due],
+        ignore_conflicts=True,
+    )
+    completed_ids = set(
+        RecurringPaymentOccurrence.objects.filter(
+            month=month_obj,
+            recurring_payment__in=due,
+            is_completed=True,
+        ).values_list("recurring_payment_id", flat=True)
+    )
+    existing_ids = set(
+        Expense.objects.filter(
+            month=month_obj,
+            recurring_payment__in=due,
+        ).values_list("recurring_payment_id", flat=True)
+    )
+
+    last_day = calendar.monthrange(month_obj.year, month_obj.month)[1]
+    new_expenses = []
+    skipped = completed_skipped = 0
+    for rp in due:
+        if rp.id in completed_ids:
+            completed_skipped += 1
+            continue
+        if rp.id in existing_ids:
+            skipped += 1
+            continue
+        new_expenses.append(
+            Expense(
+                user=user,
+                payer_id=rp.payer_id or user.id,
+                month=month_obj,
+                recurring_payment=rp,
+                amount=rp.amount,
+                category_id=rp.category_id,
+                date=date(month_obj.year, month_obj.month, min(rp.due_day, last_day)),
+                is_recurring=True,
+                description=rp.name,
+            )
+        )
+
+    # ``bulk_create`` bypasses the Expense signals, so the snapshot delta is
+    # recorded explicitly.
+    Expense.objects.bulk_create(new_expenses)
+    record_expenses_created(new_expenses)
+    # New occurrences show up in the month's reads even when nothing is created.
+    bump_month_versions([month_obj.id])
+
+    return RecurringGenerationResult(
+        month_obj.year,
+        month_obj.month,
+        created=len(new_expenses),
+        skipped=skipped,
+        completed_skipped=completed_skipped,
+    )
+
+
+def generate_recurring_expenses(*, family, user, start, end=None, today=None):
+    """Generate the recurring expenses of ``family`` for ``start``..``end``.
+
+    ``start``/``end`` are ``(year, month)`` tuples; ``end`` defaults to
+    ``start``. Everything runs in one transaction with the target months
+    locked, so concurrent calls for the same family serialize and never
+    generate an expense twice. Closed months are reported and left untouched.
+    """
+    end = end or start
+    span = month_ordinal(*end) - month_ordinal(*start) + 1
+    if span < 1:
+        raise ValueError("start must not be after end")
+    if span > MAX_GENERATION_MONTHS:
+        raise ValueError(f"range cannot exceed {MAX_GENERATION_MONTHS} months")
+    keys = list(iter_month_keys(start, end))
+    today = today or timezone.now().date()
+
+    range_start = date(*keys[0], 1)
+    range_end = date(*keys[-1], calendar.monthrange(*keys[-1])[1])
+
+    with transaction.atomic():
+        months = ensure_months(family, keys)
+        locked = {
+            (month.year, month.month): month
+            for month in Month.objects.select_for_update(no_key=True)
+            .filter(id__in=[month.id for month in months.values()])
+            .order_by("id")
+        }
+        recurring_payments = list(
+            RecurringPayment.objects.filter(
+                family=family,
+                active=True,
+                start_date__lte=max(range_end, today),
+            ).filter(
+                Q(end_date__isnull=True) | Q(end_date__gte=min(range_start, today))
+            )
+        )
+        return [
+            _generate_for_month(
+                user=user,
+                month_obj=locked[key],
+                recurring_payments=recurring_payments,
+                today=today,
+            )
+            for key in keys
+        ]
@@ -4,16 +4,7 @@ from decimal import Decimal
 from django.db.models import Sum
 
 from core.models import Expense, RecurringPaymentOccurrence
-
-
-ZERO = Decimal("0.00")
-MONEY_QUANTUM = Decimal("0.01")
-
-
-def _money(value):
-    if value is None:
-        return ZERO
-    return Decimal(value).quantize(MONEY_QUANTUM)
+from core.services.money import from_cents, to_cents
 
 
 @dataclass(frozen=True)
@@ -26,39 +17,43 @@ class RecurringPaymentAmounts:
     payment_status: str
 
 
+def recurring_payment_status(planned_cents, paid_cents, is_completed):
+    """``(pending_cents, payment_status)`` of one month of a fixed payment.
+
+    Pending is an obligation and therefore is zero after manual completion
+    and never negative.
+    """
+    if is_completed:
+        return 0, "completed"
+    if paid_cents > planned_cents:
+        payment_status = "exceeded"
+    elif paid_cents == planned_cents:
+        payment_status = "covered"
+    elif paid_cents > 0:
+        payment_status = "partially_paid"
+    else:
+        payment_status = "pending"
+    return max(planned_cents - paid_cents, 0), payment_status
+
+
 def calculate_recurring_payment_amounts(
     *, planned_amount, paid_amount, is_completed
 ):
     """Return the canonical monthly fixed-payment calculation.
 
-    ``difference_amount`` is signed planned minus paid. ``pending_amount`` is
-    an obligation and therefore is zero after manual completion and never
-    negative.
+    ``difference_amount`` is signed planned minus paid. See
+    :func:`recurring_payment_status` for ``pending_amount``.
     """
 
-    planned = _money(planned_amount)
-    paid = _money(paid_amount)
-    difference = _money(planned - paid)
-
-    if is_completed:
-        pending = ZERO
-        payment_status = "completed"
-    else:
-        pending = max(difference, ZERO)
-        if paid > planned:
-            payment_status = "exceeded"
-        elif paid == planned:
-            payment_status = "covered"
-        elif paid > ZERO:
-            payment_status = "partially_paid"
-        else:
-            payment_status = "pending"
+    planned = to_cents(planned_amount)
+    paid = to_cents(paid_amount)
+    pending, payment_status = recurring_payment_status(planned, paid, is_completed)
 
     return RecurringPaymentAmounts(
-        planned_amount=planned,
-        paid_amount=paid,
-        pending_amount=_money(pending),
-        difference_amount=difference,
+        planned_amount=from_cents(planned),
+        paid_amount=from_cents(paid),
+        pending_amount=from_cents(pending),
+        difference_amount=from_cents(planned - paid),
         is_completed=bool(is_completed),
         payment_status=payment_status,
     )
@@ -73,12 +68,11 @@ def get_or_create_recurring_payment_occurrence(*, recurring_payment, month):
 
 
 def get_recurring_payment_paid_amount(*, recurring_payment, month):
-    return _money(
-        Expense.objects.filter(
-            recurring_payment=recurring_payment,
-            month=month,
-        ).aggregate(total=Sum("amount"))["total"]
-    )
+    total = Expense.objects.filter(
+        recurring_payment=recurring_payment,
+        month=month,
+    ).aggregate(total=Sum("amount"))["total"]
+    return from_cents(to_cents(total))
 
 
 def get_recurring_payment_month_state(*, recurring_payment, month):
@@ -96,3 +90,41 @@ def get_recurring_payment_month_state(*, recurring_payment, month):
         is_completed=occurrence.is_completed,
     )
     return occurrence, amounts
+
+
+def load_recurring_payment_month_states(keys):
+    """Batch, read-only variant of ``get_recurring_payment_month_state``.
+
+    ``keys`` are ``(recurring_payment_id, month_id)`` pairs. Returns
+    ``{key: (occurrence or None, paid_amount)}`` using one query for the
+    occurrences and one for the paid totals. Missing occurrences are not
+    created; callers treat them as not completed.
+    """
+    keys = set(keys)
+    if not keys:
+        return {}
+
+    recurring_ids = {recurring_id for recurring_id, _ in keys}
+    month_ids = {month_id for _, month_id in keys}
+
+    occurrences = {
+        (occurrence.recurring_payment_id, occurrence.month_id): occurrence
+        for occurrence in RecurringPaymentOccurrence.objects.filter(
+            recurring_payment_id__in=recurring_ids,
+            month_id__in=month_ids,
+        )
+    }
+    paid_totals = {
+        (row["recurring_payment"], row["month"]): row["total"]
+        for row in Expense.objects.filter(
+            recurring_payment_id__in=recurring_ids,
+            month_id__in=month_ids,
+        )
+        .values("recurring_payment", "month")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    }
+    return {
+        key: (occurrences.get(key), from_cents(to_cents(paid_totals.get(key))))
+        for key in keys
+    }
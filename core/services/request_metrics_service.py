@@ -0,0 +1,202 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger("core.request_metrics")
+
+# Upper bounds of the per-route histogram buckets; the last bucket is open.
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+@dataclass
+class Metrics:
+    """Counters of one request (or command) while it is being collected."""
+
+    queries: int = 0
+    db_ms: float = 0.0
+    sections: dict = field(default_factory=dict)
+    _depth: dict = field(default_factory=dict, repr=False)
+
+    def as_dict(self):
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_ms, 3),
+            **{f"{name}_ms": round(value, 3) for name, value in self.sections.items()},
+        }
+
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+def metrics_enabled():
+    return getattr(settings, "REQUEST_METRICS_ENABLED", False)
+
+
+def current_metrics():
+    return _current.get()
+
+
+def add_section(metrics, name, duration_ms):
+    metrics.sections[name] = metrics.sections.get(name, 0.0) + duration_ms
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_ms += (time.perf_counter() - started) * 1000
+
+
+@contextmanager
+def collect_metrics():
+    """Count the queries and DB time of the block on every connection.
+
+    Code running inside can add timed sections with :func:`timed_section`.
+    """
+    metrics = Metrics()
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed_section(name):
+    """Add the wall time of the block to section ``name`` of the current metrics.
+
+    Nested sections of the same name are only counted once.
+    """
+    metrics = _current.get()
+    if metrics is None or metrics._depth.get(name):
+        yield
+        return
+    metrics._depth[name] = 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._depth[name] = 0
+        add_section(metrics, name, (time.perf_counter() - started) * 1000)
+
+
+def server_timing(metrics, total_ms):
+    """``Server-Timing`` header value for ``metrics``."""
+    entries = [
+        f"total;dur={total_ms:.1f}",
+        f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries"',
+    ]
+    entries.extend(
+        f"{name};dur={value:.1f}" for name, value in sorted(metrics.sections.items())
+    )
+    return ", ".join(entries)
+
+
+def log_metrics(kind, name, metrics, **extra):
+    """One ``key=value`` log line per request or command."""
+    values = {kind: name, **extra, **metrics.as_dict()}
+    logger.info(
+        " ".join(f"{key}={value}" for key, value in values.items()),
+        extra={"metrics": values},
+    )
+
+
+# route -> aggregated counters and histograms, per worker process
+_routes = {}
+_routes_lock = threading.Lock()
+
+
+def _histogram(bounds):
+    return {"counts": [0] * (len(bounds) + 1), "sum": 0.0}
+
+
+def _observe(histogram, bounds, value):
+    histogram["counts"][bisect.bisect_left(bounds, value)] += 1
+    histogram["sum"] += value
+
+
+def record_route(route, metrics, total_ms, status_code):
+    with _routes_lock:
+        entry = _routes.get(route)
+        if entry is None:
+            entry = _routes[route] = {
+                "requests": 0,
+                "errors": 0,
+                "duration_ms": _histogram(DURATION_BUCKETS_MS),
+                "db_ms": _histogram(DURATION_BUCKETS_MS),
+                "queries": _histogram(QUERY_BUCKETS),
+                "max_queries": 0,
+            }
+        entry["requests"] += 1
+        entry["errors"] += int(status_code >= 500)
+        _observe(entry["duration_ms"], DURATION_BUCKETS_MS, total_ms)
+        _observe(entry["db_ms"], DURATION_BUCKETS_MS, metrics.db_ms)
+        _observe(entry["queries"], QUERY_BUCKETS, metrics.queries)
+        entry["max_queries"] = max(entry["max_queries"], metrics.queries)
+
+
+def _render_histogram(histogram, bounds, requests):
+    labels = [str(bound) for bound in bounds] + ["+Inf"]
+    return {
+        "buckets": dict(zip(labels, histogram["counts"])),
+        "mean": round(histogram["sum"] / requests, 3) if requests else None,
+    }
+
+
+def route_metrics():
+    """Per-route histograms of this worker process since start (or last reset)."""
+    with _routes_lock:
+        return {
+            route: {
+                "requests": entry["requests"],
+                "errors": entry["errors"],
+                "max_queries": entry["max_queries"],
+                "duration_ms": _render_histogram(
+                    entry["duration_ms"], DURATION_BUCKETS_MS, entry["requests"]
+                ),
+                "db_ms": _render_histogram(
+                    entry["db_ms"], DURATION_BUCKETS_MS, entry["requests"]
+                ),
+                "queries": _render_histogram(entry["queries"], QUERY_BUCKETS, entry["requests"]),
+            }
+            for route, entry in sorted(_routes.items())
+        }
+
+
+def reset_route_metrics():
+    with _routes_lock:
+        _routes.clear()
+
+
+@contextmanager
+def command_metrics(name):
+    """Collect and log the queries and DB time of a management command."""
+    if not metrics_enabled():
+        yield None
+        return
+    started = time.perf_counter()
+    with collect_metrics() as metrics:
+        yield metrics
+    log_metrics(
+        "command",
+        name,
+        metrics,
+        total_ms=round((time.perf_counter() - started) * 1000, 3),
+    )
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.http import Http404
+
+from core.models import Family, Profile
+
+
+PROFILE_FIELDS = [field.attname for field in Profile._meta.concrete_fields]
+FAMILY_FIELDS = [field.attname for field in Family._meta.concrete_fields]
+
+# user_id -> (expires_at, profile values, family values)
+_profile_cache = {}
+_profile_cache_lock = threading.Lock()
+
+
+def _cache_ttl():
+    return getattr(settings, "PROFILE_CACHE_TTL", 30)
+
+
+def _from_cache(user_id):
+    entry = _profile_cache.get(user_id)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    _, profile_values, family_values = entry
+    # Fresh instances per request so callers can never mutate the shared copy.
+    profile = Profile.from_db(DEFAULT_DB_ALIAS, PROFILE_FIELDS, profile_values)
+    profile.family = Family.from_db(DEFAULT_DB_ALIAS, FAMILY_FIELDS, family_values)
+    return profile
+
+
+def _store(profile):
+    ttl = _cache_ttl()
+    if ttl <= 0:
+        return
+    with _profile_cache_lock:
+        _profile_cache[profile.user_id] = (
+            time.monotonic() + ttl,
+            tuple(getattr(profile, name) for name in PROFILE_FIELDS),
+            tuple(getattr(profile.family, name) for name in FAMILY_FIELDS),
+        )
+
+
+def invalidate_profile_cache(*, user_id=None, family_id=None):
+    """Drop cached profiles of a user or of every member of a family."""
+    with _profile_cache_lock:
+        if user_id is not None:
+            _profile_cache.pop(user_id, None)
+        if family_id is not None:
+            for cached_user_id, (_, _, family_values) in list(_profile_cache.items()):
+                if family_values[FAMILY_FIELDS.index("id")] == family_id:
+                    _profile_cache.pop(cached_user_id, None)
+
+
+def get_request_profile(request):
+    """``Profile`` (with its ``Family``) of the authenticated user.
+
+    Resolved once per request and stored on the underlying ``HttpRequest``;
+    across requests a short-lived per-process cache, invalidated by the
+    ``Profile``/``Family`` signals, skips the query entirely. Raises 404 like
+    the ``get_object_or_404(Profile, ...)`` calls it replaces.
+    """
+    http_request = getattr(request, "_request", request)
+    user = request.user
+
+    profile = getattr(http_request, "_profile", None)
+    if profile is not None and profile.user_id == user.id:
+        return profile
+
+    profile = _from_cache(user.id)
+    if profile is None:
+        profile = Profile.objects.select_related("family").filter(user_id=user.id).first()
+        if profile is None:
+            raise Http404("No Profile matches the given query.")
+        _store(profile)
+    profile.user = user
+
+    http_request._profile = profile
+    return profile
+
+
+def get_request_family(request):
+    return get_request_profile(request).family
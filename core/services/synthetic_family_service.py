@@ -0,0 +1,291 @@
+import calendar
+import random
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    Category,
+    Expense,
+    Family,
+    Income,
+    IncomePlan,
+    IncomePlanVersion,
+    PlannedExpensePlan,
+    PlannedExpenseVersion,
+    RecurringPayment,
+    RecurringPaymentOccurrence,
+    month_ordinal,
+)
+from core.services.budget_snapshot_service import record_expenses_created
+from core.services.month_calendar_service import ensure_months, month_from_ordinal
+
+
+@dataclass(frozen=True)
+class SyntheticFamilySpec:
+    """Size of a generated family; every count is per family."""
+
+    members: int = 3
+    categories: int = 12
+    recurring_payments: int = 10
+    expense_plans: int = 8
+    income_plans: int = 3
+    versions_per_plan: int = 3
+    years: int = 2
+    expenses_per_month: int = 120
+    incomes_per_month: int = 2
+    # Last generated month; defaults to the current month.
+    end: tuple = None
+
+    def month_keys(self):
+        if self.end is None:
+            today = timezone.localdate()
+            end = (today.year, today.month)
+        else:
+            end = self.end
+        last = month_ordinal(*end)
+        first = last - max(self.years * 12, 1) + 1
+        return [month_from_ordinal(ordinal) for ordinal in range(first, last + 1)]
+
+
+@dataclass
+class SyntheticFamily:
+    family: Family
+    users: list
+    months: list
+    counts: dict = field(default_factory=dict)
+
+    @property
+    def latest(self):
+        return self.months[-1].year, self.months[-1].month
+
+    @property
+    def earliest(self):
+        return self.months[0].year, self.months[0].month
+
+
+def _amount(rng, low, high):
+    return Decimal(rng.randint(low * 100, high * 100)) / 100
+
+
+def _random_date(rng, year, month):
+    return date(year, month, rng.randint(1, calendar.monthrange(year, month)[1]))
+
+
+def _create_members(family, count, label):
+    users = []
+    for index in range(max(count, 1)):
+        user = User.objects.create_user(username=f"{label}-{family.id}-{index}")
+        # The post_save signal gave the user a family of their own.
+        own_family_id = user.profile.family_id
+        user.profile.family = family
+        user.profile.role = "admin" if index == 0 else "member"
+        user.profile.save(update_fields=["family", "role"])
+        Family.objects.filter(id=own_family_id).delete()
+        users.append(user)
+    return users
+
+
+def _split_ranges(months, parts):
+    """Contiguous ``(first, last)`` month ranges covering ``months``; last is open."""
+    parts = max(1, min(parts, len(months)))
+    size = len(months) // parts
+    starts = [index * size for index in range(parts)]
+    return [
+        (months[start], months[starts[index + 1] - 1] if index + 1 < parts else None)
+        for index, start in enumerate(starts)
+    ]
+
+
+def _versions(model, plan, months, parts, rng, low, high):
+    return [
+        model(
+            plan=plan,
+            planned_amount=_amount(rng, low, high),
+            valid_from=first,
+            valid_to=last,
+            # ``bulk_create`` skips ``save()``, which keeps these in sync.
+            valid_from_ordinal=first.ordinal,
+            valid_to_ordinal=last.ordinal if last is not None else None,
+        )
+        for first, last in _split_ranges(months, parts)
+    ]
+
+
+@transaction.atomic
+def build_synthetic_family(spec=None, *, seed=0, label="synthetic"):
+    """Create one family sized by ``spec`` with reproducible random data.
+
+    Rows are bulk inserted; expense snapshots and month ordinals are kept
+    consistent as the regular write paths would.
+    """
+    spec = spec or SyntheticFamilySpec()
+    rng = random.Random(seed)
+    family = Family.objects.create(name=f"{label} {seed}")
+    users = _create_members(family, spec.members, label)
+
+    keys = spec.month_keys()
+    by_key = ensure_months(family, keys)
+    months = [by_key[key] for key in keys]
+    latest = months[-1]
+
+    categories = Category.objects.bulk_create(
+        [
+            Category(family=family, name=f"Category {index}", icon="tag")
+            for index in range(max(spec.categories, 1))
+        ]
+    )
+
+    first_day = date(months[0].year, months[0].month, 1)
+    recurring = RecurringPayment.objects.bulk_create(
+        [
+            RecurringPayment(
+                family=family,
+                category=rng.choice(categories),
+                payer=rng.choice(users),
+                name=f"Recurring {index}",
+                amount=_amount(rng, 10, 300),
+                due_day=rng.randint(1, 28),
+                start_date=first_day,
+            )
+            for index in range(spec.recurring_payments)
+        ]
+    )
+    RecurringPaymentOccurrence.objects.bulk_create(
+        [
+            RecurringPaymentOccurrence(
+                recurring_payment=payment,
+                month=month_obj,
+                is_completed=month_obj is not latest,
+            )
+            for payment in recurring
+            for month_obj in months
+        ]
+    )
+
+    expense_plans = PlannedExpensePlan.objects.bulk_create(
+        [
+            PlannedExpensePlan(
+                family=family,
+                category=rng.choice(categories),
+                name=f"Plan {index}",
+                plan_type="ONGOING",
+                start_month=months[0],
+                created_by=users[0],
+            )
+            for index in range(spec.expense_plans)
+        ]
+    )
+    PlannedExpenseVersion.objects.bulk_create(
+        [
+            version
+            for plan in expense_plans
+            for version in _versions(
+                PlannedExpenseVersion, plan, months, spec.versions_per_plan, rng, 50, 500
+            )
+        ]
+    )
+
+    income_plans = IncomePlan.objects.bulk_create(
+        [
+            IncomePlan(
+                family=family,
+                category=rng.choice(categories),
+                name=f"Income plan {index}",
+                plan_type="ONGOING",
+                due_day=rng.randint(1, 28),
+                start_month=months[0],
+                created_by=users[0],
+            )
+            for index in range(spec.income_plans)
+        ]
+    )
+    IncomePlanVersion.objects.bulk_create(
+        [
+            version
+            for plan in income_plans
+            for version in _versions(
+                IncomePlanVersion, plan, months, spec.versions_per_plan, rng, 1000, 4000
+            )
+        ]
+    )
+
+    expenses = []
+    incomes = []
+    for month_obj in months:
+        year, month = month_obj.year, month_obj.month
+        is_past = month_obj is not latest
+        for payment in recurring:
+            if is_past:
+                expenses.append(
+                    Expense(
+                        month=month_obj,
+                        user=users[0],
+                        payer=payment.payer,
+                        amount=payment.amount,
+                        category=payment.category,
+                        date=_random_date(rng, year, month),
+                        description=payment.name,
+                        recurring_payment=payment,
+                        is_recurring=True,
+                    )
+                )
+        for _ in range(spec.expenses_per_month):
+            expenses.append(
+                Expense(
+                    month=month_obj,
+                    user=rng.choice(users),
+                    payer=rng.choice(users),
+                    amount=_amount(rng, 1, 200),
+                    category=rng.choice(categories),
+                    date=_random_date(rng, year, month),
+                    description=f"Expense {rng.randint(1, 10_000)}",
+                )
+            )
+        # Income plans stay pending in the latest month.
+        if is_past:
+            for plan in income_plans:
+                incomes.append(
+                    Income(
+                        month=month_obj,
+                        user=users[0],
+                        amount=_amount(rng, 1000, 4000),
+                        category=plan.category,
+                        income_plan=plan,
+                        date=_random_date(rng, year, month),
+                    )
+                )
+        for _ in range(spec.incomes_per_month):
+            incomes.append(
+                Income(
+                    month=month_obj,
+                    user=rng.choice(users),
+                    amount=_amount(rng, 10, 500),
+                    category=rng.choice(categories),
+                    date=_random_date(rng, year, month),
+                )
+            )
+
+    # ``bulk_create`` bypasses the Expense signals.
+    Expense.objects.bulk_create(expenses, batch_size=2000)
+    record_expenses_created(expenses)
+    Income.objects.bulk_create(incomes, batch_size=2000)
+
+    return SyntheticFamily(
+        family=family,
+        users=users,
+        months=months,
+        counts={
+            "months": len(months),
+            "categories": len(categories),
+            "recurring_payments": len(recurring),
+            "expense_plans": len(expense_plans),
+            "income_plans": len(income_plans),
+            "expenses": len(expenses),
+            "incomes": len(incomes),
+        },
+    )
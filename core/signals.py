@@ -0,0 +1,256 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.contrib.auth.models import User
+from django.dispatch import receiver
+
+from core.models import (
+    Category,
+    Expense,
+    Family,
+    Income,
+    IncomePlan,
+    IncomePlanVersion,
+    Month,
+    PlannedExpense,
+    PlannedExpensePlan,
+    PlannedExpenseVersion,
+    Profile,
+    RecurringPayment,
+    RecurringPaymentOccurrence,
+    month_ordinal,
+)
+from core.services.budget_archive_service import archive_month, discard_month_archive
+from core.services.budget_snapshot_service import (
+    expense_budget_entry,
+    invalidate_month_snapshots,
+    record_expense_change,
+)
+from core.services.data_version_service import (
+    bump_family_version,
+    bump_month_range,
+    bump_month_versions,
+)
+from core.services.request_profile import invalidate_profile_cache
+
+
+@receiver(pre_save, sender=Expense)
+def capture_expense_budget_entry(sender, instance, raw=False, **kwargs):
+    instance._budget_entry_before = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+
+    previous = (
+        Expense.objects.filter(pk=instance.pk)
+        .only("month_id", "category_id", "recurring_payment_id", "planned_expense_id", "amount")
+        .first()
+    )
+    if previous is not None:
+        instance._budget_entry_before = expense_budget_entry(previous)
+
+
+@receiver(post_save, sender=Expense)
+def update_budget_snapshot_on_expense_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    record_expense_change(
+        before=getattr(instance, "_budget_entry_before", None),
+        after=expense_budget_entry(instance),
+    )
+
+
+@receiver(post_delete, sender=Expense)
+def update_budget_snapshot_on_expense_delete(sender, instance, **kwargs):
+    record_expense_change(before=expense_budget_entry(instance))
+
+
+@receiver(pre_delete, sender=PlannedExpense)
+@receiver(pre_delete, sender=RecurringPayment)
+def invalidate_budget_snapshots_on_unlink(sender, instance, **kwargs):
+    # Deleting these rewrites the linked expenses with SET_NULL, which moves
+    # them into the unplanned bucket without going through Expense.save().
+    link = "planned_expense" if sender is PlannedExpense else "recurring_payment"
+    month_ids = set(
+        Expense.objects.filter(**{link: instance}).values_list("month_id", flat=True).distinct()
+    )
+    invalidate_month_snapshots(month_ids)
+    bump_month_versions(month_ids)
+
+
+@receiver(pre_save, sender=Income)
+@receiver(pre_save, sender=PlannedExpense)
+def capture_data_version_month(sender, instance, raw=False, **kwargs):
+    instance._data_version_month_before = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._data_version_month_before = (
+        sender.objects.filter(pk=instance.pk).values_list("month_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+def bump_expense_month_version(sender, instance, **kwargs):
+    before = getattr(instance, "_budget_entry_before", None)
+    bump_month_versions([instance.month_id, before.month_id if before else None])
+
+
+@receiver(post_save, sender=Income)
+@receiver(post_delete, sender=Income)
+@receiver(post_save, sender=PlannedExpense)
+@receiver(post_delete, sender=PlannedExpense)
+@receiver(post_save, sender=RecurringPaymentOccurrence)
+@receiver(post_delete, sender=RecurringPaymentOccurrence)
+def bump_month_version(sender, instance, **kwargs):
+    bump_month_versions(
+        [instance.month_id, getattr(instance, "_data_version_month_before", None)]
+    )
+
+
+@receiver(pre_save, sender=Month)
+def capture_month_closed_state(sender, instance, raw=False, **kwargs):
+    instance._was_closed = False
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._was_closed = bool(
+        Month.objects.filter(pk=instance.pk).values_list("is_closed", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Month)
+def bump_month_version_on_month_change(sender, instance, created, raw=False, **kwargs):
+    # Closing or reopening changes every read of the month.
+    if not created and not raw:
+        bump_month_versions([instance.pk])
+
+
+@receiver(post_save, sender=Month)
+def archive_budget_on_month_close(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    was_closed = getattr(instance, "_was_closed", False)
+    if instance.is_closed and not was_closed:
+        archive_month(instance)
+    elif was_closed and not instance.is_closed:
+        discard_month_archive(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_family_data_version(sender, instance, **kwargs):
+    # Category names and colors show up in every month of the family.
+    bump_family_version(instance.family_id)
+
+
+@receiver(pre_save, sender=Profile)
+def capture_profile_family(sender, instance, raw=False, **kwargs):
+    instance._family_id_before = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._family_id_before = (
+        Profile.objects.filter(pk=instance.pk).values_list("family_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def bump_member_family_versions(sender, instance, **kwargs):
+    # Payer names and roles (``payer_detail``) show up in every month of the
+    # family; moving a member changes both families.
+    for family_id in {instance.family_id, getattr(instance, "_family_id_before", None)}:
+        bump_family_version(family_id)
+
+
+# Saves that never change what ``payer_detail`` renders.
+_UNRENDERED_USER_FIELDS = {"last_login", "password"}
+
+
+@receiver(post_save, sender=User)
+def bump_user_family_version(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # New users get their profile (and its bump) from ``create_profile_for_user``.
+    if created or raw:
+        return
+    if update_fields is not None and set(update_fields) <= _UNRENDERED_USER_FIELDS:
+        return
+    bump_family_version(
+        Profile.objects.filter(user_id=instance.pk).values_list("family_id", flat=True).first()
+    )
+
+
+def _data_month_range(instance):
+    """``(family_id, first ordinal, last ordinal or None)`` a row applies to."""
+    if isinstance(instance, RecurringPayment):
+        # Seeds assign ISO strings, so go through the field to get dates.
+        start, end = (
+            instance._meta.get_field(name).to_python(getattr(instance, name))
+            for name in ("start_date", "end_date")
+        )
+        return (
+            instance.family_id,
+            month_ordinal(start.year, start.month),
+            month_ordinal(end.year, end.month) if end else None,
+        )
+    if isinstance(instance, (IncomePlan, PlannedExpensePlan)):
+        ordinals = dict(
+            Month.objects.filter(
+                id__in=[instance.start_month_id, instance.end_month_id]
+            ).values_list("id", "ordinal")
+        )
+        return (
+            instance.family_id,
+            ordinals.get(instance.start_month_id),
+            ordinals.get(instance.end_month_id),
+        )
+    plan_model = instance._meta.get_field("plan").related_model
+    family_id = (
+        plan_model.objects.filter(pk=instance.plan_id).values_list("family_id", flat=True).first()
+    )
+    return family_id, instance.valid_from_ordinal, instance.valid_to_ordinal
+
+
+_RANGED_MODELS = (
+    RecurringPayment,
+    IncomePlan,
+    IncomePlanVersion,
+    PlannedExpensePlan,
+    PlannedExpenseVersion,
+)
+
+
+def capture_data_month_range(sender, instance, raw=False, **kwargs):
+    instance._data_month_range_before = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    if previous is not None:
+        instance._data_month_range_before = _data_month_range(previous)
+
+
+def bump_data_month_range(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    family_id, start, end = _data_month_range(instance)
+    before = getattr(instance, "_data_month_range_before", None)
+    if before is not None and before[0] == family_id and start is not None:
+        # One update over the union of the old and the new range.
+        start = min(value for value in (start, before[1]) if value is not None)
+        end = None if end is None or before[2] is None else max(end, before[2])
+    elif before is not None:
+        bump_month_range(*before)
+    bump_month_range(family_id, start, end)
+
+
+for _model in _RANGED_MODELS:
+    pre_save.connect(capture_data_month_range, sender=_model)
+    post_save.connect(bump_data_month_range, sender=_model)
+    post_delete.connect(bump_data_month_range, sender=_model)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    invalidate_profile_cache(user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Family)
+@receiver(post_delete, sender=Family)
+def invalidate_cached_family_profiles(sender, instance, **kwargs):
+    invalidate_profile_cache(family_id=instance.pk)
@@ -1,10 +1,21 @@
+import csv
+import json
+import math
+import zipfile
 from datetime import date, timedelta
 from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
 from django.test import TestCase
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import APIClient
 
@@ -16,15 +27,45 @@ from core.models import (
     IncomePlan,
     IncomePlanVersion,
     Month,
+    MonthBudgetArchive,
+    MonthBudgetSnapshot,
     PlannedExpense,
     PlannedExpensePlan,
     PlannedExpenseVersion,
     RecurringPayment,
     RecurringPaymentOccurrence,
 )
+from core.services import income_plan_month_service
+from core.services.budget_cache_service import (
+    budget_cache_stats,
+    reset_budget_cache_stats,
+)
+from core.services.budget_snapshot_service import (
+    aggregate_month_expenses,
+    load_month_expense_totals,
+)
+from core.services.expense_import_service import ExpenseImporter
+from core.services.money import from_cents, to_cents
+from core.services.month_calendar_service import (
+    ensure_months,
+    get_month_id,
+    parse_year_month,
+    provision_months,
+    resolve_month,
+)
+from core.services.plan_projection_service import (
+    EXPENSE_PLANS,
+    INCOME_PLANS,
+    project_plans,
+)
 from core.services.recurring_payment_service import (
     calculate_recurring_payment_amounts,
 )
+from core.services.request_metrics_service import reset_route_metrics
+from core.services.synthetic_family_service import (
+    SyntheticFamilySpec,
+    build_synthetic_family,
+)
 
 
 @override_settings(SECURE_SSL_REDIRECT=False)
@@ -176,7 +217,7 @@ class MultiTenantSecurityTests(TestCase):
         response = self.client.get(f"/api/expenses/?payer={self.user_a.id}")
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual([item["id"] for item in response.data], [first.id])
+        self.assertEqual([item["id"] for item in response.data["results"]], [first.id])
 
     def test_family_members_endpoint_returns_only_current_family_users(self):
         family_member = User.objects.create_user(
@@ -792,6 +833,22 @@ class RecurringPaymentMonthlyCompletionTests(TestCase):
         self.assertTrue(month_state["is_completed"])
         self.assertEqual(month_state["status"], "completed")
 
+    def test_expense_month_state_id_is_null_until_the_occurrence_exists(self):
+        payment = self._add_payment("12.00")
+
+        month_state = self.client.get(f"/api/expenses/{payment.id}/").data["recurring_payment_month"]
+
+        self.assertIsNone(month_state["id"])
+        self.assertEqual(month_state["month"], self.month_june.id)
+        self.assertFalse(month_state["is_completed"])
+        self.assertFalse(RecurringPaymentOccurrence.objects.exists())
+
+        status = self.client.get(self._month_status_url())
+        self.assertEqual(status.status_code, 200)
+        self.assertIsNotNone(status.data["id"])
+        month_state = self.client.get(f"/api/expenses/{payment.id}/").data["recurring_payment_month"]
+        self.assertEqual(month_state["id"], status.data["id"])
+
     def test_completed_occurrence_rejects_new_movements_until_reopened(self):
         self.client.patch(
             self._month_status_url(),
@@ -962,3 +1019,2141 @@ class RecurringPaymentMonthlyCompletionTests(TestCase):
                 month=self.month_june,
             ).is_completed
         )
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, BUDGET_CACHE_TIMEOUT=0)
+class BudgetQueryCountTests(TestCase):
+    # Constant number of SQL round-trips for GET /api/budget/, whatever the
+    # size of the family, with the budget cache off so the build itself is
+    # measured. Raise it only with a good reason (13: the ETag lookup of the
+    # conditional GET; 14: the closed-month archive lookup).
+    BUDGET_QUERY_LIMIT = 14
+
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia consultas")
+        self.user = User.objects.create_user(username="queries-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.month = Month.objects.create(family=self.family, year=2026, month=5)
+        self.created = 0
+        self.client.force_authenticate(user=self.user)
+
+    def _add_activity(self, count):
+        for _ in range(count):
+            self.created += 1
+            category = Category.objects.create(
+                family=self.family,
+                name=f"Categoria {self.created}",
+                icon="tag",
+            )
+            recurring = RecurringPayment.objects.create(
+                family=self.family,
+                category=category,
+                payer=self.user,
+                name=f"Fijo {self.created}",
+                amount=Decimal("30.00"),
+                due_day=5,
+                start_date=date(2026, 1, 1),
+            )
+            plan = PlannedExpensePlan.objects.create(
+                family=self.family,
+                category=category,
+                name=f"Plan {self.created}",
+                plan_type="ONGOING",
+                start_month=self.month,
+                created_by=self.user,
+            )
+            PlannedExpenseVersion.objects.create(
+                plan=plan,
+                planned_amount=Decimal("100.00"),
+                valid_from=self.month,
+            )
+            legacy = PlannedExpense.objects.create(
+                month=self.month,
+                family=self.family,
+                category=category,
+                planned_amount=Decimal("50.00"),
+                created_by=self.user,
+            )
+            IncomePlan.objects.create(
+                family=self.family,
+                category=category,
+                plan_type="ONGOING",
+                start_month=self.month,
+                created_by=self.user,
+            ).versions.create(planned_amount=Decimal("900.00"), valid_from=self.month)
+            for kwargs in ({"recurring_payment": recurring}, {"planned_expense": legacy}, {}):
+                Expense.objects.create(
+                    month=self.month,
+                    user=self.user,
+                    amount=Decimal("10.00"),
+                    category=category,
+                    date=date(2026, 5, 10),
+                    **kwargs,
+                )
+
+    def _budget_query_count(self):
+        # Warm-up request creates any missing monthly occurrences.
+        self.client.get("/api/budget/?year=2026&month=5")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/budget/?year=2026&month=5")
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_budget_query_count_does_not_grow_with_family_size(self):
+        self._add_activity(1)
+        small_count, small_response = self._budget_query_count()
+        self.assertEqual(len(small_response.data["recurring"]), 1)
+
+        self._add_activity(10)
+        large_count, large_response = self._budget_query_count()
+
+        self.assertEqual(len(large_response.data["recurring"]), 11)
+        self.assertEqual(len(large_response.data["planned"]), 22)
+        self.assertEqual(len(large_response.data["income_plan_month"]["results"]), 11)
+        self.assertEqual(str(large_response.data["unplanned_total"]), "110.00")
+        self.assertEqual(large_count, small_count)
+        self.assertLessEqual(large_count, self.BUDGET_QUERY_LIMIT)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MonthBudgetSnapshotTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia snapshot")
+        self.user = User.objects.create_user(username="snapshot-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.food = Category.objects.create(family=self.family, name="Comida", icon="food")
+        self.home = Category.objects.create(family=self.family, name="Casa", icon="home")
+        self.recurring = RecurringPayment.objects.create(
+            family=self.family,
+            category=self.home,
+            name="Alquiler",
+            amount=Decimal("700.00"),
+            due_day=1,
+            start_date=date(2026, 1, 1),
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _assert_snapshot_matches_expenses(self, month):
+        snapshot_totals = load_month_expense_totals(month)
+        raw_totals = aggregate_month_expenses(month)
+        self.assertEqual(snapshot_totals.total, raw_totals.total)
+        self.assertEqual(snapshot_totals.unplanned, raw_totals.unplanned)
+        self.assertEqual(
+            {key: value for key, value in snapshot_totals.by_category.items() if value},
+            raw_totals.by_category,
+        )
+        self.assertEqual(
+            {key: value for key, value in snapshot_totals.by_recurring_payment.items() if value},
+            raw_totals.by_recurring_payment,
+        )
+
+    def test_snapshot_is_maintained_incrementally_by_expense_writes(self):
+        self.client.get("/api/budget/?year=2026&month=6")
+        june = Month.objects.get(family=self.family, year=2026, month=6)
+        self.assertTrue(MonthBudgetSnapshot.objects.filter(month=june).exists())
+
+        created = self.client.post(
+            "/api/expenses/",
+            {"description": "Mercado", "amount": "25.00", "category": self.food.id, "date": "2026-06-03"},
+            format="json",
+        )
+        self.assertEqual(created.status_code, 201)
+        rent = self.client.post(
+            "/api/expenses/",
+            {
+                "description": "Alquiler junio",
+                "amount": "700.00",
+                "category": self.home.id,
+                "recurring_payment": self.recurring.id,
+                "date": "2026-06-01",
+            },
+            format="json",
+        )
+        self.assertEqual(rent.status_code, 201)
+        self._assert_snapshot_matches_expenses(june)
+
+        self.client.patch(
+            f"/api/expenses/{created.data['id']}/",
+            {"amount": "30.00", "category": self.home.id},
+            format="json",
+        )
+        self._assert_snapshot_matches_expenses(june)
+
+        self.client.get("/api/budget/?year=2026&month=7")
+        july = Month.objects.get(family=self.family, year=2026, month=7)
+        self.client.patch(
+            f"/api/expenses/{created.data['id']}/",
+            {"date": "2026-07-02"},
+            format="json",
+        )
+        self._assert_snapshot_matches_expenses(june)
+        self._assert_snapshot_matches_expenses(july)
+
+        self.client.delete(f"/api/expenses/{rent.data['id']}/")
+        self._assert_snapshot_matches_expenses(june)
+
+        budget = self.client.get("/api/budget/?year=2026&month=7")
+        self.assertEqual(str(budget.data["unplanned_total"]), "30.00")
+
+    def test_deleting_linked_plan_rebuilds_snapshot_as_unplanned(self):
+        month = Month.objects.create(family=self.family, year=2026, month=8)
+        planned = PlannedExpense.objects.create(
+            month=month,
+            family=self.family,
+            category=self.food,
+            planned_amount=Decimal("100.00"),
+        )
+        Expense.objects.create(
+            month=month,
+            user=self.user,
+            amount=Decimal("40.00"),
+            category=self.food,
+            planned_expense=planned,
+            date=date(2026, 8, 4),
+        )
+        self.assertEqual(load_month_expense_totals(month).unplanned, Decimal("0.00"))
+
+        planned.delete()
+
+        self.assertFalse(MonthBudgetSnapshot.objects.filter(month=month).exists())
+        self.assertEqual(load_month_expense_totals(month).unplanned, Decimal("40.00"))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BudgetRangeTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia rango")
+        self.user = User.objects.create_user(username="range-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.months = [
+            Month.objects.create(family=self.family, year=2026, month=number)
+            for number in range(1, 13)
+        ]
+        self.category = Category.objects.create(family=self.family, name="Casa", icon="home")
+
+    def _add_activity(self):
+        january, march = self.months[0], self.months[2]
+        RecurringPayment.objects.create(
+            family=self.family,
+            category=self.category,
+            payer=self.user,
+            name="Alquiler",
+            amount=Decimal("500.00"),
+            due_day=1,
+            start_date=date(2026, 2, 1),
+            end_date=date(2026, 10, 31),
+        )
+        plan = PlannedExpensePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=january,
+            created_by=self.user,
+        )
+        PlannedExpenseVersion.objects.create(
+            plan=plan,
+            planned_amount=Decimal("200.00"),
+            valid_from=january,
+            valid_to=self.months[1],
+        )
+        PlannedExpenseVersion.objects.create(
+            plan=plan,
+            planned_amount=Decimal("250.00"),
+            valid_from=march,
+        )
+        IncomePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=january,
+            created_by=self.user,
+        ).versions.create(planned_amount=Decimal("1500.00"), valid_from=january)
+        for month in self.months:
+            Expense.objects.create(
+                month=month,
+                user=self.user,
+                amount=Decimal(month.month * 10),
+                category=self.category,
+                date=date(2026, month.month, 3),
+            )
+        Income.objects.create(
+            month=march,
+            user=self.user,
+            amount=Decimal("1450.00"),
+            category=self.category,
+            date=date(2026, 3, 25),
+        )
+
+    def test_range_matches_single_month_budgets(self):
+        self._add_activity()
+
+        response = self.client.get("/api/budget/range/?from=2026-01&to=2026-12")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["months"]), 12)
+        for entry in response.data["months"]:
+            budget = self.client.get(
+                f"/api/budget/?year=2026&month={entry['month']}"
+            ).data
+            self.assertEqual(entry["status"], budget["status"])
+            for key in (
+                "total_planned",
+                "total_spent",
+                "unplanned_total",
+                "remaining_amount",
+                "recurring_pending_amount",
+                "total_pending_amount",
+            ):
+                self.assertEqual(
+                    Decimal(entry[key]),
+                    Decimal(budget[key]),
+                    f"{key} differs for month {entry['month']}",
+                )
+
+        march = response.data["months"][2]
+        self.assertEqual(march["planned_planned"], Decimal("250.00"))
+        self.assertEqual(march["income_planned"], Decimal("1500.00"))
+        self.assertEqual(march["income_actual"], Decimal("1450.00"))
+        self.assertEqual(response.data["months"][0]["recurring_planned"], Decimal("0.00"))
+
+    def test_range_query_count_does_not_grow_with_months(self):
+        self._add_activity()
+        # Warm-up request caches the requesting profile.
+        self.client.get("/api/budget/range/?from=2026-01&to=2026-01")
+
+        with CaptureQueriesContext(connection) as short_range:
+            self.client.get("/api/budget/range/?from=2026-01&to=2026-03")
+        with CaptureQueriesContext(connection) as full_year:
+            response = self.client.get("/api/budget/range/?from=2026-01&to=2026-12")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(short_range), len(full_year))
+
+    def test_range_does_not_create_months(self):
+        response = self.client.get("/api/budget/range/?from=2025-11&to=2026-02")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data["months"][0]["month_id"])
+        self.assertEqual(response.data["months"][2]["month_id"], self.months[0].id)
+        self.assertFalse(Month.objects.filter(family=self.family, year=2025).exists())
+
+    def test_range_rejects_invalid_bounds(self):
+        for query in (
+            "from=2026-05&to=2026-01",
+            "from=2026-13&to=2027-01",
+            "from=2020-01&to=2026-01",
+            "to=2026-01",
+        ):
+            response = self.client.get(f"/api/budget/range/?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class PlanVersionResolutionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia versiones")
+        self.user = User.objects.create_user(username="versions-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(family=self.family, name="Luz", icon="bolt")
+        # Created out of calendar order so Month ids do not follow the calendar.
+        self.june = Month.objects.create(family=self.family, year=2026, month=6)
+        self.march = Month.objects.create(family=self.family, year=2026, month=3)
+        self.april = Month.objects.create(family=self.family, year=2026, month=4)
+
+    def test_month_and_version_ordinals_are_kept_in_sync(self):
+        plan = PlannedExpensePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.march,
+        )
+        version = PlannedExpenseVersion.objects.create(
+            plan=plan,
+            planned_amount=Decimal("40.00"),
+            valid_from=self.march,
+        )
+
+        self.assertEqual(self.march.ordinal, 2026 * 12 + 3)
+        self.assertEqual(version.valid_from_ordinal, self.march.ordinal)
+        self.assertIsNone(version.valid_to_ordinal)
+
+        version.valid_to = self.april
+        version.save(update_fields=["valid_to"])
+        version.refresh_from_db()
+        self.assertEqual(version.valid_to_ordinal, self.april.ordinal)
+
+    def test_budget_resolves_versions_by_calendar_not_month_id(self):
+        plan = PlannedExpensePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.march,
+        )
+        PlannedExpenseVersion.objects.create(
+            plan=plan,
+            planned_amount=Decimal("40.00"),
+            valid_from=self.march,
+            valid_to=self.april,
+        )
+        PlannedExpenseVersion.objects.create(
+            plan=plan,
+            planned_amount=Decimal("55.00"),
+            valid_from=self.june,
+        )
+
+        april = self.client.get("/api/budget/?year=2026&month=4")
+        june = self.client.get("/api/budget/?year=2026&month=6")
+
+        self.assertEqual(
+            [item["planned_amount"] for item in april.data["planned"]],
+            [Decimal("40.00")],
+        )
+        self.assertEqual(
+            [item["planned_amount"] for item in june.data["planned"]],
+            [Decimal("55.00")],
+        )
+
+    def test_income_plan_month_uses_latest_version_covering_month(self):
+        plan = IncomePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.march,
+        )
+        plan.versions.create(planned_amount=Decimal("1000.00"), valid_from=self.march)
+        plan.versions.create(planned_amount=Decimal("1200.00"), valid_from=self.june)
+
+        april = self.client.get("/api/income-plans/month/?year=2026&month=4")
+        june = self.client.get("/api/income-plans/month/?year=2026&month=6")
+
+        self.assertEqual(april.data["results"][0]["planned_amount"], "1000.00")
+        self.assertEqual(june.data["results"][0]["planned_amount"], "1200.00")
+
+    def test_plan_end_month_is_compared_by_calendar(self):
+        later = Month.objects.create(family=self.family, year=2099, month=6)
+        earlier = Month.objects.create(family=self.family, year=2099, month=3)
+        payload = {
+            "category": self.category.id,
+            "name": "Seguro",
+            "plan_type": "ONGOING",
+            "planned_amount": "30.00",
+        }
+
+        rejected = self.client.post(
+            "/api/planned-expense-plans/",
+            {**payload, "start_month": later.id, "end_month": earlier.id},
+            format="json",
+        )
+        accepted = self.client.post(
+            "/api/planned-expense-plans/",
+            {**payload, "start_month": earlier.id, "end_month": later.id},
+            format="json",
+        )
+
+        self.assertEqual(rejected.status_code, 400)
+        self.assertEqual(accepted.status_code, 201)
+
+    def test_projection_query_count_does_not_depend_on_months(self):
+        plan = IncomePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.march,
+        )
+        plan.versions.create(planned_amount=Decimal("1000.00"), valid_from=self.march)
+        plan.versions.create(planned_amount=Decimal("1200.00"), valid_from=self.june)
+        Income.objects.create(
+            month=self.april,
+            user=self.user,
+            amount=Decimal("1010.00"),
+            category=self.category,
+            income_plan=plan,
+            date=date(2026, 4, 15),
+        )
+        ordinals = [self.march.ordinal, self.april.ordinal, self.june.ordinal]
+
+        with CaptureQueriesContext(connection) as single:
+            project_plans(INCOME_PLANS, self.family, ordinals[:1])
+        with CaptureQueriesContext(connection) as many:
+            projection = project_plans(INCOME_PLANS, self.family, ordinals)
+
+        self.assertEqual(len(many), len(single))
+        self.assertEqual(
+            [projection[ordinal][0].version.planned_amount for ordinal in ordinals],
+            [Decimal("1000.00"), Decimal("1000.00"), Decimal("1200.00")],
+        )
+        self.assertEqual(
+            [projection[ordinal][0].actual is not None for ordinal in ordinals],
+            [False, True, False],
+        )
+
+    def test_one_month_plans_only_project_onto_their_month(self):
+        income_plan = IncomePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONE_MONTH",
+            start_month=self.april,
+            end_month=self.april,
+        )
+        income_plan.versions.create(planned_amount=Decimal("300.00"), valid_from=self.april)
+        expense_plan = PlannedExpensePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONE_MONTH",
+            start_month=self.april,
+            end_month=self.april,
+        )
+        PlannedExpenseVersion.objects.create(
+            plan=expense_plan,
+            planned_amount=Decimal("20.00"),
+            valid_from=self.april,
+        )
+        ordinals = [self.march.ordinal, self.april.ordinal, self.june.ordinal]
+
+        incomes = project_plans(INCOME_PLANS, self.family, ordinals, actuals=False)
+        expenses = project_plans(EXPENSE_PLANS, self.family, ordinals, actuals=False)
+
+        self.assertEqual(
+            [[item.plan for item in incomes[ordinal]] for ordinal in ordinals],
+            [[], [income_plan], []],
+        )
+        self.assertEqual(expenses, {ordinal: [] for ordinal in ordinals})
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class RecurringGenerationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia generacion")
+        self.user = User.objects.create_user(username="generation-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(family=self.family, name="Fijos", icon="home")
+
+    def _add_recurring(self, count, **kwargs):
+        for index in range(count):
+            RecurringPayment.objects.create(
+                family=self.family,
+                category=self.category,
+                name=f"Fijo {index}",
+                amount=Decimal("12.50"),
+                due_day=31,
+                start_date=kwargs.get("start_date", date(2025, 1, 1)),
+                end_date=kwargs.get("end_date"),
+            )
+
+    def test_generates_a_range_of_months_once(self):
+        self._add_recurring(2)
+        self._add_recurring(1, start_date=date(2025, 3, 1), end_date=date(2025, 3, 31))
+
+        response = self.client.post(
+            "/api/recurring/generate/",
+            {"from": "2025-02", "to": "2025-04"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 7)
+        self.assertEqual(
+            [month["created"] for month in response.data["months"]],
+            [2, 3, 2],
+        )
+        february = Expense.objects.filter(month__year=2025, month__month=2)
+        self.assertEqual({expense.date for expense in february}, {date(2025, 2, 28)})
+        self.assertEqual(
+            RecurringPaymentOccurrence.objects.filter(recurring_payment__family=self.family).count(),
+            7,
+        )
+
+        again = self.client.post(
+            "/api/recurring/generate/",
+            {"from": "2025-02", "to": "2025-04"},
+            format="json",
+        )
+        self.assertEqual(again.data["created"], 0)
+        self.assertEqual(again.data["skipped"], 7)
+        self.assertEqual(Expense.objects.filter(month__family=self.family).count(), 7)
+
+    def test_single_target_month_keeps_response_shape_and_updates_snapshot(self):
+        self._add_recurring(2)
+        month = Month.objects.create(family=self.family, year=2025, month=6)
+        load_month_expense_totals(month)
+
+        response = self.client.post("/api/recurring/generate/?year=2025&month=6")
+
+        self.assertEqual(
+            response.data,
+            {"month": "2025-6", "created": 2, "skipped": 0, "completed_skipped": 0},
+        )
+        self.assertEqual(load_month_expense_totals(month), aggregate_month_expenses(month))
+        self.assertEqual(load_month_expense_totals(month).total, Decimal("25.00"))
+
+    def test_closed_target_month_is_rejected(self):
+        self._add_recurring(1)
+        Month.objects.create(family=self.family, year=2025, month=6, is_closed=True)
+
+        response = self.client.post("/api/recurring/generate/?year=2025&month=6")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Expense.objects.filter(month__family=self.family).exists())
+
+    def test_generation_query_count_does_not_grow_with_payments(self):
+        self._add_recurring(1)
+        # Warm-up request caches the requesting profile.
+        self.client.post("/api/recurring/generate/?year=2025&month=5")
+        with CaptureQueriesContext(connection) as small:
+            self.client.post("/api/recurring/generate/?year=2025&month=6")
+
+        self._add_recurring(15)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post("/api/recurring/generate/?year=2025&month=7")
+
+        self.assertEqual(response.data["created"], 16)
+        self.assertEqual(len(small), len(large))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class GenerateRecurringCommandTests(TestCase):
+    def _family_with_payment(self, name):
+        family = Family.objects.create(name=name)
+        member = User.objects.create_user(username=f"{name}-member", password="secret123")
+        member.profile.family = family
+        member.profile.save(update_fields=["family"])
+        admin = User.objects.create_user(username=f"{name}-admin", password="secret123")
+        admin.profile.family = family
+        admin.profile.role = "admin"
+        admin.profile.save(update_fields=["family", "role"])
+        category = Category.objects.create(family=family, name="Fijos", icon="home")
+        RecurringPayment.objects.create(
+            family=family,
+            category=category,
+            name="Internet",
+            amount=Decimal("30.00"),
+            due_day=10,
+            start_date=date(2025, 1, 1),
+        )
+        return family, admin
+
+    def test_generates_every_family_as_its_admin(self):
+        first, first_admin = self._family_with_payment("uno")
+        second, second_admin = self._family_with_payment("dos")
+        out = StringIO()
+
+        call_command("generate_recurring", month="2025-06", batch_size=1, stdout=out)
+
+        self.assertEqual(
+            set(Expense.objects.values_list("month__family_id", "user_id")),
+            {(first.id, first_admin.id), (second.id, second_admin.id)},
+        )
+        self.assertIn("2 families, 2 created", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+
+        call_command("generate_recurring", month="2025-06", stdout=StringIO())
+        self.assertEqual(Expense.objects.count(), 2)
+
+    def test_shard_only_processes_matching_families(self):
+        families = [self._family_with_payment(name)[0] for name in ("a", "b", "c")]
+
+        call_command("generate_recurring", month="2025-06", shard="1/2", stdout=StringIO())
+
+        self.assertEqual(
+            set(Expense.objects.values_list("month__family_id", flat=True)),
+            {family.id for family in families if family.id % 2 == 1},
+        )
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MovementPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia paginas")
+        self.user = User.objects.create_user(username="pages-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.month = Month.objects.create(family=self.family, year=2026, month=3)
+        self.category = Category.objects.create(family=self.family, name="Super", icon="cart")
+
+    def _create_expenses(self, count):
+        return [
+            Expense.objects.create(
+                month=self.month,
+                user=self.user,
+                amount=Decimal("5.00"),
+                category=self.category,
+                # Several rows share a date so the id tie-breaker matters.
+                date=date(2026, 3, 1 + index // 3),
+            )
+            for index in range(count)
+        ]
+
+    def test_expenses_are_paginated_by_cursor_without_gaps(self):
+        expenses = self._create_expenses(7)
+
+        seen = []
+        url = "/api/expenses/?year=2026&month=3&page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+
+        expected = sorted(expenses, key=lambda e: (e.date, e.created_at, e.id), reverse=True)
+        self.assertEqual(seen, [expense.id for expense in expected])
+
+    def test_unpaginated_list_is_available_on_request(self):
+        self._create_expenses(4)
+        Income.objects.create(
+            month=self.month,
+            user=self.user,
+            amount=Decimal("100.00"),
+            category=self.category,
+            date=date(2026, 3, 2),
+        )
+
+        expenses = self.client.get("/api/expenses/?paginate=false")
+        incomes = self.client.get("/api/incomes/?paginate=false")
+        paginated_incomes = self.client.get("/api/incomes/")
+
+        self.assertIsInstance(expenses.data, list)
+        self.assertEqual(len(expenses.data), 4)
+        self.assertIsInstance(incomes.data, list)
+        self.assertEqual(len(paginated_incomes.data["results"]), 1)
+
+    def test_out_of_range_month_is_rejected(self):
+        january = Month.objects.create(family=self.family, year=2027, month=1)
+        Expense.objects.create(
+            month=january,
+            user=self.user,
+            amount=Decimal("5.00"),
+            category=self.category,
+            date=date(2027, 1, 15),
+        )
+
+        expenses = self.client.get("/api/expenses/?year=2026&month=13")
+        incomes = self.client.get("/api/incomes/?year=2026&month=0")
+
+        self.assertEqual(expenses.status_code, 400)
+        self.assertEqual(incomes.status_code, 400)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ExpenseListRecurringStateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia estados")
+        self.user = User.objects.create_user(username="states-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.month = Month.objects.create(family=self.family, year=2026, month=9)
+        self.category = Category.objects.create(family=self.family, name="Fijos", icon="home")
+
+    def _add_recurring_expenses(self, count):
+        for _ in range(count):
+            recurring = RecurringPayment.objects.create(
+                family=self.family,
+                category=self.category,
+                name="Cuota",
+                amount=Decimal("20.00"),
+                due_day=1,
+                start_date=date(2026, 1, 1),
+            )
+            for amount in ("5.00", "7.00"):
+                Expense.objects.create(
+                    month=self.month,
+                    user=self.user,
+                    amount=Decimal(amount),
+                    category=self.category,
+                    recurring_payment=recurring,
+                    date=date(2026, 9, 2),
+                )
+
+    def _list_query_count(self):
+        # Warm-up request caches the requesting profile.
+        self.client.get("/api/expenses/?year=2026&month=1")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/expenses/?year=2026&month=9&paginate=false")
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_list_loads_recurring_state_without_per_row_queries_or_writes(self):
+        self._add_recurring_expenses(1)
+        small_count, _ = self._list_query_count()
+
+        self._add_recurring_expenses(9)
+        large_count, response = self._list_query_count()
+
+        self.assertEqual(small_count, large_count)
+        self.assertFalse(RecurringPaymentOccurrence.objects.exists())
+        states = [item["recurring_payment_month"] for item in response.data]
+        self.assertEqual(len(states), 20)
+        self.assertEqual({str(state["paid_amount"]) for state in states}, {"12.00"})
+        self.assertEqual({str(state["pending_amount"]) for state in states}, {"8.00"})
+        self.assertEqual({state["id"] for state in states}, {None})
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class RequestProfileCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia perfil")
+        self.user = User.objects.create_user(username="profile-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+
+    def _profile_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in queries if 'FROM "core_profile"' in query["sql"]]
+
+    def test_profile_is_resolved_once_and_then_served_from_cache(self):
+        self.assertEqual(len(self._profile_queries("/api/expenses/")), 1)
+        self.assertEqual(self._profile_queries("/api/expenses/"), [])
+
+    def test_moving_to_another_family_invalidates_the_cache(self):
+        Category.objects.create(family=self.family, name="Vieja", icon="tag")
+        other = Family.objects.create(name="Otra familia")
+        Category.objects.create(family=other, name="Nueva", icon="tag")
+        self.client.get("/api/categories/")
+
+        self.user.profile.family = other
+        self.user.profile.save(update_fields=["family"])
+
+        response = self.client.get("/api/categories/")
+        self.assertEqual([item["name"] for item in response.data], ["Nueva"])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class FamilyScopedRelationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia relaciones")
+        self.user = User.objects.create_user(username="relations-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.month = Month.objects.create(family=self.family, year=2026, month=10)
+        self.category = Category.objects.create(family=self.family, name="Hogar", icon="home")
+        self.planned = PlannedExpense.objects.create(
+            month=self.month,
+            family=self.family,
+            category=self.category,
+            planned_amount=Decimal("80.00"),
+        )
+        self.recurring = RecurringPayment.objects.create(
+            family=self.family,
+            category=self.category,
+            name="Seguro",
+            amount=Decimal("25.00"),
+            due_day=3,
+            start_date=date(2026, 1, 1),
+        )
+        other_family = Family.objects.create(name="Otra")
+        self.foreign_category = Category.objects.create(family=other_family, name="Ajena", icon="x")
+
+    def _payload(self, **overrides):
+        payload = {
+            "amount": "25.00",
+            "category": self.category.id,
+            "payer": self.user.id,
+            "planned_expense": self.planned.id,
+            "recurring_payment": self.recurring.id,
+            "date": "2026-10-05",
+        }
+        payload.update(overrides)
+        return payload
+
+    def test_all_relations_are_validated_in_one_query(self):
+        self.client.get("/api/expenses/?year=2026&month=10")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/expenses/", self._payload(), format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        relation_checks = [
+            query["sql"] for query in queries
+            if 'FROM "core_category"' in query["sql"] and "UNION" not in query["sql"]
+            and "core_expense" not in query["sql"]
+        ]
+        self.assertEqual(relation_checks, [])
+        self.assertEqual(sum("UNION" in query["sql"] for query in queries), 1)
+        self.assertEqual(response.data["payer_detail"]["username"], "relations-user")
+        self.assertEqual(str(response.data["recurring_payment_month"]["paid_amount"]), "25.00")
+
+    def test_relations_of_another_family_are_rejected(self):
+        response = self.client.post(
+            "/api/expenses/",
+            self._payload(category=self.foreign_category.id, planned_expense=None, recurring_payment=None),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("category", response.data)
+        self.assertFalse(Expense.objects.exists())
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ExpenseImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia import")
+        self.user = User.objects.create_user(username="import-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.partner = User.objects.create_user(username="import-partner", password="secret123")
+        self.partner.profile.family = self.family
+        self.partner.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.food = Category.objects.create(family=self.family, name="Comida", icon="food")
+        other_family = Family.objects.create(name="Otra")
+        self.foreign_category = Category.objects.create(family=other_family, name="Ajena", icon="x")
+
+    def _upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode("utf-8"))
+        return self.client.post(
+            "/api/expenses/import/",
+            {"file": upload, **data},
+            format="multipart",
+        )
+
+    def test_csv_rows_are_imported_and_invalid_rows_reported(self):
+        content = (
+            "date,amount,category,payer,description\n"
+            f"2026-03-02,12.50,{self.food.id},,Pan\n"
+            "05/04/2026,\"7,25\",comida,import-partner,Fruta\n"
+            f"2026-03-09,-3,{self.food.id},,Negativo\n"
+            f"2026-03-10,4,{self.foreign_category.id},,Ajena\n"
+            "not-a-date,4,comida,nobody,Mal\n"
+        )
+        response = self._upload("banco.csv", content)
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["error_count"], 3)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [4, 5, 6])
+        self.assertEqual(set(response.data["errors"][2]["errors"]), {"date", "payer"})
+
+        april = Expense.objects.get(description="Fruta")
+        self.assertEqual(april.amount, Decimal("7.25"))
+        self.assertEqual(april.payer, self.partner)
+        self.assertEqual((april.month.year, april.month.month), (2026, 4))
+        self.assertEqual(april.month.family, self.family)
+        march = Month.objects.get(family=self.family, year=2026, month=3)
+        self.assertEqual(load_month_expense_totals(march).total, aggregate_month_expenses(march).total)
+
+    def test_out_of_range_amounts_are_row_errors(self):
+        content = (
+            "date,amount,category\n"
+            f"2026-03-02,1E+30,{self.food.id}\n"
+            f"2026-03-03,100000000,{self.food.id}\n"
+            f"2026-03-04,99999999.995,{self.food.id}\n"
+            f"2026-03-05,99999999.99,{self.food.id}\n"
+        )
+        response = self._upload("banco.csv", content)
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 3, 4])
+        for error in response.data["errors"]:
+            self.assertEqual(set(error["errors"]), {"amount"})
+
+    def test_json_lines_and_closed_months(self):
+        Month.objects.create(family=self.family, year=2026, month=1, is_closed=True)
+        content = "\n".join(
+            [
+                '{"date": "2026-01-15", "amount": "10", "category": "Comida"}',
+                '{"date": "2026-02-15", "amount": 20, "category": "Comida"}',
+                "[1, 2]",
+                "{broken",
+            ]
+        )
+        response = self._upload("export.jsonl", content)
+
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(
+            {error["row"]: set(error["errors"]) for error in response.data["errors"]},
+            {1: {"date"}, 3: {"detail"}, 4: {"detail"}},
+        )
+        self.assertEqual(Expense.objects.get().amount, Decimal("20.00"))
+
+    def test_ofx_debits_use_the_default_category(self):
+        content = (
+            "OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+            "<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20260105120000\n"
+            "<TRNAMT>-42.10\n<NAME>Supermercado\n</STMTTRN>\n"
+            "<STMTTRN>\n<TRNTYPE>CREDIT\n<DTPOSTED>20260106\n"
+            "<TRNAMT>1500.00\n<NAME>Nomina\n</STMTTRN>\n"
+            "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+        )
+        response = self._upload("banco.ofx", content, default_category=self.food.id)
+
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["errors"][0]["errors"], {"amount": "Amount must be greater than 0"})
+        expense = Expense.objects.get()
+        self.assertEqual((expense.date, expense.amount), (date(2026, 1, 5), Decimal("42.10")))
+        self.assertEqual(expense.category, self.food)
+
+    def test_foreign_default_category_and_unknown_type_are_rejected(self):
+        response = self._upload("banco.ofx", "", default_category=self.foreign_category.id)
+        self.assertEqual(response.status_code, 400)
+
+        response = self._upload("banco.txt", "date,amount\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Expense.objects.exists())
+
+    def test_rows_are_inserted_with_one_bulk_insert_per_chunk(self):
+        lines = "".join(f"2026-{(i % 3) + 1:02d}-10,1,comida\n" for i in range(40))
+        importer = ExpenseImporter(family=self.family, user=self.user, chunk_size=10)
+        with CaptureQueriesContext(connection) as queries:
+            report = importer.run(
+                SimpleUploadedFile("a.csv", f"date,amount,category\n{lines}".encode()).file,
+                "csv",
+            )
+
+        self.assertEqual(report.created, 40)
+        self.assertEqual(Expense.objects.count(), 40)
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith('INSERT INTO "core_expense"')]
+        self.assertEqual(len(inserts), 4)
+
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MovementExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia export")
+        self.user = User.objects.create_user(username="export-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.partner = User.objects.create_user(username="export-partner", password="secret123")
+        self.partner.profile.family = self.family
+        self.partner.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.march = Month.objects.create(family=self.family, year=2026, month=3)
+        self.april = Month.objects.create(family=self.family, year=2026, month=4)
+        self.category = Category.objects.create(family=self.family, name="Super", icon="cart")
+
+        for month, payer, amount in (
+            (self.march, self.user, "10.50"),
+            (self.march, self.partner, "4.25"),
+            (self.april, self.user, "7.00"),
+        ):
+            Expense.objects.create(
+                month=month,
+                user=self.user,
+                payer=payer,
+                amount=Decimal(amount),
+                category=self.category,
+                date=date(month.year, month.month, 5),
+                description="Compra, \"grande\"",
+            )
+
+        other = User.objects.create_user(username="export-other", password="secret123")
+        other_month = Month.objects.create(family=other.profile.family, year=2026, month=3)
+        other_category = Category.objects.create(family=other.profile.family, name="X", icon="x")
+        Expense.objects.create(
+            month=other_month,
+            user=other,
+            amount=Decimal("99.00"),
+            category=other_category,
+            date=date(2026, 3, 5),
+        )
+
+    def _csv_rows(self, response):
+        content = b"".join(response.streaming_content).decode("utf-8")
+        return list(csv.DictReader(StringIO(content)))
+
+    def test_expense_csv_export_streams_filtered_family_rows(self):
+        response = self.client.get(
+            f"/api/expenses/export/?year=2026&month=3&payer={self.partner.id}"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('filename="expenses-2026-03.csv"', response["Content-Disposition"])
+        rows = self._csv_rows(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["amount"], "4.25")
+        self.assertEqual(rows[0]["payer"], "export-partner")
+        self.assertEqual(rows[0]["category"], "Super")
+        self.assertEqual(rows[0]["description"], 'Compra, "grande"')
+
+        everything = self._csv_rows(self.client.get("/api/expenses/export/"))
+        self.assertEqual([row["amount"] for row in everything], ["7.00", "4.25", "10.50"])
+
+    def test_income_xlsx_export_is_a_valid_workbook(self):
+        Income.objects.create(
+            month=self.march,
+            user=self.user,
+            amount=Decimal("1500.00"),
+            category=self.category,
+            date=date(2026, 3, 1),
+            description="Nómina <marzo>",
+        )
+
+        response = self.client.get("/api/incomes/export/?file_type=xlsx")
+
+        self.assertEqual(response.status_code, 200)
+        with zipfile.ZipFile(BytesIO(b"".join(response.streaming_content))) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertEqual(sheet.count("<row>"), 2)
+        self.assertIn("<c><v>1500.00</v></c>", sheet)
+        self.assertIn("Nómina &lt;marzo&gt;", sheet)
+
+    def test_unknown_export_type_is_rejected(self):
+        response = self.client.get("/api/expenses/export/?file_type=pdf")
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia etag")
+        self.user = User.objects.create_user(username="etag-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.march = Month.objects.create(family=self.family, year=2026, month=3)
+        self.april = Month.objects.create(family=self.family, year=2026, month=4)
+        self.category = Category.objects.create(family=self.family, name="Super", icon="cart")
+
+    def _etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def _add_expense(self, month):
+        return Expense.objects.create(
+            month=month,
+            user=self.user,
+            amount=Decimal("5.00"),
+            category=self.category,
+            date=date(month.year, month.month, 3),
+        )
+
+    def test_unchanged_month_answers_not_modified_without_building(self):
+        url = "/api/budget/?year=2026&month=3"
+        etag = self._etag(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertLessEqual(len(queries), 2)
+
+    def test_member_changes_change_the_family_tag(self):
+        url = "/api/expenses/?year=2026&month=3"
+        etag = self._etag(url)
+
+        self.user.first_name = "Renamed"
+        self.user.save()
+        renamed = self._etag(url)
+        self.user.profile.role = "admin"
+        self.user.profile.save(update_fields=["role"])
+        promoted = self._etag(url)
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+
+        self.assertEqual(len({etag, renamed, promoted}), 3)
+        self.assertEqual(self._etag(url), promoted)
+
+    def test_writes_change_only_the_affected_month(self):
+        urls = [
+            "/api/budget/?year=2026&month=3",
+            "/api/expenses/?year=2026&month=3",
+            "/api/incomes/?year=2026&month=3",
+            "/api/income-plans/month/?year=2026&month=3",
+        ]
+        april_url = "/api/expenses/?year=2026&month=4"
+        before = [self._etag(url) for url in urls]
+        april_before = self._etag(april_url)
+
+        expense = self._add_expense(self.march)
+        after_create = [self._etag(url) for url in urls]
+        self.assertTrue(all(b != a for b, a in zip(before, after_create)))
+        self.assertEqual(self._etag(april_url), april_before)
+
+        expense.date = date(2026, 4, 3)
+        expense.month = self.april
+        expense.save()
+        self.assertNotEqual(self._etag(urls[1]), after_create[1])
+        self.assertNotEqual(self._etag(april_url), april_before)
+
+    def test_month_close_and_family_wide_changes_change_the_etag(self):
+        url = "/api/expenses/?year=2026&month=3"
+        etag = self._etag(url)
+
+        month = Month.objects.get(pk=self.march.pk)
+        month.is_closed = True
+        month.save()
+        closed_etag = self._etag(url)
+        self.assertNotEqual(closed_etag, etag)
+
+        plan = PlannedExpensePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.march,
+        )
+        plan_etag = self._etag(url)
+        self.assertNotEqual(plan_etag, closed_etag)
+
+        PlannedExpenseVersion.objects.create(
+            plan=plan,
+            planned_amount=Decimal("10.00"),
+            valid_from=self.march,
+        )
+        self.assertNotEqual(self._etag(url), plan_etag)
+
+    def test_full_save_does_not_write_back_a_stale_version(self):
+        stale = Month.objects.get(pk=self.march.pk)
+        self._add_expense(self.march)
+        stale.save()
+
+        # One bump per write; a stale write-back would have reset it to 0 + 1.
+        self.assertEqual(Month.objects.get(pk=self.march.pk).data_version, 2)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, BUDGET_CACHE_TIMEOUT=60)
+class BudgetCacheTests(TestCase):
+    def setUp(self):
+        reset_budget_cache_stats()
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia cache")
+        self.user = User.objects.create_user(username="cache-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.march = Month.objects.create(family=self.family, year=2026, month=3)
+        self.april = Month.objects.create(family=self.family, year=2026, month=4)
+        self.category = Category.objects.create(family=self.family, name="Super", icon="cart")
+
+    def _cache_state(self, month):
+        response = self.client.get(f"/api/budget/?year=2026&month={month}")
+        self.assertEqual(response.status_code, 200)
+        return response["X-Budget-Cache"]
+
+    def test_out_of_range_month_is_rejected(self):
+        for month in (0, 13):
+            response = self.client.get(f"/api/budget/?year=2030&month={month}")
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("month", response.data)
+        self.assertFalse(Month.objects.filter(family=self.family, year=2030).exists())
+
+    def test_payer_rename_invalidates_cached_budget(self):
+        self.user.first_name = "Ann"
+        self.user.save()
+        RecurringPayment.objects.create(
+            family=self.family,
+            category=self.category,
+            payer=self.user,
+            name="Gimnasio",
+            amount=Decimal("30.00"),
+            due_day=5,
+            start_date=date(2026, 3, 1),
+        )
+        # The first read creates the payment's occurrence row, a write of its own.
+        self._cache_state(3)
+        self._cache_state(3)
+        self.assertEqual(self._cache_state(3), "hit")
+
+        self.user.first_name = "Anna"
+        self.user.save()
+        response = self.client.get("/api/budget/?year=2026&month=3")
+
+        self.assertEqual(response["X-Budget-Cache"], "miss")
+        self.assertEqual(response.data["recurring"][0]["payer_detail"]["display_name"], "Anna")
+
+    def test_writes_invalidate_only_the_affected_months(self):
+        self.assertEqual(self._cache_state(3), "miss")
+        self.assertEqual(self._cache_state(4), "miss")
+        self.assertEqual(self._cache_state(3), "hit")
+
+        Expense.objects.create(
+            month=self.march,
+            user=self.user,
+            amount=Decimal("5.00"),
+            category=self.category,
+            date=date(2026, 3, 3),
+        )
+        self.assertEqual(self._cache_state(3), "miss")
+        self.assertEqual(self._cache_state(4), "hit")
+
+        recurring = RecurringPayment.objects.create(
+            family=self.family,
+            category=self.category,
+            name="Gimnasio",
+            amount=Decimal("30.00"),
+            due_day=5,
+            start_date=date(2026, 4, 1),
+        )
+        self.assertEqual(self._cache_state(3), "hit")
+        response = self.client.get("/api/budget/?year=2026&month=4")
+        self.assertEqual(response["X-Budget-Cache"], "miss")
+        self.assertEqual([item["id"] for item in response.data["recurring"]], [recurring.id])
+
+        self.assertEqual(budget_cache_stats()["hits"], 3)
+
+    def test_plan_versions_invalidate_the_months_they_cover(self):
+        plan = PlannedExpensePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.march,
+        )
+        version = PlannedExpenseVersion.objects.create(
+            plan=plan,
+            planned_amount=Decimal("10.00"),
+            valid_from=self.april,
+        )
+        self._cache_state(3)
+        self._cache_state(4)
+
+        version.planned_amount = Decimal("20.00")
+        version.save()
+
+        self.assertEqual(self._cache_state(3), "hit")
+        self.assertEqual(self._cache_state(4), "miss")
+
+    def test_stats_are_admin_only(self):
+        self._cache_state(3)
+        self._cache_state(3)
+
+        self.assertEqual(self.client.get("/api/budget/cache-stats/").status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save(update_fields=["is_staff"])
+        response = self.client.get("/api/budget/cache-stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 1)
+        self.assertEqual(response.data["hit_ratio"], 0.5)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, BUDGET_CACHE_TIMEOUT=0)
+class MonthBudgetArchiveTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia archivo")
+        self.user = User.objects.create_user(username="archive-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.month = Month.objects.create(family=self.family, year=2026, month=2)
+        self.food = Category.objects.create(family=self.family, name="Comida", icon="food")
+        self.home = Category.objects.create(family=self.family, name="Casa", icon="home")
+        recurring = RecurringPayment.objects.create(
+            family=self.family,
+            category=self.home,
+            name="Alquiler",
+            amount=Decimal("700.00"),
+            due_day=1,
+            start_date=date(2026, 1, 1),
+        )
+        for category, amount, link in (
+            (self.home, "700.00", {"recurring_payment": recurring}),
+            (self.food, "42.30", {}),
+        ):
+            Expense.objects.create(
+                month=self.month,
+                user=self.user,
+                amount=Decimal(amount),
+                category=category,
+                date=date(2026, 2, 3),
+                **link,
+            )
+
+    def _close(self, is_closed=True):
+        month = Month.objects.get(pk=self.month.pk)
+        month.is_closed = is_closed
+        month.save()
+
+    def test_closing_freezes_the_budget_and_reopening_discards_it(self):
+        live = self.client.get("/api/budget/?year=2026&month=2")
+        live_range = self.client.get("/api/budget/range/?from=2026-01&to=2026-03")
+
+        self._close()
+        archive = MonthBudgetArchive.objects.get(month=self.month)
+        rollups = {
+            rollup.category_name: (rollup.planned_amount, rollup.spent_amount)
+            for rollup in archive.category_rollups.all()
+        }
+        self.assertEqual(rollups["Casa"], (Decimal("700.00"), Decimal("700.00")))
+        self.assertEqual(rollups["Comida"], (Decimal("0.00"), Decimal("42.30")))
+
+        with CaptureQueriesContext(connection) as queries:
+            archived = self.client.get("/api/budget/?year=2026&month=2")
+        self.assertEqual(archived["X-Budget-Cache"], "archive")
+        self.assertLessEqual(len(queries), 3)
+        expected = live.json()
+        expected["income_plan_month"]["month"]["is_closed"] = True
+        self.assertEqual(archived.json(), expected)
+
+        archived_range = self.client.get("/api/budget/range/?from=2026-01&to=2026-03").json()
+        expected_range = live_range.json()
+        expected_range["months"][1]["is_closed"] = True
+        self.assertEqual(archived_range, expected_range)
+
+        self._close(False)
+        self.assertFalse(MonthBudgetArchive.objects.filter(month=self.month).exists())
+        self.assertEqual(
+            self.client.get("/api/budget/?year=2026&month=2")["X-Budget-Cache"],
+            "miss",
+        )
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MonthCloseWorkflowTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia cierre")
+        self.user = User.objects.create_user(username="close-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.month = Month.objects.create(family=self.family, year=2026, month=6)
+        self.category = Category.objects.create(family=self.family, name="Casa", icon="home")
+        self.created = 0
+
+    def _add_family_activity(self, count):
+        for _ in range(count):
+            self.created += 1
+            RecurringPayment.objects.create(
+                family=self.family,
+                category=self.category,
+                name=f"Fijo {self.created}",
+                amount=Decimal("30.00"),
+                due_day=5,
+                start_date=date(2026, 1, 1),
+            )
+            IncomePlan.objects.create(
+                family=self.family,
+                category=self.category,
+                plan_type="ONGOING",
+                due_day=28,
+                start_month=self.month,
+                created_by=self.user,
+            ).versions.create(planned_amount=Decimal("900.00"), valid_from=self.month)
+
+    def _close(self, **data):
+        return self.client.post("/api/months/2026-6/close/", data, format="json")
+
+    def test_close_finalizes_occurrences_and_pending_incomes(self):
+        self._add_family_activity(2)
+        resolved_plan = IncomePlan.objects.order_by("id").first()
+        Income.objects.create(
+            month=self.month,
+            user=self.user,
+            amount=Decimal("850.00"),
+            category=self.category,
+            income_plan=resolved_plan,
+            date=date(2026, 6, 27),
+        )
+
+        response = self._close()
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["completed_occurrences"], 2)
+        self.assertEqual(response.data["resolved_incomes"], 1)
+        self.month.refresh_from_db()
+        self.assertTrue(self.month.is_closed)
+        self.assertEqual(
+            RecurringPaymentOccurrence.objects.filter(month=self.month, is_completed=True).count(),
+            2,
+        )
+        generated = Income.objects.exclude(income_plan=resolved_plan).get(month=self.month)
+        self.assertEqual(generated.amount, Decimal("900.00"))
+        self.assertEqual(generated.date, date(2026, 6, 28))
+        self.assertTrue(MonthBudgetArchive.objects.filter(month=self.month).exists())
+
+        self.assertEqual(self._close().status_code, 400)
+        blocked = self.client.post(
+            "/api/expenses/",
+            {"amount": "5.00", "category": self.category.id, "date": "2026-06-10"},
+            format="json",
+        )
+        self.assertEqual(blocked.status_code, 400)
+
+    def test_close_statement_count_does_not_grow_with_family_size(self):
+        def close_count():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self._close().status_code, 200)
+            self.assertEqual(
+                self.client.post("/api/months/2026-6/reopen/").status_code,
+                200,
+            )
+            Income.objects.filter(month=self.month).delete()
+            RecurringPaymentOccurrence.objects.filter(month=self.month).delete()
+            return len(queries)
+
+        self._add_family_activity(1)
+        small = close_count()
+        self._add_family_activity(10)
+        large = close_count()
+
+        self.assertEqual(large, small)
+
+    def test_reopen_discards_the_archive_and_can_skip_incomes(self):
+        self._add_family_activity(1)
+
+        response = self._close(resolve_incomes=False)
+        self.assertEqual(response.data["resolved_incomes"], 0)
+        self.assertFalse(Income.objects.filter(month=self.month).exists())
+
+        response = self.client.post("/api/months/2026-6/reopen/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["is_closed"])
+        self.assertFalse(MonthBudgetArchive.objects.filter(month=self.month).exists())
+        self.assertEqual(self.client.post("/api/months/2026-6/reopen/").status_code, 400)
+        self.assertEqual(self.client.post("/api/months/2026-13/close/").status_code, 400)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MonthCalendarTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia calendario")
+        self.user = User.objects.create_user(username="calendar-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+
+    def _month_inserts(self, queries):
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("INSERT") and '"core_month"' in query["sql"]
+        ]
+
+    def test_command_provisions_window_once(self):
+        out = StringIO()
+        for _ in range(2):
+            call_command(
+                "provision_months",
+                month="2026-01",
+                window=2,
+                family_ids=[self.family.id],
+                stdout=out,
+            )
+
+        months = Month.objects.filter(family=self.family).order_by("ordinal")
+        self.assertEqual(
+            [(month.year, month.month) for month in months],
+            [(2025, 11), (2025, 12), (2026, 1), (2026, 2), (2026, 3)],
+        )
+        self.assertEqual(months[0].ordinal, 2025 * 12 + 11)
+        self.assertIn("1 families, 5 months created", out.getvalue())
+        self.assertIn("1 families, 0 months created", out.getvalue())
+
+    def test_reads_of_provisioned_months_never_insert(self):
+        provision_months(self.family, around=(2026, 6), window=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get("/api/budget/?year=2026&month=6").status_code, 200)
+            self.assertEqual(
+                self.client.get("/api/income-plans/month/?year=2026&month=7").status_code,
+                200,
+            )
+
+        self.assertEqual(self._month_inserts(queries), [])
+        self.assertEqual(Month.objects.filter(family=self.family).count(), 3)
+
+    def test_parse_year_month(self):
+        self.assertEqual(parse_year_month("2026-03"), (2026, 3))
+        for value in ("2026-13", "2026-00", "2026", "2026-03-01", "march", None):
+            with self.assertRaises(ValueError):
+                parse_year_month(value)
+
+    def test_out_of_range_months_are_never_stored(self):
+        for month in (0, 13):
+            with self.assertRaises(ValueError):
+                resolve_month(self.family, 2030, month)
+            with self.assertRaises(ValueError):
+                ensure_months(self.family, [(2030, 12), (2030, month)])
+            with self.assertRaises(ValueError):
+                Month.objects.create(family=self.family, year=2030, month=month)
+
+        self.assertFalse(Month.objects.filter(family=self.family).exists())
+
+    def test_known_month_resolves_in_one_query(self):
+        provision_months(self.family, around=(2026, 6), window=0)
+
+        with self.assertNumQueries(1):
+            month_obj = resolve_month(self.family, 2026, 6)
+
+        self.assertEqual((month_obj.year, month_obj.month), (2026, 6))
+        self.assertFalse(month_obj.is_closed)
+
+    def test_deleted_month_is_recreated_not_served_from_cache(self):
+        month_obj = resolve_month(self.family, 2026, 6)
+        self.assertEqual(get_month_id(self.family, 2026, 6), month_obj.id)
+
+        month_obj.delete()
+
+        self.assertIsNone(get_month_id(self.family, 2026, 6))
+        recreated = resolve_month(self.family, 2026, 6)
+        self.assertNotEqual(recreated.id, month_obj.id)
+        self.assertEqual(recreated.family_id, self.family.id)
+
+    def test_registration_provisions_the_calendar(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(
+            "/api/auth/register/",
+            {"username": "dora", "password": "strongPass123"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        family = User.objects.get(username="dora").profile.family
+        today = timezone.localdate()
+        self.assertEqual(Month.objects.filter(family=family).count(), 49)
+        self.assertTrue(
+            Month.objects.filter(family=family, year=today.year, month=today.month).exists()
+        )
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BenchmarkCommandTests(TestCase):
+    def test_synthetic_family_matches_spec_and_snapshots(self):
+        spec = SyntheticFamilySpec(
+            members=2,
+            categories=3,
+            recurring_payments=2,
+            expense_plans=2,
+            income_plans=1,
+            versions_per_plan=2,
+            years=1,
+            expenses_per_month=5,
+            incomes_per_month=1,
+            end=(2026, 6),
+        )
+
+        synthetic = build_synthetic_family(spec, seed=3)
+
+        family = synthetic.family
+        self.assertEqual(synthetic.earliest, (2025, 7))
+        self.assertEqual(synthetic.latest, (2026, 6))
+        self.assertEqual(Month.objects.filter(family=family).count(), 12)
+        self.assertEqual(User.objects.filter(profile__family=family).count(), 2)
+        # Two recurring expenses in each of the 11 past months.
+        self.assertEqual(synthetic.counts["expenses"], 12 * 5 + 11 * 2)
+        versions = PlannedExpenseVersion.objects.filter(plan__family=family).order_by(
+            "plan_id", "valid_from_ordinal"
+        )
+        self.assertEqual(
+            [(v.valid_from_ordinal, v.valid_to_ordinal) for v in versions[:2]],
+            [(2025 * 12 + 7, 2025 * 12 + 12), (2026 * 12 + 1, None)],
+        )
+        for month_obj in synthetic.months[-2:]:
+            self.assertEqual(
+                load_month_expense_totals(month_obj),
+                aggregate_month_expenses(month_obj),
+            )
+
+    def test_reports_every_endpoint_and_rolls_back(self):
+        families = Family.objects.count()
+        out = StringIO()
+
+        call_command(
+            "benchmark",
+            members=1,
+            categories=2,
+            recurring_payments=1,
+            expense_plans=1,
+            income_plans=1,
+            years=1,
+            expenses_per_month=3,
+            iterations=2,
+            warmup=0,
+            month="2026-06",
+            stdout=out,
+            stderr=StringIO(),
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(
+            set(report["endpoints"]),
+            {
+                "budget",
+                "budget_range",
+                "income_plan_month",
+                "expense_list",
+                "income_list",
+                "analytics",
+            },
+        )
+        for result in report["endpoints"].values():
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertGreater(result["queries"], 0)
+        self.assertEqual(report["dataset"]["months"], 12)
+        self.assertEqual(Family.objects.count(), families)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False, REQUEST_METRICS_ENABLED=True)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        reset_route_metrics()
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia métricas")
+        self.user = User.objects.create_user(username="metrics-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(family=self.family, name="Super", icon="cart")
+        month = Month.objects.create(family=self.family, year=2026, month=6)
+        Expense.objects.create(
+            month=month,
+            user=self.user,
+            amount=Decimal("12.00"),
+            category=category,
+            date=date(2026, 6, 3),
+        )
+
+    def _timings(self, response):
+        return {
+            entry.split(";")[0]: entry
+            for entry in response["Server-Timing"].split(", ")
+        }
+
+    def test_server_timing_reports_queries_view_and_serializer(self):
+        with self.assertLogs("core.request_metrics", level="INFO") as logs:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/api/expenses/?year=2026&month=6")
+
+        self.assertEqual(response.status_code, 200)
+        timings = self._timings(response)
+        self.assertEqual(set(timings), {"total", "db", "view", "serializer"})
+        self.assertIn(f'desc="{len(queries)} queries"', timings["db"])
+        self.assertEqual(len(logs.output), 1)
+        self.assertTrue(logs.output[0].startswith("INFO:core.request_metrics:request=GET expense-list "))
+        self.assertIn(f"queries={len(queries)}", logs.output[0])
+
+    def test_routes_are_aggregated_for_admins_only(self):
+        with self.assertLogs("core.request_metrics", level="INFO") as logs:
+            self.client.get("/api/expenses/?year=2026&month=6")
+            self.client.get("/api/expenses/?year=2026&month=6")
+
+            self.assertEqual(self.client.get("/api/_metrics/").status_code, 403)
+            self.user.is_staff = True
+            self.user.save(update_fields=["is_staff"])
+            response = self.client.get("/api/_metrics/")
+
+            self.assertEqual(response.status_code, 200)
+            route = response.data["routes"]["GET expense-list"]
+            self.assertEqual(route["requests"], 2)
+            self.assertEqual(sum(route["duration_ms"]["buckets"].values()), 2)
+            self.assertGreater(route["max_queries"], 0)
+
+            self.assertEqual(self.client.delete("/api/_metrics/").status_code, 204)
+            self.assertNotIn("GET expense-list", self.client.get("/api/_metrics/").data["routes"])
+
+        requests = [record.metrics["request"] for record in logs.records]
+        self.assertEqual(requests[:2], ["GET expense-list"] * 2)
+        self.assertEqual(len(requests), 6)
+
+    def test_requests_and_commands_are_logged(self):
+        with self.assertLogs("core.request_metrics", level="INFO") as logs:
+            self.client.get("/api/budget/?year=2026&month=6")
+            call_command(
+                "provision_months",
+                month="2026-06",
+                window=0,
+                family_ids=[self.family.id],
+                stdout=StringIO(),
+            )
+
+        self.assertTrue(logs.output[0].startswith("INFO:core.request_metrics:request=GET budget "))
+        self.assertIn(":command=provision_months ", logs.output[1])
+        self.assertIn("queries=", logs.output[1])
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_disabled_by_default(self):
+        response = self.client.get("/api/expenses/?year=2026&month=6")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class IncomePlanConfirmAllTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia confirmaciones")
+        self.user = User.objects.create_user(username="confirm-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(family=self.family, name="Ingresos", icon="cash")
+        self.month = Month.objects.create(family=self.family, year=2026, month=6)
+
+    def _add_plan(self, name, amount="1000.00", due_day=15):
+        plan = IncomePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            name=name,
+            plan_type="ONGOING",
+            due_day=due_day,
+            start_month=self.month,
+        )
+        if amount is not None:
+            plan.versions.create(planned_amount=Decimal(amount), valid_from=self.month)
+        return plan
+
+    def _confirm_all(self):
+        return self.client.post("/api/income-plans/month/confirm-all/?year=2026&month=6")
+
+    def test_confirms_only_pending_plans(self):
+        pending = self._add_plan("Nomina", "1500.00", due_day=31)
+        resolved = self._add_plan("Alquiler", "400.00")
+        self._add_plan("Sin version", amount=None)
+        Income.objects.create(
+            month=self.month,
+            user=self.user,
+            amount=Decimal("380.00"),
+            category=self.category,
+            income_plan=resolved,
+            date=date(2026, 6, 10),
+        )
+
+        response = self._confirm_all()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["confirmed"], 1)
+        self.assertEqual(response.data["plan_ids"], [pending.id])
+        income = Income.objects.get(income_plan=pending)
+        self.assertEqual(income.amount, Decimal("1500.00"))
+        self.assertEqual(income.date, date(2026, 6, 30))
+        self.assertEqual(self._confirm_all().data["confirmed"], 0)
+
+        status_by_plan = {
+            item["plan_id"]: item["status"]
+            for item in self.client.get("/api/income-plans/month/?year=2026&month=6").data["results"]
+        }
+        self.assertEqual(status_by_plan[pending.id], "RESOLVED")
+
+    def test_counts_only_incomes_actually_inserted(self):
+        raced = self._add_plan("Nomina")
+        pending = self._add_plan("Alquiler", "400.00")
+        load = income_plan_month_service.load_income_plan_month
+
+        def load_then_confirm_concurrently(family, month_obj):
+            items = load(family, month_obj)
+            Income.objects.create(
+                month=self.month,
+                user=self.user,
+                amount=Decimal("1000.00"),
+                category=self.category,
+                income_plan=raced,
+                date=date(2026, 6, 15),
+            )
+            return items
+
+        with mock.patch.object(
+            income_plan_month_service,
+            "load_income_plan_month",
+            load_then_confirm_concurrently,
+        ):
+            response = self._confirm_all()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["confirmed"], 1)
+        self.assertEqual(response.data["plan_ids"], [pending.id])
+        self.assertEqual(Income.objects.filter(income_plan=raced).count(), 1)
+
+    def test_query_count_does_not_grow_with_plans(self):
+        def confirm_count():
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self._confirm_all().status_code, 200)
+            Income.objects.filter(month=self.month).delete()
+            return len(queries)
+
+        self._add_plan("Uno")
+        # Warm-up request caches the requesting profile.
+        confirm_count()
+        small = confirm_count()
+        for index in range(10):
+            self._add_plan(f"Plan {index}")
+        large = confirm_count()
+
+        self.assertEqual(large, small)
+
+    def test_closed_month_is_rejected(self):
+        self._add_plan("Nomina")
+        self.month.is_closed = True
+        self.month.save(update_fields=["is_closed"])
+
+        response = self._confirm_all()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Income.objects.filter(month=self.month).exists())
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class ForecastTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.family = Family.objects.create(name="Familia pronóstico")
+        self.user = User.objects.create_user(username="forecast-user", password="secret123")
+        self.user.profile.family = self.family
+        self.user.profile.save(update_fields=["family"])
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(family=self.family, name="Casa", icon="home")
+        self.january = Month.objects.create(family=self.family, year=2030, month=1)
+        self.march = Month.objects.create(family=self.family, year=2030, month=3)
+
+    def _add_plans(self):
+        income_plan = IncomePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.january,
+        )
+        income_plan.versions.create(
+            planned_amount=Decimal("1000.00"),
+            valid_from=self.january,
+            valid_to=self.january,
+        )
+        income_plan.versions.create(planned_amount=Decimal("1200.00"), valid_from=self.march)
+        expense_plan = PlannedExpensePlan.objects.create(
+            family=self.family,
+            category=self.category,
+            plan_type="ONGOING",
+            start_month=self.january,
+        )
+        PlannedExpenseVersion.objects.create(
+            plan=expense_plan,
+            planned_amount=Decimal("100.00"),
+            valid_from=self.january,
+        )
+        PlannedExpense.objects.create(
+            month=self.march,
+            family=self.family,
+            category=self.category,
+            planned_amount=Decimal("50.00"),
+        )
+        # Starts after its January due day and ends before its April one.
+        RecurringPayment.objects.create(
+            family=self.family,
+            category=self.category,
+            name="Alquiler",
+            amount=Decimal("300.00"),
+            due_day=10,
+            start_date=date(2030, 1, 15),
+            end_date=date(2030, 4, 5),
+        )
+
+    def _forecast(self, months):
+        return self.client.get(f"/api/forecast/?from=2030-01&months={months}")
+
+    def test_forecast_projects_plans_and_fixed_payments(self):
+        self._add_plans()
+
+        response = self._forecast(4)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["from"], response.data["to"]), ("2030-01", "2030-04"))
+        self.assertEqual(
+            [
+                (
+                    row["month"],
+                    row["income_planned"],
+                    row["recurring_planned"],
+                    row["planned_planned"],
+                    row["net"],
+                    row["cumulative_net"],
+                )
+                for row in response.data["months"]
+            ],
+            [
+                (1, Decimal("1000.00"), Decimal("0.00"), Decimal("100.00"), Decimal("900.00"), Decimal("900.00")),
+                (2, Decimal("0.00"), Decimal("300.00"), Decimal("100.00"), Decimal("-400.00"), Decimal("500.00")),
+                (3, Decimal("1200.00"), Decimal("300.00"), Decimal("150.00"), Decimal("750.00"), Decimal("1250.00")),
+                (4, Decimal("1200.00"), Decimal("0.00"), Decimal("100.00"), Decimal("1100.00"), Decimal("2350.00")),
+            ],
+        )
+        self.assertEqual(response.data["totals"]["net"], Decimal("2350.00"))
+
+    def test_forecast_query_count_does_not_depend_on_months(self):
+        self._add_plans()
+        self._forecast(1)
+
+        with CaptureQueriesContext(connection) as short:
+            self._forecast(3)
+        with CaptureQueriesContext(connection) as long:
+            response = self._forecast(24)
+
+        self.assertEqual(len(response.data["months"]), 24)
+        self.assertEqual(len(long), len(short))
+        self.assertEqual(Month.objects.filter(family=self.family).count(), 2)
+
+    def test_forecast_rejects_invalid_spans(self):
+        self.assertEqual(self._forecast(0).status_code, 400)
+        self.assertEqual(self._forecast(61).status_code, 400)
+        self.assertEqual(self.client.get("/api/forecast/?months=x").status_code, 400)
+        self.assertEqual(self.client.get("/api/forecast/?from=2030-13").status_code, 400)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        self.synthetic = build_synthetic_family(
+            SyntheticFamilySpec(
+                members=2,
+                categories=3,
+                recurring_payments=1,
+                expense_plans=0,
+                income_plans=1,
+                years=1,
+                expenses_per_month=6,
+                end=(2026, 6),
+            ),
+            seed=5,
+        )
+        self.family = self.synthetic.family
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.synthetic.users[0])
+
+    def _summary(self, query):
+        return self.client.get(f"/api/analytics/summary/?{query}")
+
+    def test_summary_matches_orm_aggregates(self):
+        response = self._summary("from=2025-07&to=2026-06&window=3")
+
+        self.assertEqual(response.status_code, 200)
+        months = response.data["months"]
+        self.assertEqual(len(months), 12)
+        expense_totals = dict(
+            Expense.objects.filter(month__family=self.family)
+            .values("month__ordinal")
+            .annotate(total=Sum("amount"))
+            .order_by()
+            .values_list("month__ordinal", "total")
+        )
+        self.assertEqual(
+            [row["expenses"] for row in months],
+            [expense_totals[month_obj.ordinal] for month_obj in self.synthetic.months],
+        )
+        self.assertEqual(
+            months[2]["expenses_moving_average"],
+            (sum(row["expenses"] for row in months[:3]) / 3).quantize(Decimal("0.01")),
+        )
+        category_totals = dict(
+            Expense.objects.filter(month__family=self.family)
+            .values("category")
+            .annotate(total=Sum("amount"))
+            .order_by()
+            .values_list("category", "total")
+        )
+        self.assertEqual(
+            {entry["category"]: entry["total"] for entry in response.data["categories"]},
+            category_totals,
+        )
+        self.assertEqual(
+            sum(entry["total"] for entry in response.data["payers"]),
+            sum(expense_totals.values()),
+        )
+        amounts = sorted(Expense.objects.filter(month__family=self.family).values_list("amount", flat=True))
+        self.assertEqual(
+            response.data["expense_percentiles"],
+            {
+                "p50": amounts[math.ceil(len(amounts) * 0.5) - 1],
+                "p90": amounts[math.ceil(len(amounts) * 0.9) - 1],
+                "p99": amounts[math.ceil(len(amounts) * 0.99) - 1],
+            },
+        )
+
+    def test_summary_query_count_does_not_depend_on_span(self):
+        self._summary("from=2026-06&to=2026-06")
+
+        with CaptureQueriesContext(connection) as short:
+            self._summary("from=2026-06&to=2026-06")
+        with CaptureQueriesContext(connection) as long:
+            self._summary("from=2020-01&to=2026-06")
+
+        self.assertEqual(len(long), len(short))
+
+    def test_summary_rejects_invalid_spans(self):
+        self.assertEqual(self._summary("from=2026-06&to=2026-01").status_code, 400)
+        self.assertEqual(self._summary("from=2010-01&to=2026-06").status_code, 400)
+        self.assertEqual(self._summary("window=0").status_code, 400)
+
+    def test_command_compares_against_python_grouping(self):
+        out = StringIO()
+        err = StringIO()
+
+        call_command(
+            "analytics_report",
+            family_id=self.family.id,
+            start="2025-07",
+            end="2026-06",
+            compare_python=True,
+            iterations=1,
+            stdout=out,
+            stderr=err,
+        )
+
+        document = json.loads(out.getvalue())
+        self.assertEqual(document["report"]["counts"]["expenses"], self.synthetic.counts["expenses"])
+        self.assertEqual(set(document["comparison"]), {"report_totals_ms", "python_ms"})
+        self.assertIn("report totals", err.getvalue())
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class MoneyTests(TestCase):
+    def test_cents_round_trip_and_absorb_float_drift(self):
+        self.assertEqual(to_cents(Decimal("12.34")), 1234)
+        self.assertEqual(to_cents(Decimal("409441.700000001")), 40944170)
+        self.assertEqual(to_cents(Decimal("0.005")), 0)
+        self.assertEqual(to_cents(7), 700)
+        self.assertEqual(to_cents(None), 0)
+        self.assertEqual(str(from_cents(-1234)), "-12.34")
+        self.assertEqual(str(from_cents(0)), "0.00")
+
+    def test_budget_amounts_keep_two_decimal_places(self):
+        family = Family.objects.create(name="Familia centavos")
+        user = User.objects.create_user(username="cents-user", password="secret123")
+        user.profile.family = family
+        user.profile.save(update_fields=["family"])
+        client = APIClient()
+        client.force_authenticate(user=user)
+        category = Category.objects.create(family=family, name="Casa", icon="home")
+        RecurringPayment.objects.create(
+            family=family,
+            category=category,
+            name="Internet",
+            amount=Decimal("30.10"),
+            due_day=5,
+            start_date=date(2026, 1, 1),
+        )
+
+        empty = client.get("/api/budget/?year=2025&month=12")
+        budget = client.get("/api/budget/?year=2026&month=3")
+
+        self.assertEqual(str(empty.data["total_planned"]), "0.00")
+        self.assertEqual(str(empty.data["total_spent"]), "0.00")
+        row = budget.data["recurring"][0]
+        self.assertEqual(
+            [str(row[key]) for key in ("planned_amount", "paid_amount", "pending_amount")],
+            ["30.10", "0.00", "30.10"],
+        )
+        self.assertEqual(str(budget.data["percentage_used"]), "0.00")
+        self.assertEqual(str(budget.data["total_pending_amount"]), "30.10")
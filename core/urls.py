@@ -9,7 +9,13 @@ from core.views.RecurringPayment_viewset import RecurringPaymentViewSet
 from core.views.plannedExpense_viewset import PlannedExpenseViewSet
 from core.views.planned_expense_plan_viewset import PlannedExpensePlanViewSet
 from core.views.csrf_view import csrf
-from core.views.budget_view import BudgetView
+from core.views.analytics_view import AnalyticsSummaryView
+from core.views.budget_view import (
+    BudgetCacheStatsView,
+    BudgetRangeView,
+    BudgetView,
+    ForecastView,
+)
 from core.views.auth_view import (
     ChangePasswordView,
     LoginView,
@@ -18,6 +24,8 @@ from core.views.auth_view import (
     RegisterView,
 )
 from core.views.family_member_view import FamilyMemberListView
+from core.views.metrics_view import RequestMetricsView
+from core.views.month_view import MonthCloseView, MonthReopenView
 
 from core.views.planned_income_plan_viewset import IncomePlanViewSet
 from core.views.plannedIncome_viewset import IncomePlanVersionViewSet
@@ -57,6 +65,11 @@ urlpatterns = [
         IncomeViewSet.as_view({'get': 'list', 'post': 'create'}),
         name='income-list-create',
     ),
+    path(
+        'incomes/export/',
+        IncomeViewSet.as_view({'get': 'export'}),
+        name='income-export',
+    ),
     path(
         'incomes/<int:pk>/',
         IncomeViewSet.as_view(
@@ -77,7 +90,14 @@ urlpatterns = [
     path('auth/me/', MeView.as_view(), name='auth-me'),
     path('auth/change-password/', ChangePasswordView.as_view(), name='auth-change-password'),
     path("budget/", BudgetView.as_view(), name="budget"),
+    path("budget/range/", BudgetRangeView.as_view(), name="budget-range"),
+    path("budget/cache-stats/", BudgetCacheStatsView.as_view(), name="budget-cache-stats"),
+    path("forecast/", ForecastView.as_view(), name="forecast"),
+    path("analytics/summary/", AnalyticsSummaryView.as_view(), name="analytics-summary"),
     path("family/members/", FamilyMemberListView.as_view(), name="family-members"),
+    path("months/<int:year>-<int:month>/close/", MonthCloseView.as_view(), name="month-close"),
+    path("months/<int:year>-<int:month>/reopen/", MonthReopenView.as_view(), name="month-reopen"),
+    path("_metrics/", RequestMetricsView.as_view(), name="request-metrics"),
 ]
 
 urlpatterns += router.urls
@@ -10,16 +10,17 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 
-from core.models import Expense, RecurringPayment, Profile
+from core.models import Expense, RecurringPayment
 from core.serializers.recurringPayment_serializer import (
     RecurringPaymentCompletionSerializer,
     RecurringPaymentPaymentsSerializer,
     RecurringPaymentSerializer,
 )
-from core.models import Month
+from core.services.month_calendar_service import resolve_month
 from core.services.recurring_payment_service import (
     get_recurring_payment_month_state,
 )
+from core.services.request_profile import get_request_profile
 
 
 class RecurringPaymentViewSet(ModelViewSet):
@@ -35,13 +36,13 @@ class RecurringPaymentViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         return RecurringPayment.objects.filter(
             family=profile.family
         ).select_related('category', 'payer', 'payer__profile').order_by('name')
 
     def perform_create(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         amount = serializer.validated_data.get("amount")
         if amount is None or amount <= 0:
@@ -62,7 +63,7 @@ class RecurringPaymentViewSet(ModelViewSet):
         serializer.save(**save_kwargs)
 
     def perform_update(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         amount = serializer.validated_data.get("amount")
         if amount is not None and amount <= 0:
             raise ValidationError({"amount": "Amount must be greater than 0"})
@@ -107,7 +108,7 @@ class RecurringPaymentViewSet(ModelViewSet):
 
     @action(detail=True, methods=["get"])
     def payments(self, request, pk=None):
-        profile = get_object_or_404(Profile, user=request.user)
+        profile = get_request_profile(request)
         payments_qs = (
             Expense.objects.filter(month__family=profile.family)
             .select_related(
@@ -160,13 +161,8 @@ class RecurringPaymentViewSet(ModelViewSet):
                 {"detail": "Recurring payment does not apply to the selected month"}
             )
 
-        profile = get_object_or_404(Profile, user=request.user)
-        month_obj, _ = Month.objects.get_or_create(
-            family=profile.family,
-            year=year,
-            month=month_number,
-            defaults={"is_closed": False},
-        )
+        profile = get_request_profile(request)
+        month_obj = resolve_month(profile.family, year, month_number)
 
         occurrence, amounts = get_recurring_payment_month_state(
             recurring_payment=recurring,
@@ -0,0 +1,40 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.services.analytics_service import DEFAULT_WINDOW, AnalyticsService, trailing_span
+from core.services.request_profile import get_request_family
+from core.views.budget_view import _parse_year_month
+
+
+class AnalyticsSummaryView(APIView):
+    """Expense trends, category and payer splits for ``from``..``to`` (YYYY-MM).
+
+    Defaults to the last 12 months; ``window`` sets the moving-average width.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        start, end = trailing_span()
+        if request.query_params.get("from") is not None:
+            start = _parse_year_month(request.query_params["from"], "from")
+        if request.query_params.get("to") is not None:
+            end = _parse_year_month(request.query_params["to"], "to")
+        try:
+            window = int(request.query_params.get("window", DEFAULT_WINDOW))
+        except ValueError:
+            raise ValidationError({"window": "window must be an integer"})
+
+        try:
+            service = AnalyticsService(
+                family=get_request_family(request),
+                start=start,
+                end=end,
+                window=window,
+            )
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+
+        return Response(service.build_report())
@@ -14,6 +14,7 @@ from core.serializers.auth_serializer import (
     MeSerializer,
     RegisterSerializer,
 )
+from core.services.month_calendar_service import provision_months
 
 
 def _ensure_profile(user: User):
@@ -72,6 +73,7 @@ class RegisterView(APIView):
 
         profile.role = "admin"
         profile.save(update_fields=["role"])
+        provision_months(family)
 
         login(request, user)
         return Response(_auth_payload(user), status=status.HTTP_201_CREATED)
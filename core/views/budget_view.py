@@ -1,114 +1,20 @@
-from django.db.models import Q
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from core.models import Income, IncomePlan, IncomePlanVersion, Month
-from core.serializers.category_serializer import CategorySerializer
-from core.services.budget_service import BudgetService
-
-
-# Helper functions for month comparisons and income plan month status
-def _lte_month_q(prefix: str, year: int, month: int) -> Q:
-    """(prefix.year < year) OR (prefix.year==year AND prefix.month<=month)"""
-    return Q(**{f"{prefix}__year__lt": year}) | (
-        Q(**{f"{prefix}__year": year}) & Q(**{f"{prefix}__month__lte": month})
-    )
-
-
-def _gte_month_q(prefix: str, year: int, month: int) -> Q:
-    """(prefix.year > year) OR (prefix.year==year AND prefix.month>=month)"""
-    return Q(**{f"{prefix}__year__gt": year}) | (
-        Q(**{f"{prefix}__year": year}) & Q(**{f"{prefix}__month__gte": month})
-    )
-
-
-def build_income_plan_month_status(family, year: int, month: int):
-    """Return income plans applicable to (year, month) with PENDING/RESOLVED status.
-
-    This is used by the BudgetView so the frontend can show 'planificados pendientes' and
-    resolve them (confirm/adjust) later.
-    """
-    month_obj, _ = Month.objects.get_or_create(
-        family=family,
-        year=year,
-        month=month,
-        defaults={'is_closed': False},
-    )
-
-    plans = IncomePlan.objects.filter(
-        family=family,
-        active=True,
-    ).filter(
-        _lte_month_q('start_month', year, month)
-    ).filter(
-        Q(end_month__isnull=True) | _gte_month_q('end_month', year, month)
-    ).select_related('category', 'start_month', 'end_month').order_by('-created_at')
-
-    versions = (
-        IncomePlanVersion.objects.filter(plan__in=plans)
-        .filter(_lte_month_q('valid_from', year, month))
-        .filter(Q(valid_to__isnull=True) | _gte_month_q('valid_to', year, month))
-        .select_related('valid_from', 'valid_to')
-        .order_by('plan_id', 'valid_from__year', 'valid_from__month', 'created_at')
-    )
-    latest_versions = {}
-    for version in versions:
-        latest_versions[version.plan_id] = version
-
-    existing_incomes = (
-        Income.objects.filter(
-            month=month_obj,
-            income_plan__in=plans,
-        )
-        .select_related('category')
-        .order_by('income_plan_id', '-created_at')
-    )
-    resolved_incomes = {}
-    for income in existing_incomes:
-        resolved_incomes.setdefault(income.income_plan_id, income)
-
-    results = []
-    for plan in plans:
-        version = latest_versions.get(plan.id)
-        existing_income = resolved_incomes.get(plan.id)
-
-        if existing_income:
-            status = 'RESOLVED'
-        else:
-            status = 'PENDING' if version is not None else 'MISSING_VERSION'
-
-        results.append({
-            'plan_id': plan.id,
-            'name': plan.name,
-            'plan_type': plan.plan_type,
-            'due_day': plan.due_day,
-            'start_month': plan.start_month_id,
-            'end_month': plan.end_month_id,
-            'category': plan.category_id,
-            'category_detail': CategorySerializer(plan.category).data,
-            'version_id': version.id if version else None,
-            'planned_amount': str(version.planned_amount) if version else None,
-            'status': status,
-            'can_resolve': (not month_obj.is_closed) and (version is not None) and (existing_income is None),
-            'resolved_income': {
-                'id': existing_income.id,
-                'amount': str(existing_income.amount),
-                'date': existing_income.date,
-                'description': existing_income.description,
-            } if existing_income else None,
-        })
-
-    return {
-        'month': {
-            'id': month_obj.id,
-            'year': year,
-            'month': month,
-            'is_closed': month_obj.is_closed,
-        },
-        'results': results,
-    }
+from core.services.budget_archive_service import load_archived_budget
+from core.services.budget_cache_service import budget_cache_stats, get_cached_budget
+from core.services.budget_service import BudgetRangeService, BudgetService
+from core.services.data_version_service import (
+    check_month_etag,
+    month_data_versions,
+    set_etag,
+)
+from core.services.forecast_service import DEFAULT_FORECAST_MONTHS, ForecastService
+from core.services.income_plan_month_service import build_income_plan_month_status
+from core.services.month_calendar_service import parse_year_month
+from core.services.request_profile import get_request_family
 
 
 class BudgetView(APIView):
@@ -126,20 +32,103 @@ class BudgetView(APIView):
             month = int(month)
         except ValueError:
             raise ValidationError("year and month must be integers")
+        if not 1 <= month <= 12:
+            raise ValidationError({"month": "month must be between 1 and 12"})
+
+        family = get_request_family(request)
+        versions = month_data_versions(family, year, month)
+        etag, not_modified = check_month_etag(request, family, year, month, versions)
+        if not_modified is not None:
+            return not_modified
+
+        archived = load_archived_budget(family, year, month)
+        if archived is not None:
+            response = set_etag(Response(archived), etag)
+            response["X-Budget-Cache"] = "archive"
+            return response
 
         service = BudgetService(
-            family=request.user.profile.family,
+            family=family,
             year=year,
             month=month,
         )
 
-        data = service.build_budget()
+        data, cache_hit = get_cached_budget(service, versions)
 
         # Income plans (salary/recurrent) status for this month
         data['income_plan_month'] = build_income_plan_month_status(
-            family=request.user.profile.family,
+            family=family,
             year=year,
             month=month,
+            month_obj=service.get_month(),
         )
 
-        return Response(data)
+        response = set_etag(Response(data), etag)
+        response["X-Budget-Cache"] = "hit" if cache_hit else "miss"
+        return response
+
+
+class BudgetCacheStatsView(APIView):
+    """Budget cache hit/miss counters of the worker serving the request."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(budget_cache_stats())
+
+
+def _parse_year_month(value, field):
+    try:
+        return parse_year_month(value)
+    except ValueError:
+        raise ValidationError({field: "Expected YYYY-MM"})
+
+
+class BudgetRangeView(APIView):
+    """Per-month budget totals for ``from``..``to`` (inclusive, YYYY-MM)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        start = _parse_year_month(request.query_params.get("from"), "from")
+        end = _parse_year_month(request.query_params.get("to"), "to")
+
+        try:
+            service = BudgetRangeService(
+                family=get_request_family(request),
+                start=start,
+                end=end,
+            )
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+
+        return Response(service.build_range())
+
+
+class ForecastView(APIView):
+    """Planned cash flow of the next ``months`` months (default 12).
+
+    Starts at the current month, or at ``from`` (YYYY-MM) when given.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            months = int(request.query_params.get("months", DEFAULT_FORECAST_MONTHS))
+        except ValueError:
+            raise ValidationError({"months": "months must be an integer"})
+        start = request.query_params.get("from")
+        if start is not None:
+            start = _parse_year_month(start, "from")
+
+        try:
+            service = ForecastService(
+                family=get_request_family(request),
+                months=months,
+                start=start,
+            )
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)})
+
+        return Response(service.build_forecast())
@@ -1,9 +1,9 @@
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
 
-from core.models import Category, Profile
+from core.models import Category
 from core.serializers.category_serializer import CategorySerializer
+from core.services.request_profile import get_request_profile
 
 
 class CategoryViewSet(ModelViewSet):
@@ -11,9 +11,9 @@ class CategoryViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         return Category.objects.filter(family=profile.family).order_by('name')
 
     def perform_create(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         serializer.save(family=profile.family)
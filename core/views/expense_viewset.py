@@ -1,18 +1,39 @@
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
-from django.shortcuts import get_object_or_404
 
-from core.models import Expense, Profile, Month
+from core.models import Expense, month_ordinal
+from core.pagination import DateCursorPagination
 from core.serializers.expense_serializer import ExpenseSerializer
+from core.services.data_version_service import check_month_etag, set_etag
+from core.services.expense_import_service import (
+    ImportFormatError,
+    detect_file_type,
+    import_expenses,
+)
+from core.services.month_calendar_service import resolve_month
+from core.services.movement_export_service import (
+    EXPENSE_COLUMNS,
+    ExportFormatError,
+    detect_export_type,
+    export_filename,
+    export_response,
+)
 from core.services.recurring_payment_service import (
     get_or_create_recurring_payment_occurrence,
 )
+from core.services.request_profile import get_request_profile
 
 
 class ExpenseViewSet(ModelViewSet):
     serializer_class = ExpenseSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DateCursorPagination
 
     def _ensure_recurring_occurrence_is_open(self, *, recurring_payment, month):
         if recurring_payment is None:
@@ -32,8 +53,33 @@ class ExpenseViewSet(ModelViewSet):
                 }
             )
 
+    def _requested_month(self):
+        year = self.request.query_params.get('year')
+        month = self.request.query_params.get('month')
+        if not (year and month):
+            return None
+        try:
+            year, month = int(year), int(month)
+        except (TypeError, ValueError):
+            raise ValidationError({'detail': 'Query params year and month must be integers'})
+        if not 1 <= month <= 12:
+            raise ValidationError({'month': 'month must be between 1 and 12'})
+        return year, month
+
+    def list(self, request, *args, **kwargs):
+        requested_month = self._requested_month()
+        if requested_month is None:
+            return super().list(request, *args, **kwargs)
+
+        etag, not_modified = check_month_etag(
+            request, get_request_profile(request).family, *requested_month
+        )
+        if not_modified is not None:
+            return not_modified
+        return set_etag(super().list(request, *args, **kwargs), etag)
+
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         queryset = Expense.objects.filter(
             month__family=profile.family
@@ -45,23 +91,13 @@ class ExpenseViewSet(ModelViewSet):
             'payer__profile',
             'planned_expense',
             'recurring_payment',
-        )
+        ).order_by(*DateCursorPagination.ordering)
 
-        year = self.request.query_params.get('year')
-        month = self.request.query_params.get('month')
+        requested_month = self._requested_month()
         payer = self.request.query_params.get('payer')
 
-        if year and month:
-            try:
-                year_int = int(year)
-                month_int = int(month)
-            except (TypeError, ValueError):
-                raise ValidationError({'detail': 'Query params year and month must be integers'})
-
-            queryset = queryset.filter(
-                month__year=year_int,
-                month__month=month_int
-            )
+        if requested_month is not None:
+            queryset = queryset.filter(month__ordinal=month_ordinal(*requested_month))
 
         if payer:
             try:
@@ -73,19 +109,16 @@ class ExpenseViewSet(ModelViewSet):
 
         return queryset
 
+    # Atomic so the budget snapshot delta commits together with the row.
+    @transaction.atomic
     def perform_create(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         expense_date = serializer.validated_data.get('date')
         if not expense_date:
             raise ValidationError({'date': 'Date is required'})
 
-        month_obj, _ = Month.objects.get_or_create(
-            family=profile.family,
-            year=expense_date.year,
-            month=expense_date.month,
-            defaults={'is_closed': False},
-        )
+        month_obj = resolve_month(profile.family, expense_date.year, expense_date.month)
 
         if month_obj.is_closed:
             raise ValidationError('This month is closed and cannot be modified')
@@ -108,6 +141,7 @@ class ExpenseViewSet(ModelViewSet):
 
         serializer.save(**save_kwargs)
 
+    @transaction.atomic
     def perform_update(self, serializer):
         instance = self.get_object()
 
@@ -128,14 +162,9 @@ class ExpenseViewSet(ModelViewSet):
         # If date is being changed, ensure month is aligned with the new date
         new_date = serializer.validated_data.get('date')
         if new_date is not None:
-            profile = get_object_or_404(Profile, user=self.request.user)
+            profile = get_request_profile(self.request)
 
-            month_obj, _ = Month.objects.get_or_create(
-                family=profile.family,
-                year=new_date.year,
-                month=new_date.month,
-                defaults={'is_closed': False},
-            )
+            month_obj = resolve_month(profile.family, new_date.year, new_date.month)
 
             if month_obj.is_closed:
                 raise ValidationError('This month is closed and cannot be modified')
@@ -159,6 +188,7 @@ class ExpenseViewSet(ModelViewSet):
 
         serializer.save()
 
+    @transaction.atomic
     def perform_destroy(self, instance):
         # Block deletes for closed months
         if instance.month.is_closed:
@@ -170,4 +200,52 @@ class ExpenseViewSet(ModelViewSet):
         )
 
         instance.delete()
-        
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        parser_classes=[MultiPartParser],
+    )
+    def import_file(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'A file upload is required'})
+
+        profile = get_request_profile(request)
+        try:
+            file_type = detect_file_type(upload.name, request.data.get('file_type'))
+            report = import_expenses(
+                family=profile.family,
+                user=request.user,
+                binary=upload.file,
+                file_type=file_type,
+                default_category=request.data.get('default_category'),
+            )
+        except ImportFormatError as exc:
+            raise ValidationError({'detail': str(exc)})
+
+        return Response(
+            {
+                'file_type': file_type,
+                'created': report.created,
+                'error_count': report.error_count,
+                'errors': report.errors,
+            },
+            status=status.HTTP_201_CREATED if report.created else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        try:
+            file_type = detect_export_type(request.query_params.get('file_type'))
+        except ExportFormatError as exc:
+            raise ValidationError({'detail': str(exc)})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(
+            queryset,
+            EXPENSE_COLUMNS,
+            file_type=file_type,
+            filename=export_filename('expenses', request.query_params),
+        )
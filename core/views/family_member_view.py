@@ -1,10 +1,9 @@
 from django.contrib.auth.models import User
-from django.shortcuts import get_object_or_404
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
-from core.models import Profile
 from core.serializers.family_member_serializer import FamilyMemberSerializer
+from core.services.request_profile import get_request_profile
 
 
 class FamilyMemberListView(ListAPIView):
@@ -12,7 +11,7 @@ class FamilyMemberListView(ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         return (
             User.objects.filter(profile__family=profile.family, is_active=True)
             .select_related("profile")
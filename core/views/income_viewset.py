@@ -1,38 +1,66 @@
 from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 
-from core.models import Income, IncomePlan, Month, Profile
+from core.models import Income, IncomePlan, month_ordinal
+from core.pagination import DateCursorPagination
 from core.serializers.income_serializer import IncomeSerializer
+from core.services.data_version_service import check_month_etag, set_etag
+from core.services.month_calendar_service import resolve_month
+from core.services.movement_export_service import (
+    INCOME_COLUMNS,
+    ExportFormatError,
+    detect_export_type,
+    export_filename,
+    export_response,
+)
+from core.services.request_profile import get_request_profile
 
 
 class IncomeViewSet(ModelViewSet):
     serializer_class = IncomeSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DateCursorPagination
+
+    def _requested_month(self):
+        year = self.request.query_params.get('year')
+        month = self.request.query_params.get('month')
+        if not (year and month):
+            return None
+        try:
+            year, month = int(year), int(month)
+        except (TypeError, ValueError):
+            raise ValidationError({'detail': 'Query params year and month must be integers'})
+        if not 1 <= month <= 12:
+            raise ValidationError({'month': 'month must be between 1 and 12'})
+        return year, month
+
+    def list(self, request, *args, **kwargs):
+        requested_month = self._requested_month()
+        if requested_month is None:
+            return super().list(request, *args, **kwargs)
+
+        etag, not_modified = check_month_etag(
+            request, get_request_profile(request).family, *requested_month
+        )
+        if not_modified is not None:
+            return not_modified
+        return set_etag(super().list(request, *args, **kwargs), etag)
 
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         queryset = Income.objects.filter(
             month__family=profile.family
-        ).select_related('category', 'income_plan').order_by('-date', '-created_at')
-
-        year = self.request.query_params.get('year')
-        month = self.request.query_params.get('month')
+        ).select_related('category', 'income_plan').order_by(*DateCursorPagination.ordering)
 
-        if year and month:
-            try:
-                year_int = int(year)
-                month_int = int(month)
-            except (TypeError, ValueError):
-                raise ValidationError({'detail': 'Query params year and month must be integers'})
+        requested_month = self._requested_month()
 
-            queryset = queryset.filter(
-                month__year=year_int,
-                month__month=month_int
-            )
+        if requested_month is not None:
+            queryset = queryset.filter(month__ordinal=month_ordinal(*requested_month))
 
         return queryset
 
@@ -60,18 +88,13 @@ class IncomeViewSet(ModelViewSet):
                     raise ValidationError({'income_plan': 'This income plan is already resolved for this month'})
 
     def perform_create(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         income_date = serializer.validated_data.get('date')
         if not income_date:
             raise ValidationError({'date': 'Date is required'})
 
-        month_obj, _ = Month.objects.get_or_create(
-            family=profile.family,
-            year=income_date.year,
-            month=income_date.month,
-            defaults={'is_closed': False},
-        )
+        month_obj = resolve_month(profile.family, income_date.year, income_date.month)
 
         if month_obj.is_closed:
             raise ValidationError('This month is closed and cannot be modified')
@@ -94,7 +117,7 @@ class IncomeViewSet(ModelViewSet):
     def perform_update(self, serializer):
         instance = self.get_object()
 
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         # Block modifications if the current month is closed
         if instance.month.is_closed:
@@ -110,12 +133,7 @@ class IncomeViewSet(ModelViewSet):
         new_date = serializer.validated_data.get('date')
         target_month = instance.month
         if new_date is not None:
-            month_obj, _ = Month.objects.get_or_create(
-                family=profile.family,
-                year=new_date.year,
-                month=new_date.month,
-                defaults={'is_closed': False},
-            )
+            month_obj = resolve_month(profile.family, new_date.year, new_date.month)
             if month_obj.is_closed:
                 raise ValidationError('This month is closed and cannot be modified')
             target_month = month_obj
@@ -160,4 +178,19 @@ class IncomeViewSet(ModelViewSet):
         if instance.month.is_closed:
             raise ValidationError('This month is closed and cannot be modified')
 
-        instance.delete()
\ No newline at end of file
+        instance.delete()
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        try:
+            file_type = detect_export_type(request.query_params.get('file_type'))
+        except ExportFormatError as exc:
+            raise ValidationError({'detail': str(exc)})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(
+            queryset,
+            INCOME_COLUMNS,
+            file_type=file_type,
+            filename=export_filename('incomes', request.query_params),
+        )
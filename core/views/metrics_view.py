@@ -0,0 +1,23 @@
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.services.request_metrics_service import (
+    metrics_enabled,
+    reset_route_metrics,
+    route_metrics,
+)
+
+
+class RequestMetricsView(APIView):
+    """Per-route request histograms of the worker serving the request."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"enabled": metrics_enabled(), "routes": route_metrics()})
+
+    def delete(self, request):
+        reset_route_metrics()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,54 @@
+from dataclasses import asdict
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.services.month_close_service import MonthStateError, close_month, reopen_month
+from core.services.request_profile import get_request_family
+
+
+def _validate_month(month):
+    if not 1 <= month <= 12:
+        raise ValidationError({"month": "month must be between 1 and 12"})
+
+
+class MonthCloseView(APIView):
+    """Finalize the month's occurrences and pending incomes, then close it."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, year, month):
+        _validate_month(month)
+        resolve_incomes = request.data.get("resolve_incomes", True)
+        if isinstance(resolve_incomes, str):
+            resolve_incomes = resolve_incomes.lower() not in ("false", "0")
+
+        try:
+            result = close_month(
+                family=get_request_family(request),
+                user=request.user,
+                year=year,
+                month=month,
+                resolve_incomes=bool(resolve_incomes),
+            )
+        except MonthStateError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(asdict(result))
+
+
+class MonthReopenView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, year, month):
+        _validate_month(month)
+        try:
+            result = reopen_month(
+                family=get_request_family(request),
+                year=year,
+                month=month,
+            )
+        except MonthStateError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(asdict(result))
@@ -4,6 +4,7 @@ from rest_framework.exceptions import ValidationError
 
 from core.models import PlannedExpense
 from core.serializers.planned_expense_serializer import PlannedExpenseSerializer
+from core.services.request_profile import get_request_family
 
 
 class PlannedExpenseViewSet(ModelViewSet):
@@ -11,8 +12,7 @@ class PlannedExpenseViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        family = user.profile.family
+        family = get_request_family(self.request)
         return PlannedExpense.objects.filter(family=family).select_related(
             'month',
             'category',
@@ -25,7 +25,7 @@ class PlannedExpenseViewSet(ModelViewSet):
             raise ValidationError({"detail": "This month is closed and cannot be modified"})
 
         serializer.save(
-            family=self.request.user.profile.family,
+            family=get_request_family(self.request),
             created_by=self.request.user
         )
 
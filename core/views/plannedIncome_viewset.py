@@ -1,21 +1,20 @@
-from django.shortcuts import get_object_or_404
-from django.db.models import Q
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ModelViewSet
 from typing import Optional
 
-from core.models import IncomePlanVersion, Month, Profile
+from core.models import IncomePlanVersion, Month, month_ordinal
 from core.serializers.planned_income_serializer import IncomePlanVersionSerializer
+from core.services.request_profile import get_request_profile
 
 
 def _month_key(m: Month):
-    return (m.year, m.month)
+    return m.ordinal
 
 
 def _range_overlaps(a_start, a_end, b_start, b_end):
     """Inclusive overlap for month ranges. None end means infinity."""
-    inf = (9999, 12)
+    inf = month_ordinal(9999, 12)
     a0 = _month_key(a_start)
     a1 = _month_key(a_end) if a_end is not None else inf
     b0 = _month_key(b_start)
@@ -25,15 +24,9 @@ def _range_overlaps(a_start, a_end, b_start, b_end):
 
 def _has_closed_months(family, start: Month, end: Optional[Month]) -> bool:
     """Return True if there is any closed Month within [start, end] (end can be None => infinity)."""
-    qs = Month.objects.filter(family=family, is_closed=True)
-
-    ge_start = Q(year__gt=start.year) | (Q(year=start.year) & Q(month__gte=start.month))
-    qs = qs.filter(ge_start)
-
+    qs = Month.objects.filter(family=family, is_closed=True, ordinal__gte=start.ordinal)
     if end is not None:
-        le_end = Q(year__lt=end.year) | (Q(year=end.year) & Q(month__lte=end.month))
-        qs = qs.filter(le_end)
-
+        qs = qs.filter(ordinal__lte=end.ordinal)
     return qs.exists()
 
 
@@ -44,13 +37,13 @@ class IncomePlanVersionViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         return IncomePlanVersion.objects.filter(
             plan__family=profile.family
-        ).select_related('plan', 'valid_from', 'valid_to').order_by('valid_from__year', 'valid_from__month', 'created_at')
+        ).select_related('plan', 'valid_from', 'valid_to').order_by('valid_from_ordinal', 'created_at')
 
     def perform_create(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         plan = serializer.validated_data.get('plan')
         if plan is None:
@@ -88,7 +81,7 @@ class IncomePlanVersionViewSet(ModelViewSet):
         serializer.save()
 
     def perform_update(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         instance = self.get_object()
 
         # Block editing if plan doesn't belong to family (safety)
@@ -127,7 +120,7 @@ class IncomePlanVersionViewSet(ModelViewSet):
         serializer.save()
 
     def perform_destroy(self, instance):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         if instance.plan.family_id != profile.family_id:
             raise ValidationError({'detail': 'Not allowed'})
@@ -1,6 +1,5 @@
 from decimal import Decimal, InvalidOperation
 
-from django.shortcuts import get_object_or_404
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
@@ -8,10 +7,11 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 
-from core.models import PlannedExpensePlan, PlannedExpenseVersion, Profile
+from core.models import PlannedExpensePlan, PlannedExpenseVersion
 from core.serializers.planned_expense_plan_serializer import (
     PlannedExpensePlanSerializer,
 )
+from core.services.request_profile import get_request_profile
 
 
 class PlannedExpensePlanViewSet(ModelViewSet):
@@ -27,7 +27,7 @@ class PlannedExpensePlanViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         return PlannedExpensePlan.objects.filter(
             family=profile.family
         ).select_related(
@@ -44,7 +44,7 @@ class PlannedExpensePlanViewSet(ModelViewSet):
     def perform_update(self, serializer):
         instance = self.get_object()
         request = self.request
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         planned_amount = request.data.get("planned_amount")
         start_month = serializer.validated_data.get("start_month", instance.start_month)
@@ -67,7 +67,7 @@ class PlannedExpensePlanViewSet(ModelViewSet):
             last_version = (
                 PlannedExpenseVersion.objects
                 .filter(plan=plan)
-                .order_by("-valid_from")
+                .order_by("-valid_from_ordinal", "-created_at")
                 .first()
             )
 
@@ -1,58 +1,41 @@
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-import calendar
 import datetime
 from typing import Optional
 
 from django.db import IntegrityError
 from django.db import transaction
-from django.db.models import Q
-from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from core.models import Income, IncomePlan, IncomePlanVersion, Month, Profile
-from core.serializers.category_serializer import CategorySerializer
+from core.models import Income, IncomePlan, IncomePlanVersion, Month, month_ordinal
 from core.serializers.planned_income_plan_serializer import IncomePlanSerializer
+from core.services.data_version_service import check_month_etag, set_etag
+from core.services.income_plan_month_service import (
+    build_income_plan_month_status,
+    confirm_pending_income_plans,
+    default_income_date,
+)
+from core.services.month_calendar_service import resolve_month
+from core.services.plan_projection_service import plan_applies
+from core.services.plan_version_resolver import resolve_plan_version
+from core.services.request_profile import get_request_profile
 
 
 def _month_key(m: Month):
-    return (m.year, m.month)
-
-
-def _lte_month_q(prefix: str, year: int, month: int) -> Q:
-    return Q(**{f"{prefix}__year__lt": year}) | (
-        Q(**{f"{prefix}__year": year}) & Q(**{f"{prefix}__month__lte": month})
-    )
-
-
-def _gte_month_q(prefix: str, year: int, month: int) -> Q:
-    return Q(**{f"{prefix}__year__gt": year}) | (
-        Q(**{f"{prefix}__year": year}) & Q(**{f"{prefix}__month__gte": month})
-    )
+    return m.ordinal
 
 
 def _get_version_for_month(plan: IncomePlan, year: int, month: int):
-    return (
-        IncomePlanVersion.objects.filter(plan=plan)
-        .filter(_lte_month_q('valid_from', year, month))
-        .filter(Q(valid_to__isnull=True) | _gte_month_q('valid_to', year, month))
-        .select_related('valid_from', 'valid_to')
-        .order_by('valid_from__year', 'valid_from__month', 'created_at')
-        .last()
-    )
-
-
-def _get_or_create_month(family, year: int, month: int) -> Month:
-    month_obj, _ = Month.objects.get_or_create(
-        family=family,
-        year=year,
-        month=month,
-        defaults={'is_closed': False},
+    return resolve_plan_version(
+        IncomePlanVersion,
+        plan,
+        year,
+        month,
+        select_related=('valid_from', 'valid_to'),
     )
-    return month_obj
 
 
 def _previous_month(family, month_obj: Month) -> Month:
@@ -63,22 +46,13 @@ def _previous_month(family, month_obj: Month) -> Month:
         year = month_obj.year
         month = month_obj.month - 1
 
-    return _get_or_create_month(family, year, month)
+    return resolve_month(family, year, month)
 
 
 def _month_before(family, month_obj: Month) -> Month:
     return _previous_month(family, month_obj)
 
 
-def _default_income_date(year: int, month: int, due_day: int = None) -> datetime.date:
-    last_day = calendar.monthrange(year, month)[1]
-    if due_day is None:
-        day = last_day
-    else:
-        day = max(1, min(int(due_day), last_day))
-    return datetime.date(year, month, day)
-
-
 def _parse_yyyy_mm_dd(value: str) -> datetime.date:
     try:
         y, m, d = [int(x) for x in value.split('-')]
@@ -102,15 +76,9 @@ def _to_decimal_amount(value) -> Decimal:
 
 def _has_closed_months_in_range(family, start: Month, end: Optional[Month]) -> bool:
     """True if there is any closed Month within [start, end]. If end is None, checks from start onwards."""
-    qs = Month.objects.filter(family=family, is_closed=True)
-
-    ge_start = Q(year__gt=start.year) | (Q(year=start.year) & Q(month__gte=start.month))
-    qs = qs.filter(ge_start)
-
+    qs = Month.objects.filter(family=family, is_closed=True, ordinal__gte=start.ordinal)
     if end is not None:
-        le_end = Q(year__lt=end.year) | (Q(year=end.year) & Q(month__lte=end.month))
-        qs = qs.filter(le_end)
-
+        qs = qs.filter(ordinal__lte=end.ordinal)
     return qs.exists()
 
 
@@ -137,7 +105,7 @@ class IncomePlanViewSet(ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         return IncomePlan.objects.filter(
             family=profile.family
         ).select_related('category', 'start_month', 'end_month').order_by('-created_at')
@@ -171,7 +139,7 @@ class IncomePlanViewSet(ModelViewSet):
             raise ValidationError({'due_day': 'due_day must be between 1 and 31'})
 
     def perform_create(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         # Ensure required relations are consistent with family
         self._validate_family_consistency(profile, serializer)
@@ -200,7 +168,7 @@ class IncomePlanViewSet(ModelViewSet):
             )
 
     def perform_update(self, serializer):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
         instance = self.get_object()
         request = self.request
 
@@ -237,7 +205,7 @@ class IncomePlanViewSet(ModelViewSet):
             last_version = (
                 IncomePlanVersion.objects
                 .filter(plan=plan)
-                .order_by('-valid_from')
+                .order_by('-valid_from_ordinal', '-created_at')
                 .first()
             )
 
@@ -264,9 +232,7 @@ class IncomePlanViewSet(ModelViewSet):
         return year_int, month_int
 
     def _ensure_plan_applies(self, plan: IncomePlan, year: int, month: int):
-        if (plan.start_month.year, plan.start_month.month) > (year, month):
-            raise ValidationError({'detail': 'Plan does not apply to this month'})
-        if plan.end_month is not None and (plan.end_month.year, plan.end_month.month) < (year, month):
+        if not plan_applies(plan, month_ordinal(year, month)):
             raise ValidationError({'detail': 'Plan does not apply to this month'})
 
     def _apply_forward_adjustment(self, profile, plan: IncomePlan, effective_month: Month, amount: Decimal):
@@ -279,7 +245,7 @@ class IncomePlanViewSet(ModelViewSet):
         versions = list(
             IncomePlanVersion.objects.filter(plan=plan)
             .select_related('valid_from', 'valid_to')
-            .order_by('valid_from__year', 'valid_from__month', 'created_at')
+            .order_by('valid_from_ordinal', 'created_at')
         )
 
         current_version = _get_version_for_month(plan, effective_month.year, effective_month.month)
@@ -341,86 +307,45 @@ class IncomePlanViewSet(ModelViewSet):
     @action(detail=False, methods=['get'], url_path='month')
     def month(self, request):
         year_int, month_int = self._parse_year_month(request)
-        profile = get_object_or_404(Profile, user=request.user)
+        profile = get_request_profile(request)
+        etag, not_modified = check_month_etag(request, profile.family, year_int, month_int)
+        if not_modified is not None:
+            return not_modified
 
-        month_obj, _ = Month.objects.get_or_create(
+        month_obj = resolve_month(profile.family, year_int, month_int)
+        return set_etag(Response(build_income_plan_month_status(
             family=profile.family,
             year=year_int,
             month=month_int,
-            defaults={'is_closed': False},
-        )
+            month_obj=month_obj,
+        )), etag)
 
-        plans = (
-            IncomePlan.objects.filter(family=profile.family, active=True)
-            .filter(_lte_month_q('start_month', year_int, month_int))
-            .filter(Q(end_month__isnull=True) | _gte_month_q('end_month', year_int, month_int))
-            .select_related('category', 'start_month', 'end_month')
-            .order_by('-created_at')
-        )
+    @action(detail=False, methods=['post'], url_path='month/confirm-all')
+    @transaction.atomic
+    def confirm_all(self, request):
+        """Confirm every PENDING plan of the month at its planned amount."""
+        year_int, month_int = self._parse_year_month(request)
+        profile = get_request_profile(request)
 
-        versions = (
-            IncomePlanVersion.objects.filter(plan__in=plans)
-            .filter(_lte_month_q('valid_from', year_int, month_int))
-            .filter(Q(valid_to__isnull=True) | _gte_month_q('valid_to', year_int, month_int))
-            .select_related('valid_from', 'valid_to')
-            .order_by('plan_id', 'valid_from__year', 'valid_from__month', 'created_at')
-        )
-        latest_versions = {}
-        for version in versions:
-            latest_versions[version.plan_id] = version
+        month_obj = resolve_month(profile.family, year_int, month_int)
+        # Same lock as month close: the month cannot close halfway through.
+        month_obj = Month.objects.select_for_update(no_key=True).get(pk=month_obj.pk)
+        if month_obj.is_closed:
+            raise ValidationError({'detail': 'This month is closed and cannot be modified'})
 
-        existing_incomes = (
-            Income.objects.filter(month=month_obj, income_plan__in=plans)
-            .select_related('category')
-            .order_by('income_plan_id', '-created_at')
+        incomes = confirm_pending_income_plans(
+            family=profile.family,
+            user=request.user,
+            month_obj=month_obj,
         )
-        resolved_incomes = {}
-        for income in existing_incomes:
-            resolved_incomes.setdefault(income.income_plan_id, income)
-
-        results = []
-        for plan in plans:
-            version = latest_versions.get(plan.id)
-            existing_income = resolved_incomes.get(plan.id)
-
-            if existing_income:
-                status = 'RESOLVED'
-            else:
-                status = 'PENDING' if version is not None else 'MISSING_VERSION'
-
-            results.append({
-                'plan_id': plan.id,
-                'name': plan.name,
-                'plan_type': plan.plan_type,
-                'due_day': plan.due_day,
-                'start_month': plan.start_month_id,
-                'end_month': plan.end_month_id,
-                'category': plan.category_id,
-                'category_detail': CategorySerializer(plan.category).data,
-                'version_id': version.id if version else None,
-                'planned_amount': str(version.planned_amount) if version else None,
-                'status': status,
-                'can_resolve': (not month_obj.is_closed) and (version is not None) and (existing_income is None),
-                'resolved_income': {
-                    'id': existing_income.id,
-                    'amount': str(existing_income.amount),
-                    'date': existing_income.date,
-                    'description': existing_income.description,
-                } if existing_income else None,
-            })
-
         return Response({
-            'month': {
-                'id': month_obj.id,
-                'year': year_int,
-                'month': month_int,
-                'is_closed': month_obj.is_closed,
-            },
-            'results': results,
+            'detail': 'OK',
+            'confirmed': len(incomes),
+            'plan_ids': [income.income_plan_id for income in incomes],
         })
 
     def _create_income_for_plan(self, request, plan: IncomePlan, year_int: int, month_int: int, amount, date_value=None, description=''):
-        profile = get_object_or_404(Profile, user=request.user)
+        profile = get_request_profile(request)
         if plan.family_id != profile.family_id:
             raise ValidationError({'detail': 'Not allowed'})
 
@@ -430,12 +355,7 @@ class IncomePlanViewSet(ModelViewSet):
         if not plan.active:
             raise ValidationError({'detail': 'Plan is not active'})
 
-        month_obj, _ = Month.objects.get_or_create(
-            family=profile.family,
-            year=year_int,
-            month=month_int,
-            defaults={'is_closed': False},
-        )
+        month_obj = resolve_month(profile.family, year_int, month_int)
         if month_obj.is_closed:
             raise ValidationError({'detail': 'This month is closed and cannot be modified'})
 
@@ -446,7 +366,7 @@ class IncomePlanViewSet(ModelViewSet):
         amount_value = _to_decimal_amount(amount)
 
         if date_value is None:
-            date_obj = _default_income_date(year_int, month_int, plan.due_day)
+            date_obj = default_income_date(year_int, month_int, plan.due_day)
         else:
             if isinstance(date_value, str):
                 date_obj = _parse_yyyy_mm_dd(date_value)
@@ -504,14 +424,14 @@ class IncomePlanViewSet(ModelViewSet):
         amount_value = _to_decimal_amount(amount)
         date_value = request.data.get('date')
         description = request.data.get('description', '')
-        profile = get_object_or_404(Profile, user=request.user)
+        profile = get_request_profile(request)
 
         plan = IncomePlan.objects.select_related('start_month', 'end_month', 'category').get(id=plan.id)
         if plan.family_id != profile.family_id:
             raise ValidationError({'detail': 'Not allowed'})
         self._ensure_plan_applies(plan, year_int, month_int)
 
-        effective_month = _get_or_create_month(
+        effective_month = resolve_month(
             family=profile.family,
             year=year_int,
             month=month_int,
@@ -537,7 +457,7 @@ class IncomePlanViewSet(ModelViewSet):
         return Response({'detail': 'OK', 'income_id': income.id})
 
     def perform_destroy(self, instance):
-        profile = get_object_or_404(Profile, user=self.request.user)
+        profile = get_request_profile(self.request)
 
         if instance.family_id != profile.family_id:
             raise ValidationError({'detail': 'Not allowed'})
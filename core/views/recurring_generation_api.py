@@ -1,92 +1,89 @@
-import calendar
-from datetime import date
 from django.utils import timezone
-from django.db import models
 
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
-from django.shortcuts import get_object_or_404
 
-from core.models import RecurringPayment, Expense, Month, Profile
-from core.services.recurring_payment_service import (
-    get_or_create_recurring_payment_occurrence,
-)
+from core.services.recurring_generation_service import generate_recurring_expenses
+from core.services.request_profile import get_request_profile
+from core.views.budget_view import _parse_year_month
 
 
-class GenerateRecurringExpensesAPIView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def post(self, request):
-        profile = get_object_or_404(Profile, user=request.user)
-
-        today = timezone.now().date()
-        year = today.year
-        month_num = today.month
-
-        month_obj, _ = Month.objects.get_or_create(
-            family=profile.family,
-            year=year,
-            month=month_num,
-            defaults={'is_closed': False},
-        )
+def _param(request, name):
+    value = request.query_params.get(name)
+    if value is None and hasattr(request.data, "get"):
+        value = request.data.get(name)
+    return value
 
-        if month_obj.is_closed:
-            raise ValidationError('This month is closed and cannot generate expenses')
 
-        created = 0
-        skipped = 0
-        completed_skipped = 0
+class GenerateRecurringExpensesAPIView(APIView):
+    """Generate the recurring expenses of the current month.
 
-        recurring_payments = RecurringPayment.objects.filter(
-            family=profile.family,
-            active=True,
-            start_date__lte=today,
-        ).filter(
-            models.Q(end_date__isnull=True) | models.Q(end_date__gte=today)
-        ).select_related("category")
+    ``year``/``month`` target another month and ``from``/``to`` (YYYY-MM)
+    a range of months.
+    """
 
-        existing_recurring_ids = set(
-            Expense.objects.filter(
-                month=month_obj,
-                recurring_payment__in=recurring_payments,
-            ).values_list("recurring_payment_id", flat=True)
-        )
+    permission_classes = [IsAuthenticated]
 
-        last_day = calendar.monthrange(year, month_num)[1]
+    def _target_months(self, request):
+        start, end = _param(request, "from"), _param(request, "to")
+        if start is not None or end is not None:
+            if start is None or end is None:
+                raise ValidationError({'detail': 'from and to are required together'})
+            return _parse_year_month(start, "from"), _parse_year_month(end, "to")
+
+        year, month = _param(request, "year"), _param(request, "month")
+        if year is None and month is None:
+            today = timezone.now().date()
+            return (today.year, today.month), None
+        try:
+            target = (int(year), int(month))
+        except (TypeError, ValueError):
+            raise ValidationError({'detail': 'year and month must be integers'})
+        if not 1 <= target[1] <= 12:
+            raise ValidationError({'month': 'month must be between 1 and 12'})
+        return target, None
 
-        for rp in recurring_payments:
-            occurrence = get_or_create_recurring_payment_occurrence(
-                recurring_payment=rp,
-                month=month_obj,
-            )
-            if occurrence.is_completed:
-                completed_skipped += 1
-                continue
-
-            if rp.id in existing_recurring_ids:
-                skipped += 1
-                continue
+    def post(self, request):
+        profile = get_request_profile(request)
+        start, end = self._target_months(request)
 
-            day = min(rp.due_day, last_day)
-            expense_date = date(year, month_num, day)
-            Expense.objects.create(
+        try:
+            results = generate_recurring_expenses(
+                family=profile.family,
                 user=request.user,
-                payer=rp.payer or request.user,
-                month=month_obj,
-                recurring_payment=rp,
-                amount=rp.amount,
-                category=rp.category,
-                date=expense_date,
-                is_recurring=True,
-                description=rp.name,
+                start=start,
+                end=end,
             )
-            created += 1
+        except ValueError as exc:
+            raise ValidationError({'detail': str(exc)})
+
+        if end is None:
+            result = results[0]
+            if result.closed:
+                raise ValidationError('This month is closed and cannot generate expenses')
+            return Response({
+                'month': result.label,
+                'created': result.created,
+                'skipped': result.skipped,
+                'completed_skipped': result.completed_skipped,
+            })
 
         return Response({
-            'month': f'{year}-{month_num}',
-            'created': created,
-            'skipped': skipped,
-            'completed_skipped': completed_skipped,
+            'from': results[0].label,
+            'to': results[-1].label,
+            'created': sum(result.created for result in results),
+            'skipped': sum(result.skipped for result in results),
+            'completed_skipped': sum(result.completed_skipped for result in results),
+            'months': [
+                {
+                    'month': result.label,
+                    'created': result.created,
+                    'skipped': result.skipped,
+                    'completed_skipped': result.completed_skipped,
+                    'closed': result.closed,
+                }
+                for result in results
+            ],
         })